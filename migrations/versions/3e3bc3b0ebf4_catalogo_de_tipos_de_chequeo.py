@@ -0,0 +1,104 @@
+"""catalogo de tipos de chequeo
+
+Reemplaza la descripción en texto libre de cada chequeo por una referencia al nuevo
+catálogo tipo_chequeo. Los chequeos existentes se convierten por lotes de ids: las
+descripciones que coinciden con un tipo del catálogo (sin distinguir mayúsculas ni
+espacios en los extremos) toman ese tipo, y cada descripción distinta que no coincide
+se agrega al catálogo con la clave LEGADO_<n> para no perder información.
+
+Revision ID: 3e3bc3b0ebf4
+Revises: a4ca72940575
+Create Date: 2026-10-17 03:28:04.932641
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e3bc3b0ebf4'
+down_revision = 'a4ca72940575'
+branch_labels = None
+depends_on = None
+
+# Chequeos actualizados por sentencia al convertir las filas existentes
+TAMANIO_LOTE = 10000
+
+TIPOS_CHEQUEO = [
+    ('LUCES', 'Luces y señalización'),
+    ('FRENOS', 'Frenos'),
+    ('DIRECCION', 'Dirección y suspensión'),
+    ('NEUMATICOS', 'Neumáticos'),
+    ('CHASIS', 'Chasis y estructura'),
+    ('CONTAMINACION', 'Contaminación y ruidos'),
+    ('SEGURIDAD', 'Elementos de seguridad obligatorios'),
+    ('CINTURONES', 'Cinturones, vidrios y espejos'),
+]
+
+
+def upgrade():
+    tipo_chequeo = op.create_table('tipo_chequeo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nombre', sa.String(length=50), nullable=False),
+    sa.Column('descripcion', sa.String(length=200), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('descripcion'),
+    sa.UniqueConstraint('nombre')
+    )
+    op.bulk_insert(tipo_chequeo, [{'nombre': nombre, 'descripcion': descripcion}
+                                  for nombre, descripcion in TIPOS_CHEQUEO])
+
+    with op.batch_alter_table('chequeo', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tipo_chequeo_id', sa.Integer(), nullable=True))
+
+    conexion = op.get_bind()
+    chequeo = sa.table('chequeo',
+                       sa.column('id', sa.Integer()),
+                       sa.column('descripcion', sa.String()),
+                       sa.column('tipo_chequeo_id', sa.Integer()))
+
+    # Texto normalizado -> id de tipo, agregando al catálogo las descripciones sin tipo
+    ids = {descripcion.strip().lower(): id_ for id_, descripcion
+           in conexion.execute(sa.select(tipo_chequeo.c.id, tipo_chequeo.c.descripcion))}
+    descripciones = [fila[0] for fila in conexion.execute(sa.select(chequeo.c.descripcion).distinct())]
+    legados = 0
+    for descripcion in sorted(descripciones):
+        clave = descripcion.strip().lower()
+        if clave not in ids:
+            legados += 1
+            conexion.execute(tipo_chequeo.insert().values(nombre=f'LEGADO_{legados}', descripcion=descripcion))
+            ids[clave] = conexion.execute(
+                sa.select(tipo_chequeo.c.id).where(tipo_chequeo.c.descripcion == descripcion)
+            ).scalar_one()
+    tipo_por_descripcion = {descripcion: ids[descripcion.strip().lower()] for descripcion in descripciones}
+
+    # Conversión por rangos de ids para no bloquear toda la tabla en una sola sentencia
+    ultimo_id = conexion.execute(sa.select(sa.func.max(chequeo.c.id))).scalar() or 0
+    for desde in range(0, ultimo_id, TAMANIO_LOTE):
+        conexion.execute(
+            chequeo.update()
+            .where(chequeo.c.id > desde, chequeo.c.id <= desde + TAMANIO_LOTE)
+            .values(tipo_chequeo_id=sa.case(tipo_por_descripcion, value=chequeo.c.descripcion))
+        )
+
+    with op.batch_alter_table('chequeo', schema=None) as batch_op:
+        batch_op.alter_column('tipo_chequeo_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_chequeo_tipo_chequeo', 'tipo_chequeo', ['tipo_chequeo_id'], ['id'])
+        batch_op.drop_column('descripcion')
+
+
+def downgrade():
+    with op.batch_alter_table('chequeo', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('descripcion', sa.VARCHAR(length=200), nullable=True))
+
+    op.execute(
+        "UPDATE chequeo SET descripcion = "
+        "(SELECT tipo_chequeo.descripcion FROM tipo_chequeo WHERE tipo_chequeo.id = chequeo.tipo_chequeo_id)"
+    )
+
+    with op.batch_alter_table('chequeo', schema=None) as batch_op:
+        batch_op.alter_column('descripcion', existing_type=sa.VARCHAR(length=200), nullable=False)
+        batch_op.drop_constraint('fk_chequeo_tipo_chequeo', type_='foreignkey')
+        batch_op.drop_column('tipo_chequeo_id')
+
+    op.drop_table('tipo_chequeo')
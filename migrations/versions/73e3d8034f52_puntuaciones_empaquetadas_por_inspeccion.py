@@ -0,0 +1,74 @@
+"""puntuaciones empaquetadas por inspeccion
+
+Agrega a cada inspección sus 8 puntuaciones empaquetadas (un byte por tipo de chequeo en
+el orden fijo del catálogo) y las completa por lotes de ids a partir de la tabla chequeo.
+Las inspecciones cuyos chequeos no son exactamente los 8 tipos del catálogo quedan en NULL.
+
+Revision ID: 73e3d8034f52
+Revises: 3e3bc3b0ebf4
+Create Date: 2026-10-17 03:32:55.092460
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '73e3d8034f52'
+down_revision = '3e3bc3b0ebf4'
+branch_labels = None
+depends_on = None
+
+# Inspecciones completadas por lote
+TAMANIO_LOTE = 10000
+
+# Orden de los bytes: el de los tipos del catálogo
+ORDEN_TIPOS_CHEQUEO = ['LUCES', 'FRENOS', 'DIRECCION', 'NEUMATICOS', 'CHASIS', 'CONTAMINACION', 'SEGURIDAD', 'CINTURONES']
+
+
+def upgrade():
+    with op.batch_alter_table('inspeccion', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('puntuaciones', sa.LargeBinary(length=8).with_variant(sa.BINARY(length=8), 'mysql'), nullable=True))
+
+    conexion = op.get_bind()
+    inspeccion = sa.table('inspeccion', sa.column('id', sa.Integer()), sa.column('puntuaciones', sa.LargeBinary()))
+    chequeo = sa.table('chequeo',
+                       sa.column('inspeccion_id', sa.Integer()),
+                       sa.column('tipo_chequeo_id', sa.Integer()),
+                       sa.column('puntuacion', sa.Integer()))
+    tipo_chequeo = sa.table('tipo_chequeo', sa.column('id', sa.Integer()), sa.column('nombre', sa.String()))
+
+    ids_por_nombre = dict(conexion.execute(sa.select(tipo_chequeo.c.nombre, tipo_chequeo.c.id)).all())
+    posiciones = {ids_por_nombre[nombre]: posicion for posicion, nombre in enumerate(ORDEN_TIPOS_CHEQUEO)}
+
+    actualizar = (inspeccion.update()
+                  .where(inspeccion.c.id == sa.bindparam('inspeccion_id'))
+                  .values(puntuaciones=sa.bindparam('empaquetadas')))
+
+    ultimo_id = conexion.execute(sa.select(sa.func.max(inspeccion.c.id))).scalar() or 0
+    for desde in range(0, ultimo_id, TAMANIO_LOTE):
+        filas = conexion.execute(
+            sa.select(chequeo.c.inspeccion_id, chequeo.c.tipo_chequeo_id, chequeo.c.puntuacion)
+            .where(chequeo.c.inspeccion_id > desde, chequeo.c.inspeccion_id <= desde + TAMANIO_LOTE)
+        ).all()
+
+        chequeos_por_inspeccion = {}
+        for inspeccion_id, tipo_chequeo_id, puntuacion in filas:
+            chequeos_por_inspeccion.setdefault(inspeccion_id, []).append((tipo_chequeo_id, puntuacion))
+
+        valores = []
+        for inspeccion_id, chequeos in chequeos_por_inspeccion.items():
+            if sorted(posiciones.get(tipo_chequeo_id, -1) for tipo_chequeo_id, _ in chequeos) != list(range(len(posiciones))):
+                continue
+            empaquetadas = bytearray(len(posiciones))
+            for tipo_chequeo_id, puntuacion in chequeos:
+                empaquetadas[posiciones[tipo_chequeo_id]] = puntuacion
+            valores.append({'inspeccion_id': inspeccion_id, 'empaquetadas': bytes(empaquetadas)})
+
+        if valores:
+            conexion.execute(actualizar, valores)
+
+
+def downgrade():
+    with op.batch_alter_table('inspeccion', schema=None) as batch_op:
+        batch_op.drop_column('puntuaciones')
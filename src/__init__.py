@@ -37,6 +37,10 @@ def create_app():
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Caches en memoria (disponibilidad de turnos)
+    from src.utils.cache_utils import init_caches
+    init_caches(app)
+
     # Routers
     from src.routes.user_router import users
     from src.routes.vehicles_router import vehicles
@@ -49,6 +53,10 @@ def create_app():
     app.register_blueprint(bookings, url_prefix="/api/bookings")
     app.register_blueprint(inspections, url_prefix="/api/inspections")
 
+    # Comandos de consola (flask <comando>)
+    from src.commands import register_commands
+    register_commands(app)
+
     # Error handlers
     @app.errorhandler(ValidationError)
     def handle_validation_error(error):
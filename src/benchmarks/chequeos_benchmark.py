@@ -0,0 +1,136 @@
+import argparse
+import math
+import os
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+"""
+Benchmark del análisis de puntuaciones de chequeos: NumPy vectorizado vs. Python puro.
+
+Crea una base SQLite en memoria con la cantidad de chequeos indicada (uno de cada tipo por
+inspección, repartidos en 24 meses y 20 inspectores) y mide, por separado, la lectura en
+columnas y el cálculo de histogramas, promedios y percentiles por tipo, mes e inspector.
+
+Uso:
+    python -m src.benchmarks.chequeos_benchmark --chequeos 1000000
+"""
+
+INSPECTORES = 20
+MESES = 24
+
+
+def _poblar(db, cantidad: int) -> tuple[date, date]:
+    import random
+    from sqlalchemy import insert
+    from src.models import Usuario, UsuarioRol, Vehiculo, EstadoVehiculo, Inspeccion, Chequeo, ResultadoInspeccion, TipoChequeo
+    from src.models.check_type_model import TIPOS_CHEQUEO
+
+    db.session.add_all([UsuarioRol(nombre=nombre) for nombre in ['ADMIN', 'INSPECTOR', 'DUENIO']])
+    db.session.add_all([EstadoVehiculo(nombre=nombre) for nombre in ['ACTIVO', 'INACTIVO']])
+    db.session.add_all([ResultadoInspeccion(nombre=nombre) for nombre in ['SEGURO', 'RECHEQUEAR']])
+    db.session.add_all([TipoChequeo(nombre=nombre, descripcion=descripcion) for nombre, descripcion in TIPOS_CHEQUEO])
+    db.session.flush()
+    tipos = range(1, len(TIPOS_CHEQUEO) + 1)
+    frenos = [nombre for nombre, _ in TIPOS_CHEQUEO].index('FRENOS') + 1
+
+    db.session.execute(insert(Usuario), [
+        {"nombre_completo": f"Usuario {i}", "mail": f"usuario{i}@example.com", "telefono": "0",
+         "hash_password": "-", "rol_id": 2, "activo": True}
+        for i in range(INSPECTORES + 1)
+    ])
+    db.session.execute(insert(Vehiculo), [
+        {"matricula": f"BEN{i:04d}", "marca": "Marca", "modelo": "Modelo", "anio": 2020,
+         "duenio_id": INSPECTORES + 1, "estado_id": 1}
+        for i in range(1000)
+    ])
+
+    aleatorio = random.Random(42)
+    inicio = datetime(2023, 1, 1, 9, 0)
+    dias = MESES * 30
+    inspecciones = cantidad // len(TIPOS_CHEQUEO)
+    lote = 10_000
+    for desde in range(0, inspecciones, lote):
+        ids = range(desde + 1, min(desde + lote, inspecciones) + 1)
+        # Los frenos puntúan sistemáticamente más bajo
+        puntuaciones = {i: [aleatorio.randint(1, 7) if tipo == frenos else aleatorio.randint(4, 10) for tipo in tipos]
+                        for i in ids}
+        db.session.execute(insert(Inspeccion), [
+            {"id": i, "vehiculo_id": i % 1000 + 1, "inspector_id": i % INSPECTORES + 1,
+             "fecha": inicio + timedelta(days=i % dias), "puntuacion_total": sum(puntuaciones[i]), "resultado_id": 1,
+             "puntuaciones": bytes(puntuaciones[i])}
+            for i in ids
+        ])
+        db.session.execute(insert(Chequeo), [
+            {"inspeccion_id": i, "tipo_chequeo_id": tipo, "fecha": inicio, "puntuacion": puntuacion}
+            for i in ids for tipo, puntuacion in zip(tipos, puntuaciones[i])
+        ])
+    db.session.commit()
+    return inicio.date(), (inicio + timedelta(days=dias)).date()
+
+
+def _analizar_python(filas) -> dict:
+    """Camino de referencia: mismos resultados recorriendo las filas en Python."""
+    grupos = {"tipo": defaultdict(list), "mes": defaultdict(list), "inspector": defaultdict(list)}
+    for tipo, mes, inspector_id, puntuacion in filas:
+        grupos["tipo"][tipo].append(puntuacion)
+        grupos["mes"][mes].append(puntuacion)
+        grupos["inspector"][inspector_id].append(puntuacion)
+
+    resultado = {}
+    for nombre, valores_por_grupo in grupos.items():
+        resultado[nombre] = {}
+        for clave, valores in valores_por_grupo.items():
+            histograma = [0] * 10
+            for valor in valores:
+                histograma[valor - 1] += 1
+            ordenados = sorted(valores)
+            resultado[nombre][clave] = {
+                "promedio": sum(valores) / len(valores),
+                "percentiles": [ordenados[max(math.ceil(p * len(ordenados) / 100), 1) - 1]
+                                for p in [10, 25, 50, 75, 90]],
+                "histograma": histograma
+            }
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del análisis de puntuaciones de chequeos")
+    parser.add_argument("--chequeos", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    from src import create_app, db
+    from src.services.check_analytics_service import CheckAnalyticsService
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        desde, hasta = _poblar(db, args.chequeos)
+
+        inicio = time.perf_counter()
+        columnas = CheckAnalyticsService._cargar_columnas(desde, hasta)
+        lectura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        analisis = CheckAnalyticsService._resumir(*columnas)
+        calculo_numpy = time.perf_counter() - inicio
+
+        # Mismas filas como tuplas, recorridas en Python
+        filas = list(zip(*(columna.tolist() for columna in columnas)))
+        inicio = time.perf_counter()
+        _analizar_python(filas)
+        calculo_python = time.perf_counter() - inicio
+
+        print(f"chequeos:                         {analisis['totales']['cantidad']}")
+        print(f"lectura en columnas (s):          {lectura:.2f}")
+        print(f"cálculo NumPy (s):                {calculo_numpy:.3f}")
+        print(f"cálculo Python puro (s):          {calculo_python:.3f}")
+        print(f"tipo con peor promedio:           {analisis['por_descripcion'][0]['tipo']} "
+              f"({analisis['por_descripcion'][0]['promedio']})")
+
+
+if __name__ == "__main__":
+    main()
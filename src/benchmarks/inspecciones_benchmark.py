@@ -0,0 +1,94 @@
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+"""
+Benchmark del alta de inspecciones: inspecciones por segundo de un worker y sentencias
+SQL por inspección.
+
+Crea una base SQLite en archivo (cada sentencia es un viaje real al motor) con un turno
+CONFIRMADO de hoy por vehículo e inspecciona todos con InspectionService.create_inspection.
+
+Uso:
+    python -m src.benchmarks.inspecciones_benchmark --inspecciones 2000
+"""
+
+
+def _poblar(db, cantidad: int) -> int:
+    from sqlalchemy import insert
+    from src.models import Usuario, UsuarioRol, Vehiculo, EstadoVehiculo, Turno, EstadoTurno, ResultadoInspeccion, TipoChequeo
+    from src.models.check_type_model import TIPOS_CHEQUEO
+
+    db.session.add_all([UsuarioRol(nombre=nombre) for nombre in ['ADMIN', 'INSPECTOR', 'DUENIO']])
+    db.session.add_all([EstadoVehiculo(nombre=nombre) for nombre in ['ACTIVO', 'INACTIVO']])
+    db.session.add_all([EstadoTurno(nombre=nombre) for nombre in ['RESERVADO', 'CONFIRMADO', 'COMPLETADO', 'CANCELADO']])
+    db.session.add_all([ResultadoInspeccion(nombre=nombre) for nombre in ['SEGURO', 'RECHEQUEAR']])
+    db.session.add_all([TipoChequeo(nombre=nombre, descripcion=descripcion) for nombre, descripcion in TIPOS_CHEQUEO])
+    db.session.flush()
+
+    duenio = Usuario(nombre_completo="Dueño Benchmark", mail="duenio@example.com", telefono="0",
+                     hash_password="-", rol_id=3, activo=True)
+    inspector = Usuario(nombre_completo="Inspector Benchmark", mail="inspector@example.com", telefono="0",
+                        hash_password="-", rol_id=2, activo=True)
+    db.session.add_all([duenio, inspector])
+    db.session.flush()
+
+    db.session.execute(insert(Vehiculo), [
+        {"matricula": f"BEN{i:05d}", "marca": "Marca", "modelo": "Modelo", "anio": 2020,
+         "duenio_id": duenio.id, "estado_id": 1}
+        for i in range(cantidad)
+    ])
+    hoy = datetime.utcnow().replace(hour=10, minute=0, second=0, microsecond=0)
+    db.session.execute(insert(Turno), [
+        {"vehiculo_id": i + 1, "fecha": hoy, "estado_id": 2, "creado_por": duenio.id}
+        for i in range(cantidad)
+    ])
+    db.session.commit()
+    return inspector.id
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del alta de inspecciones")
+    parser.add_argument("--inspecciones", type=int, default=2000)
+    args = parser.parse_args()
+
+    directorio = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(directorio, 'benchmark.db')}"
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    from sqlalchemy import event
+    from src import create_app, db
+    from src.services.inspection_service import InspectionService
+    from src.models.check_type_model import TIPOS_CHEQUEO
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        inspector_id = _poblar(db, args.inspecciones)
+        db.session.remove()
+
+        sentencias = []
+        event.listen(db.engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *resto: sentencias.append(statement))
+
+        chequeos = [{"tipo": clave, "puntuacion": 8} for clave, _ in TIPOS_CHEQUEO]
+        inicio = time.perf_counter()
+        for turno_id in range(1, args.inspecciones + 1):
+            InspectionService.create_inspection({
+                "turno_id": turno_id,
+                "inspector_id": inspector_id,
+                "chequeos": chequeos,
+                "observacion": None
+            })
+            db.session.expunge_all()
+        duracion = time.perf_counter() - inicio
+
+        print(f"inspecciones:              {args.inspecciones}")
+        print(f"inspecciones por segundo:  {args.inspecciones / duracion:.1f}")
+        print(f"sentencias por inspección: {len(sentencias) / args.inspecciones:.1f}")
+
+
+if __name__ == "__main__":
+    main()
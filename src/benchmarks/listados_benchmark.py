@@ -0,0 +1,125 @@
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+"""
+Benchmark de los listados de turnos: entidades ORM con carga anticipada vs. proyección de columnas.
+
+Crea una base SQLite en memoria con la cantidad de turnos indicada y mide, para cada
+camino, el tiempo de CPU y el pico de memoria de traer y serializar todas las filas.
+
+Uso:
+    python -m src.benchmarks.listados_benchmark --filas 10000 100000
+"""
+
+
+def _poblar(db, cantidad: int) -> None:
+    from sqlalchemy import insert
+    from src.models import (
+        Usuario, UsuarioRol, Vehiculo, EstadoVehiculo, Turno, EstadoTurno, Inspeccion, ResultadoInspeccion
+    )
+
+    db.session.add_all([UsuarioRol(nombre=nombre) for nombre in ['ADMIN', 'INSPECTOR', 'DUENIO']])
+    db.session.add_all([EstadoVehiculo(nombre=nombre) for nombre in ['ACTIVO', 'INACTIVO']])
+    db.session.add_all([EstadoTurno(nombre=nombre) for nombre in ['RESERVADO', 'CONFIRMADO', 'COMPLETADO', 'CANCELADO']])
+    db.session.add(ResultadoInspeccion(nombre='SEGURO'))
+    db.session.flush()
+
+    usuario = Usuario(nombre_completo="Dueño Benchmark", mail="benchmark@example.com", telefono="0",
+                      hash_password="-", rol_id=3, activo=True)
+    db.session.add(usuario)
+    db.session.flush()
+
+    vehiculos = [Vehiculo(matricula=f"BEN{i:04d}", marca="Marca", modelo="Modelo", anio=2020,
+                          duenio_id=usuario.id, estado_id=1) for i in range(100)]
+    db.session.add_all(vehiculos)
+    db.session.flush()
+
+    inicio = datetime(2024, 1, 1, 9, 0)
+    db.session.execute(insert(Turno), [
+        {"vehiculo_id": vehiculos[i % 100].id, "fecha": inicio + timedelta(hours=i),
+         "estado_id": 3 if i % 2 == 0 else 1, "creado_por": usuario.id}
+        for i in range(cantidad)
+    ])
+    db.session.execute(insert(Inspeccion), [
+        {"vehiculo_id": vehiculos[i % 100].id, "turno_id": i + 1, "fecha": inicio + timedelta(hours=i),
+         "puntuacion_total": 60, "resultado_id": 1}
+        for i in range(0, cantidad, 2)
+    ])
+    db.session.commit()
+
+
+def _listar_entidades(cantidad: int) -> list[dict]:
+    """Camino anterior: entidades Turno con sus relaciones cargadas por JOIN."""
+    from src.models import Turno
+    from src.services.booking_service import BookingService
+
+    turnos = (BookingService._query_con_relaciones()
+              .order_by(Turno.fecha.desc(), Turno.id.desc())
+              .limit(cantidad)
+              .all())
+    return [{
+        "id": turno.id,
+        "vehiculo_id": turno.vehiculo_id,
+        "matricula": turno.vehiculo.matricula,
+        "fecha": turno.fecha.strftime('%Y-%m-%d %H:%M'),
+        "estado": turno.estado.nombre,
+        "creado_por": turno.creado_por,
+        "nombre_creador": turno.creador.nombre_completo,
+        "puntuacion_total": turno.inspeccion.puntuacion_total if turno.inspeccion else None,
+        "resultado": turno.inspeccion.resultado.nombre if turno.inspeccion and turno.inspeccion.resultado else None
+    } for turno in turnos]
+
+
+def _listar_proyeccion(cantidad: int) -> list[dict]:
+    """Camino actual: filas con solo las columnas del listado."""
+    from src.models import Turno
+    from src.services.booking_service import BookingService
+
+    filas = (BookingService._query_listado()
+             .order_by(Turno.fecha.desc(), Turno.id.desc())
+             .limit(cantidad)
+             .all())
+    return [BookingService.fila_a_dict(fila) for fila in filas]
+
+
+def _medir(db, funcion, cantidad: int) -> tuple[float, float]:
+    db.session.expunge_all()
+    tracemalloc.start()
+    inicio = time.process_time()
+    resultado = funcion(cantidad)
+    cpu = time.process_time() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(resultado) == cantidad
+    db.session.expunge_all()
+    return cpu, pico / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de listados de turnos")
+    parser.add_argument("--filas", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+
+    from src import create_app, db
+
+    print(f"{'filas':>8} | {'camino':<11} | {'CPU (s)':>8} | {'pico memoria (MB)':>17}")
+    for cantidad in args.filas:
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            _poblar(db, cantidad)
+            for nombre, funcion in [("entidades", _listar_entidades), ("proyeccion", _listar_proyeccion)]:
+                cpu, memoria = _medir(db, funcion, cantidad)
+                print(f"{cantidad:>8} | {nombre:<11} | {cpu:>8.3f} | {memoria:>17.1f}")
+            db.session.remove()
+            db.drop_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import click
+
+"""
+Comandos de consola del proyecto (se ejecutan con `flask <comando>`).
+"""
+
+
+def register_commands(app):
+
+    @app.cli.command("reconstruir-ocupacion")
+    def reconstruir_ocupacion():
+        """Regenera el calendario de ocupación de slots a partir de los turnos."""
+        from src.services.occupancy_service import OccupancyService
+        
+        total = OccupancyService.reconstruir()
+        click.echo(f"Calendario de ocupación regenerado: {total} slots ocupados")
+
+    @app.cli.command("reconstruir-ultimas-inspecciones")
+    def reconstruir_ultimas_inspecciones():
+        """Regenera la última inspección de cada vehículo a partir del historial."""
+        from src.services.latest_inspection_service import LatestInspectionService
+        
+        total = LatestInspectionService.reconstruir()
+        click.echo(f"Últimas inspecciones regeneradas: {total} vehículos")
+
+    @app.cli.command("reconstruir-estadisticas")
+    @click.option("--desde", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+                  help="Primer día a recalcular (YYYY-MM-DD). Sin indicar: desde el inicio del historial.")
+    @click.option("--hasta", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+                  help="Último día a recalcular (YYYY-MM-DD). Sin indicar: hasta el final del historial.")
+    def reconstruir_estadisticas(desde, hasta):
+        """Recalcula los acumulados diarios de inspecciones en un rango de fechas."""
+        from src.services.stats_service import StatsService
+        
+        try:
+            total = StatsService.reconstruir(desde.date() if desde else None, hasta.date() if hasta else None)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        click.echo(f"Estadísticas recalculadas: {total} inspecciones")
@@ -2,15 +2,47 @@ from src.services.booking_service import BookingService
 from src.schemas.booking_schemas import (
     DisponibilidadRequest,
     DisponibilidadResponse,
+    DisponibilidadCompactaResponse,
+    ProximosDisponiblesRequest,
+    ProximosDisponiblesResponse,
     BookingCreateRequest,
     BookingUpdateRequest,
     BookingResponse,
-    BookingListResponse
+    BookingListResponse,
+    BookingListFilters,
+    AgendaRequest,
+    AgendaResponse,
+    CacheEstadisticasResponse,
+    CierreCreateRequest,
+    CierreResponse,
+    CierresRecargaResponse
 )
-from flask import request, jsonify
+from src.services.closure_service import ClosureService
+from src.utils.cache_utils import obtener_cache_disponibilidad
+from src.utils.pagination_utils import leer_paginacion
+from flask import request, jsonify, make_response, Response, stream_with_context
 from typing import Tuple
+from datetime import datetime, date
+import json
 from pydantic import ValidationError
 
+# Media type para pedir la disponibilidad en formato compacto mediante el header Accept
+MIMETYPE_DISPONIBILIDAD_COMPACTA = "application/vnd.disponibilidad-compacta+json"
+
+
+def _formato_disponibilidad() -> str:
+    """
+    El formato se elige con el query parameter `formato` o, en su defecto, con el header Accept.
+    """
+    formato = request.args.get('formato')
+    if formato:
+        return formato
+    
+    if MIMETYPE_DISPONIBILIDAD_COMPACTA in request.accept_mimetypes.values():
+        return "compacto"
+    
+    return "completo"
+
 
 def consultar_disponibilidad() -> Tuple[dict, int]:
     try:
@@ -19,19 +51,144 @@ def consultar_disponibilidad() -> Tuple[dict, int]:
         
         data.validate_fecha_range()
         
+        formato = _formato_disponibilidad()
         disponibilidad = BookingService.consultar_disponibilidad(
             data.fecha_inicio,
-            data.fecha_final
+            data.fecha_final,
+            formato=formato
+        )
+        
+        if formato == "compacto":
+            response = DisponibilidadCompactaResponse(**disponibilidad)
+        else:
+            response = DisponibilidadResponse(**disponibilidad)
+        
+        http_response = jsonify(response.model_dump())
+        http_response.vary.add('Accept')
+        return http_response, 200 
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def consultar_disponibilidad_cacheable() -> Tuple[dict, int]:
+    """
+    Variante GET de la consulta de disponibilidad, con ETag fuerte.
+    Si el cliente envía If-None-Match con el ETag vigente se responde 304 sin generar los slots.
+    """
+    try:
+        data = DisponibilidadRequest(
+            fecha_inicio=request.args.get('fecha_inicio'),
+            fecha_final=request.args.get('fecha_final')
+        )
+        
+        data.validate_fecha_range()
+        
+        formato = _formato_disponibilidad()
+        # Las mismas versiones determinan el ETag y la entrada de cache del cuerpo
+        versiones = BookingService.versiones_disponibilidad()
+        etag = BookingService.etag_disponibilidad(data.fecha_inicio, data.fecha_final, formato=formato,
+                                                  versiones=versiones)
+        
+        if request.if_none_match.contains(etag):
+            http_response = make_response('', 304)
+        else:
+            disponibilidad = BookingService.consultar_disponibilidad(
+                data.fecha_inicio,
+                data.fecha_final,
+                formato=formato,
+                versiones=versiones
+            )
+            
+            if formato == "compacto":
+                response = DisponibilidadCompactaResponse(**disponibilidad)
+            else:
+                response = DisponibilidadResponse(**disponibilidad)
+            http_response = make_response(jsonify(response.model_dump()), 200)
+        
+        http_response.set_etag(etag)
+        http_response.headers['Cache-Control'] = 'private, no-cache'
+        http_response.vary.update(['Accept', 'Authorization'])
+        return http_response
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def buscar_proximos_disponibles() -> Tuple[dict, int]:
+    """
+    Devuelve los primeros N slots libres a partir de una fecha, con preferencias opcionales.
+    """
+    try:
+        request_data = request.json if request.json else {}
+        data = ProximosDisponiblesRequest(**request_data)
+        
+        resultado = BookingService.buscar_proximos_disponibles(
+            data.desde,
+            data.cantidad,
+            dias_semana=data.dias_semana,
+            horas=data.horas
         )
         
-        response = DisponibilidadResponse(**disponibilidad)
-        return jsonify(response.model_dump()), 200 
+        response = ProximosDisponiblesResponse(**resultado)
+        return jsonify(response.model_dump()), 200
     except ValidationError:
         raise
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
 
+def estadisticas_cache_disponibilidad() -> Tuple[dict, int]:
+    """
+    Contadores de la cache de disponibilidad (para dimensionarla).
+    """
+    try:
+        response = CacheEstadisticasResponse(**obtener_cache_disponibilidad().estadisticas())
+        return jsonify(response.model_dump()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def crear_cierre() -> Tuple[dict, int]:
+    """
+    Registra un feriado o cierre de planta y recompila el índice de cierres.
+    """
+    try:
+        data = CierreCreateRequest(**request.json)
+        
+        cierre = ClosureService.create_closure(data.model_dump())
+        
+        response_data = {
+            "id": cierre.id,
+            "fecha": cierre.fecha.strftime('%Y-%m-%d'),
+            "hora_desde": cierre.hora_desde.strftime('%H:%M') if cierre.hora_desde else None,
+            "hora_hasta": cierre.hora_hasta.strftime('%H:%M') if cierre.hora_hasta else None,
+            "motivo": cierre.motivo
+        }
+        
+        response = CierreResponse(**response_data)
+        return jsonify(response.model_dump()), 201
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def recargar_cierres() -> Tuple[dict, int]:
+    """
+    Recompila el índice de cierres desde la base (luego de cargas manuales), sin reiniciar.
+    """
+    try:
+        indice = ClosureService.recargar_cierres()
+        
+        response = CierresRecargaResponse(intervalos=len(indice))
+        return jsonify(response.model_dump()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
 def reservar_turno() -> Tuple[dict, int]:
     """
     Validaciones por rol:
@@ -129,36 +286,35 @@ def obtener_turno(turno_id: int) -> Tuple[dict, int]:
         return jsonify({"error": str(e)}), 400
 
 
+def _filtros_listado() -> dict:
+    """
+    Lee los filtros opcionales de los listados de turnos desde la query string.
+    """
+    campos = BookingListFilters.model_fields.keys()
+    filtros = BookingListFilters(**{k: v for k, v in request.args.items() if k in campos})
+    return filtros.model_dump(exclude_none=True)
+
+
 def listar_turnos_por_usuario() -> Tuple[dict, int]:
     """
-    Lista todos los turnos del usuario autenticado.
+    Lista los turnos del usuario autenticado, paginados con 'limit' y 'cursor'.
     """
     try:
         user_id = request.current_user['user_id']
         
-        turnos = BookingService.list_bookings_by_user(user_id)
+        limite, cursor = leer_paginacion(request.args)
+        filtros = _filtros_listado()
         
-        turnos_data = []
-        for turno in turnos:
-            turno_dict = {
-                "id": turno.id,
-                "vehiculo_id": turno.vehiculo_id,
-                "matricula": turno.vehiculo.matricula,
-                "fecha": turno.fecha.strftime('%Y-%m-%d %H:%M'),
-                "estado": turno.estado.nombre,
-                "creado_por": turno.creado_por,
-                "nombre_creador": turno.creador.nombre_completo
-            }
-            
-            if turno.estado_id == 3 and turno.inspeccion:
-                turno_dict["puntuacion_total"] = turno.inspeccion.puntuacion_total
-                turno_dict["resultado"] = turno.inspeccion.resultado.nombre if turno.inspeccion.resultado else None
-            
-            turnos_data.append(turno_dict)
+        turnos, next_cursor = BookingService.list_bookings_by_user(
+            user_id, limite=limite, cursor=cursor, filtros=filtros
+        )
+        
+        turnos_data = [BookingService.fila_a_dict(fila) for fila in turnos]
         
         response_data = {
             "turnos": turnos_data,
-            "total": len(turnos_data)
+            "total": len(turnos_data),
+            "next_cursor": next_cursor
         }
         
         response = BookingListResponse(**response_data)
@@ -174,29 +330,19 @@ def listar_turnos_por_vehiculo(matricula: str) -> Tuple[dict, int]:
         user_id = request.current_user['user_id']
         user_role = request.current_user['role']
         
-        turnos = BookingService.list_bookings_by_vehicle(matricula, user_id=user_id, user_role=user_role)
+        limite, cursor = leer_paginacion(request.args)
+        filtros = _filtros_listado()
         
-        turnos_data = []
-        for turno in turnos:
-            turno_dict = {
-                "id": turno.id,
-                "vehiculo_id": turno.vehiculo_id,
-                "matricula": turno.vehiculo.matricula,
-                "fecha": turno.fecha.strftime('%Y-%m-%d %H:%M'),
-                "estado": turno.estado.nombre,
-                "creado_por": turno.creado_por,
-                "nombre_creador": turno.creador.nombre_completo
-            }
-            
-            if turno.estado_id == 3 and turno.inspeccion:
-                turno_dict["puntuacion_total"] = turno.inspeccion.puntuacion_total
-                turno_dict["resultado"] = turno.inspeccion.resultado.nombre if turno.inspeccion.resultado else None
-            
-            turnos_data.append(turno_dict)
+        turnos, next_cursor = BookingService.list_bookings_by_vehicle(
+            matricula, user_id=user_id, user_role=user_role, limite=limite, cursor=cursor, filtros=filtros
+        )
+        
+        turnos_data = [BookingService.fila_a_dict(fila) for fila in turnos]
         
         response_data = {
             "turnos": turnos_data,
-            "total": len(turnos_data)
+            "total": len(turnos_data),
+            "next_cursor": next_cursor
         }
         
         response = BookingListResponse(**response_data)
@@ -212,29 +358,19 @@ def listar_todos_los_turnos() -> Tuple[dict, int]:
         user_id = request.current_user['user_id']
         user_role = request.current_user['role']
         
-        turnos = BookingService.list_all_bookings(user_id=user_id, user_role=user_role)
+        limite, cursor = leer_paginacion(request.args)
+        filtros = _filtros_listado()
         
-        turnos_data = []
-        for turno in turnos:
-            turno_dict = {
-                "id": turno.id,
-                "vehiculo_id": turno.vehiculo_id,
-                "matricula": turno.vehiculo.matricula,
-                "fecha": turno.fecha.strftime('%Y-%m-%d %H:%M'),
-                "estado": turno.estado.nombre,
-                "creado_por": turno.creado_por,
-                "nombre_creador": turno.creador.nombre_completo
-            }
-            
-            if turno.estado_id == 3 and turno.inspeccion:
-                turno_dict["puntuacion_total"] = turno.inspeccion.puntuacion_total
-                turno_dict["resultado"] = turno.inspeccion.resultado.nombre if turno.inspeccion.resultado else None
-            
-            turnos_data.append(turno_dict)
+        turnos, next_cursor = BookingService.list_all_bookings(
+            user_id=user_id, user_role=user_role, limite=limite, cursor=cursor, filtros=filtros
+        )
+        
+        turnos_data = [BookingService.fila_a_dict(fila) for fila in turnos]
         
         response_data = {
             "turnos": turnos_data,
-            "total": len(turnos_data)
+            "total": len(turnos_data),
+            "next_cursor": next_cursor
         }
         
         response = BookingListResponse(**response_data)
@@ -244,3 +380,59 @@ def listar_todos_los_turnos() -> Tuple[dict, int]:
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+
+def exportar_turnos():
+    """
+    Exporta todos los turnos como NDJSON (un objeto JSON por línea) en streaming.
+    
+    Los filtros se validan antes de empezar a responder; a partir de ahí cada línea se
+    escribe a medida que llega de la base, sin armar la respuesta completa en memoria.
+    """
+    try:
+        filtros = _filtros_listado()
+        turnos = BookingService.exportar_turnos(filtros)
+        # Se obtiene la primera fila acá para que un error de filtros responda 400
+        primero = next(turnos, None)
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    
+    def generar():
+        if primero is None:
+            return
+        yield json.dumps(primero, ensure_ascii=False) + "\n"
+        for turno in turnos:
+            yield json.dumps(turno, ensure_ascii=False) + "\n"
+    
+    return Response(stream_with_context(generar()), mimetype="application/x-ndjson")
+
+
+def obtener_agenda() -> Tuple[dict, int]:
+    """
+    Agenda del día para los inspectores: turnos CONFIRMADOS con vehículo y contacto del dueño.
+    Responde 304 si el cliente envía If-None-Match con el ETag vigente, sin consultar los turnos.
+    """
+    try:
+        data = AgendaRequest(fecha=request.args.get('fecha'))
+        dia = datetime.strptime(data.fecha, '%Y-%m-%d').date() if data.fecha else date.today()
+        
+        # La misma versión determina el ETag y la entrada de cache del cuerpo
+        version = BookingService.version_agenda()
+        etag = BookingService.etag_agenda(dia, version)
+        
+        if request.if_none_match.contains(etag):
+            http_response = make_response('', 304)
+        else:
+            turnos = BookingService.agenda_del_dia(dia, version)
+            response = AgendaResponse(fecha=dia.strftime('%Y-%m-%d'), turnos=turnos, total=len(turnos))
+            http_response = make_response(jsonify(response.model_dump()), 200)
+        
+        http_response.set_etag(etag)
+        http_response.headers['Cache-Control'] = 'private, no-cache'
+        http_response.vary.add('Authorization')
+        return http_response
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
@@ -1,13 +1,31 @@
 from src.services.inspection_service import InspectionService
+from src.services.latest_inspection_service import LatestInspectionService
+from src.services.stats_service import StatsService
+from src.services.check_analytics_service import CheckAnalyticsService
+from src.services.catalog_service import CatalogService
 from src.schemas.inspection_schemas import (
     InspectionCreateRequest,
     InspectionDetailResponse,
-    InspectionListResponse
+    InspectionListResponse,
+    InspectionListFilters,
+    InspectionBatchRequest,
+    InspectionBatchResponse,
+    UltimaInspeccionVehiculoResponse,
+    InspectionStatsRequest,
+    InspectionStatsResponse,
+    ChequeoAnalisisResponse
 )
-from flask import request, jsonify
+from src.utils.pagination_utils import leer_paginacion
+from flask import request, jsonify, current_app
 from typing import Tuple
+from datetime import datetime, timedelta
 from pydantic import ValidationError
 
+# Rango de las estadísticas cuando no se indica 'desde': los últimos 30 días
+DIAS_ESTADISTICAS_POR_DEFECTO = 30
+# Rango del análisis de chequeos cuando no se indica 'desde': el último año
+DIAS_ANALISIS_CHEQUEOS_POR_DEFECTO = 365
+
 
 def create_inspection() -> Tuple[dict, int]:
     """
@@ -18,29 +36,9 @@ def create_inspection() -> Tuple[dict, int]:
         data = InspectionCreateRequest(**request.json)
         inspection_data = data.model_dump()
         
-        inspection = InspectionService.create_inspection(inspection_data)
-        
-        chequeos_response = []
-        for chequeo in inspection.chequeos:
-            chequeos_response.append({
-                "id": chequeo.id,
-                "descripcion": chequeo.descripcion,
-                "puntuacion": chequeo.puntuacion,
-                "fecha": chequeo.fecha
-            })
+        detalle = InspectionService.create_inspection(inspection_data)
         
-        response_data = {
-            "id": inspection.id,
-            "turno_id": inspection.turno_id,
-            "vehiculo_matricula": inspection.vehiculo.matricula,
-            "inspector_nombre": inspection.inspector.nombre_completo,
-            "fecha": inspection.fecha,
-            "puntuacion_total": inspection.puntuacion_total,
-            "resultado": inspection.resultado.nombre if inspection.resultado else None,
-            "observacion": inspection.observacion,
-            "chequeos": chequeos_response
-        }
-        response = InspectionDetailResponse(**response_data)
+        response = InspectionDetailResponse(**detalle)
         return jsonify(response.model_dump()), 201
     except ValidationError:
         raise
@@ -48,6 +46,56 @@ def create_inspection() -> Tuple[dict, int]:
         return jsonify({"error": str(e)}), 400
 
 
+def create_inspections_batch() -> Tuple[dict, int]:
+    """
+    Registra un lote de inspecciones cargadas sin conexión.
+    Los errores de cada inspección se informan en su resultado sin abortar las demás.
+    """
+    try:
+        data = InspectionBatchRequest(**request.json)
+        
+        maximo = current_app.config.get('INSPECCIONES_LOTE_MAXIMO', 200)
+        if len(data.inspecciones) > maximo:
+            raise ValueError(f"El lote no puede superar las {maximo} inspecciones")
+        
+        # Validar cada inspección contra el esquema individual
+        resultados = [None] * len(data.inspecciones)
+        validas = []
+        for indice, item in enumerate(data.inspecciones):
+            try:
+                validas.append((indice, InspectionCreateRequest(**item).model_dump()))
+            except ValidationError as e:
+                errores = [f"Campo '{err['loc'][0] if err['loc'] else 'unknown'}': {err['msg']}"
+                           for err in e.errors()]
+                resultados[indice] = {
+                    "indice": indice,
+                    "turno_id": item.get("turno_id") if isinstance(item.get("turno_id"), int) else None,
+                    "creada": False,
+                    "resultado": None,
+                    "inspeccion": None,
+                    "error": "; ".join(errores)
+                }
+        
+        registradas = InspectionService.create_inspections_batch(
+            [inspeccion for _, inspeccion in validas],
+            tamanio_lote=current_app.config.get('INSPECCIONES_LOTE_TAMANIO_COMMIT', 50)
+        )
+        for (indice, _), resultado in zip(validas, registradas):
+            resultados[indice] = {"indice": indice, **resultado}
+        
+        creadas = sum(1 for resultado in resultados if resultado["creada"])
+        response = InspectionBatchResponse(
+            resultados=resultados,
+            creadas=creadas,
+            fallidas=len(resultados) - creadas
+        )
+        return jsonify(response.model_dump()), 200
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
 def get_inspection(inspeccion_id: int) -> Tuple[dict, int]:
     try:
         user_id = request.current_user['user_id']
@@ -55,11 +103,13 @@ def get_inspection(inspeccion_id: int) -> Tuple[dict, int]:
         
         inspection = InspectionService.get_inspection_by_id(inspeccion_id, user_id=user_id, user_role=user_role)
         
+        tipos_chequeo = CatalogService.tipos_chequeo()
         chequeos_response = []
         for chequeo in inspection.chequeos:
             chequeos_response.append({
                 "id": chequeo.id,
-                "descripcion": chequeo.descripcion,
+                "tipo": tipos_chequeo[chequeo.tipo_chequeo_id][0],
+                "descripcion": tipos_chequeo[chequeo.tipo_chequeo_id][1],
                 "puntuacion": chequeo.puntuacion,
                 "fecha": chequeo.fecha
             })
@@ -83,6 +133,15 @@ def get_inspection(inspeccion_id: int) -> Tuple[dict, int]:
         return jsonify({"error": str(e)}), 400
 
 
+def _filtros_listado() -> dict:
+    """
+    Lee los filtros opcionales de los listados de inspecciones desde la query string.
+    """
+    campos = InspectionListFilters.model_fields.keys()
+    filtros = InspectionListFilters(**{k: v for k, v in request.args.items() if k in campos})
+    return filtros.model_dump(exclude_none=True)
+
+
 def list_inspections_by_vehiculo(matricula: str) -> Tuple[dict, int]:
     """
     Validaciones de autorización:
@@ -93,24 +152,20 @@ def list_inspections_by_vehiculo(matricula: str) -> Tuple[dict, int]:
         user_id = request.current_user['user_id']
         user_role = request.current_user['role']
         
-        inspections = InspectionService.list_inspections_by_vehiculo(matricula, user_id=user_id, user_role=user_role)
-        
-        inspections_data = []
-        for inspection in inspections:
-            inspections_data.append({
-                "id": inspection.id,
-                "turno_id": inspection.turno_id,
-                "vehiculo_matricula": inspection.vehiculo.matricula,
-                "inspector_nombre": inspection.inspector.nombre_completo,
-                "fecha": inspection.fecha,
-                "puntuacion_total": inspection.puntuacion_total,
-                "resultado": inspection.resultado.nombre if inspection.resultado else None,
-                "observacion": inspection.observacion
-            })
+        limite, cursor = leer_paginacion(request.args)
+        filtros = _filtros_listado()
+        
+        inspections, next_cursor = InspectionService.list_inspections_by_vehiculo(
+            matricula, user_id=user_id, user_role=user_role, limite=limite, cursor=cursor, filtros=filtros
+        )
+        
+        # Las filas de la proyección ya tienen los nombres de campo de InspectionResponse
+        inspections_data = [fila._asdict() for fila in inspections]
         
         response_data = {
             "inspecciones": inspections_data,
-            "total": len(inspections_data)
+            "total": len(inspections_data),
+            "next_cursor": next_cursor
         }
         response = InspectionListResponse(**response_data)
         return jsonify(response.model_dump()), 200
@@ -120,6 +175,28 @@ def list_inspections_by_vehiculo(matricula: str) -> Tuple[dict, int]:
         return jsonify({"error": str(e)}), 400
 
 
+def get_latest_inspection(matricula: str) -> Tuple[dict, int]:
+    """
+    Devuelve la última inspección de un vehículo, leída de la tabla ultima_inspeccion.
+    
+    Validaciones de autorización:
+    - ADMIN e INSPECTOR pueden consultar cualquier vehículo
+    - DUENIO solo puede consultar sus propios vehículos
+    """
+    try:
+        user_id = request.current_user['user_id']
+        user_role = request.current_user['role']
+        
+        ultima = LatestInspectionService.obtener_por_matricula(matricula, user_id=user_id, user_role=user_role)
+        
+        response = UltimaInspeccionVehiculoResponse(matricula=matricula, ultima_inspeccion=ultima)
+        return jsonify(response.model_dump()), 200
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
 def list_inspections_by_inspector(inspector_id: int) -> Tuple[dict, int]:
     """    
     Validaciones de autorización:
@@ -130,24 +207,20 @@ def list_inspections_by_inspector(inspector_id: int) -> Tuple[dict, int]:
         user_id = request.current_user['user_id']
         user_role = request.current_user['role']
         
-        inspections = InspectionService.list_inspections_by_inspector(inspector_id, user_id=user_id, user_role=user_role)
-        
-        inspections_data = []
-        for inspection in inspections:
-            inspections_data.append({
-                "id": inspection.id,
-                "turno_id": inspection.turno_id,
-                "vehiculo_matricula": inspection.vehiculo.matricula,
-                "inspector_nombre": inspection.inspector.nombre_completo,
-                "fecha": inspection.fecha,
-                "puntuacion_total": inspection.puntuacion_total,
-                "resultado": inspection.resultado.nombre if inspection.resultado else None,
-                "observacion": inspection.observacion
-            })
+        limite, cursor = leer_paginacion(request.args)
+        filtros = _filtros_listado()
+        
+        inspections, next_cursor = InspectionService.list_inspections_by_inspector(
+            inspector_id, user_id=user_id, user_role=user_role, limite=limite, cursor=cursor, filtros=filtros
+        )
+        
+        # Las filas de la proyección ya tienen los nombres de campo de InspectionResponse
+        inspections_data = [fila._asdict() for fila in inspections]
         
         response_data = {
             "inspecciones": inspections_data,
-            "total": len(inspections_data)
+            "total": len(inspections_data),
+            "next_cursor": next_cursor
         }
         response = InspectionListResponse(**response_data)
         return jsonify(response.model_dump()), 200
@@ -167,31 +240,30 @@ def list_all_inspections() -> Tuple[dict, int]:
         user_id = request.current_user['user_id']
         user_role = request.current_user['role']
         
+        limite, cursor = leer_paginacion(request.args)
+        filtros = _filtros_listado()
+        
         if user_role == 'INSPECTOR':
-            inspections = InspectionService.list_inspections_by_inspector(
+            inspections, next_cursor = InspectionService.list_inspections_by_inspector(
                 inspector_id=user_id, 
                 user_id=user_id, 
-                user_role=user_role
+                user_role=user_role,
+                limite=limite,
+                cursor=cursor,
+                filtros=filtros
             )
         else:
-            inspections = InspectionService.list_all_inspections()
-        
-        inspections_data = []
-        for inspection in inspections:
-            inspections_data.append({
-                "id": inspection.id,
-                "turno_id": inspection.turno_id,
-                "vehiculo_matricula": inspection.vehiculo.matricula,
-                "inspector_nombre": inspection.inspector.nombre_completo,
-                "fecha": inspection.fecha,
-                "puntuacion_total": inspection.puntuacion_total,
-                "resultado": inspection.resultado.nombre if inspection.resultado else None,
-                "observacion": inspection.observacion
-            })
+            inspections, next_cursor = InspectionService.list_all_inspections(
+                limite=limite, cursor=cursor, filtros=filtros
+            )
+        
+        # Las filas de la proyección ya tienen los nombres de campo de InspectionResponse
+        inspections_data = [fila._asdict() for fila in inspections]
         
         response_data = {
             "inspecciones": inspections_data,
-            "total": len(inspections_data)
+            "total": len(inspections_data),
+            "next_cursor": next_cursor
         }
         response = InspectionListResponse(**response_data)
         return jsonify(response.model_dump()), 200
@@ -200,3 +272,52 @@ def list_all_inspections() -> Tuple[dict, int]:
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+
+
+def _rango_de_fechas(data: InspectionStatsRequest, dias_por_defecto: int) -> tuple:
+    """
+    Rango [desde, hasta] pedido; sin 'hasta' termina hoy y sin 'desde' abarca `dias_por_defecto` días.
+    """
+    hasta = datetime.strptime(data.hasta, '%Y-%m-%d').date() if data.hasta else datetime.utcnow().date()
+    desde = (datetime.strptime(data.desde, '%Y-%m-%d').date() if data.desde
+             else hasta - timedelta(days=dias_por_defecto - 1))
+    return desde, hasta
+
+
+def get_inspection_stats() -> Tuple[dict, int]:
+    """
+    Estadísticas de inspecciones (tasas de aprobación y rechequeo, puntuación promedio)
+    por día, por inspector y por año del vehículo, leídas de los acumulados diarios.
+    """
+    try:
+        data = InspectionStatsRequest(desde=request.args.get('desde'), hasta=request.args.get('hasta'))
+        
+        desde, hasta = _rango_de_fechas(data, DIAS_ESTADISTICAS_POR_DEFECTO)
+        
+        estadisticas = StatsService.obtener(desde, hasta)
+        
+        response = InspectionStatsResponse(**estadisticas)
+        return jsonify(response.model_dump()), 200
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def get_check_analytics() -> Tuple[dict, int]:
+    """
+    Distribución de las puntuaciones de los chequeos (histograma, promedio y percentiles)
+    por descripción, por mes y por inspector.
+    """
+    try:
+        data = InspectionStatsRequest(desde=request.args.get('desde'), hasta=request.args.get('hasta'))
+        desde, hasta = _rango_de_fechas(data, DIAS_ANALISIS_CHEQUEOS_POR_DEFECTO)
+        
+        analisis = CheckAnalyticsService.analizar(desde, hasta)
+        
+        response = ChequeoAnalisisResponse(**analisis)
+        return jsonify(response.model_dump()), 200
+    except ValidationError:
+        raise
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
@@ -9,8 +9,14 @@ from src.models.vehicle_model import Vehiculo
 from src.models.booking_model import Turno
 from src.models.inspection_model import Inspeccion
 from src.models.verification_model import Chequeo
+from src.models.slot_occupancy_model import OcupacionSlot
+from src.models.closure_model import Cierre
+from src.models.version_counter_model import ContadorVersion
+from src.models.latest_inspection_model import UltimaInspeccion
+from src.models.daily_stats_model import EstadisticaDiaria
 
 from src.models.user_rol_model import UsuarioRol
 from src.models.booking_state_model import EstadoTurno
 from src.models.inspection_result_model import ResultadoInspeccion
 from src.models.vehicle_state_model import EstadoVehiculo
+from src.models.check_type_model import TipoChequeo
@@ -4,6 +4,13 @@ from src import db
 
 class Turno(db.Model):
     __tablename__ = "turno"
+    __table_args__ = (
+        # Índices para los filtros y la paginación por clave (fecha, id) de los listados
+        db.Index("idx_turno_fecha_id", "fecha", "id"),
+        db.Index("idx_turno_vehiculo_fecha_id", "vehiculo_id", "fecha", "id"),
+        db.Index("idx_turno_creador_fecha_id", "creado_por", "fecha", "id"),
+        db.Index("idx_turno_estado_fecha_id", "estado_id", "fecha", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     vehiculo_id = db.Column(db.Integer, db.ForeignKey("vehiculo.id"), nullable=False)
@@ -0,0 +1,23 @@
+from src import db
+
+# Tipos de chequeo que se cargan en toda base nueva: (clave, descripción)
+TIPOS_CHEQUEO = [
+    ('LUCES', 'Luces y señalización'),
+    ('FRENOS', 'Frenos'),
+    ('DIRECCION', 'Dirección y suspensión'),
+    ('NEUMATICOS', 'Neumáticos'),
+    ('CHASIS', 'Chasis y estructura'),
+    ('CONTAMINACION', 'Contaminación y ruidos'),
+    ('SEGURIDAD', 'Elementos de seguridad obligatorios'),
+    ('CINTURONES', 'Cinturones, vidrios y espejos'),
+]
+
+
+class TipoChequeo(db.Model):
+    __tablename__ = "tipo_chequeo"
+
+    id = db.Column(db.Integer, primary_key=True)
+    nombre = db.Column(db.String(50), unique=True, nullable=False)
+    descripcion = db.Column(db.String(200), unique=True, nullable=False)
+
+    chequeos = db.relationship("Chequeo", back_populates="tipo")
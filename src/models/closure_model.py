@@ -0,0 +1,11 @@
+from src import db
+
+
+class Cierre(db.Model):
+    __tablename__ = "cierre"
+
+    id = db.Column(db.Integer, primary_key=True)
+    fecha = db.Column(db.Date, nullable=False, index=True)
+    hora_desde = db.Column(db.Time)  # Sin horas: la planta cierra el día completo
+    hora_hasta = db.Column(db.Time)
+    motivo = db.Column(db.String(200), nullable=False)
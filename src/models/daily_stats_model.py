@@ -0,0 +1,22 @@
+from src import db
+
+
+class EstadisticaDiaria(db.Model):
+    """
+    Acumulado diario de inspecciones por inspector, año del vehículo y resultado.
+    Cada inspección suma una unidad a su fila en la misma transacción en que se
+    registra; las estadísticas se calculan sumando estas filas, sin leer inspeccion.
+    """
+    __tablename__ = "estadistica_diaria"
+    __table_args__ = (
+        db.UniqueConstraint("fecha", "inspector_id", "anio_vehiculo", "resultado_id",
+                            name="uq_estadistica_diaria"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    fecha = db.Column(db.Date, nullable=False)
+    inspector_id = db.Column(db.Integer, db.ForeignKey("usuario.id"), nullable=False)
+    anio_vehiculo = db.Column(db.Integer, nullable=False)
+    resultado_id = db.Column(db.Integer, db.ForeignKey("resultado_inspeccion.id"), nullable=False)
+    cantidad = db.Column(db.Integer, nullable=False, default=0)
+    puntuacion_suma = db.Column(db.Integer, nullable=False, default=0)
@@ -1,9 +1,16 @@
 from datetime import datetime
+from sqlalchemy.dialects import mysql
 from src import db
 
 
 class Inspeccion(db.Model):
     __tablename__ = "inspeccion"
+    __table_args__ = (
+        db.Index("idx_inspeccion_fecha", "fecha"),
+        # Listados por vehículo y por inspector, ordenados por fecha
+        db.Index("idx_inspeccion_vehiculo_fecha_id", "vehiculo_id", "fecha", "id"),
+        db.Index("idx_inspeccion_inspector_fecha_id", "inspector_id", "fecha", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     vehiculo_id = db.Column(db.Integer, db.ForeignKey("vehiculo.id"), nullable=False)
@@ -13,6 +20,9 @@ class Inspeccion(db.Model):
     puntuacion_total = db.Column(db.Integer, default=0)
     resultado_id = db.Column(db.Integer, db.ForeignKey("resultado_inspeccion.id"))
     observacion = db.Column(db.Text)
+    # Las 8 puntuaciones, un byte por tipo de chequeo en el orden de TIPOS_CHEQUEO
+    # (NULL en inspecciones históricas que no evaluaron exactamente esos 8 tipos)
+    puntuaciones = db.Column(db.LargeBinary(8).with_variant(mysql.BINARY(8), "mysql"))
 
     vehiculo = db.relationship("Vehiculo", back_populates="inspecciones")
     turno = db.relationship("Turno", back_populates="inspeccion")
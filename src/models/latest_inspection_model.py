@@ -0,0 +1,16 @@
+from src import db
+
+
+class UltimaInspeccion(db.Model):
+    """
+    Última inspección de cada vehículo, desnormalizada para consultarla por clave
+    primaria sin recorrer el historial. Se actualiza en la misma transacción que
+    registra cada inspección.
+    """
+    __tablename__ = "ultima_inspeccion"
+
+    vehiculo_id = db.Column(db.Integer, db.ForeignKey("vehiculo.id"), primary_key=True, autoincrement=False)
+    inspeccion_id = db.Column(db.Integer, db.ForeignKey("inspeccion.id"), nullable=False)
+    fecha = db.Column(db.DateTime, nullable=False)
+    resultado_id = db.Column(db.Integer, db.ForeignKey("resultado_inspeccion.id"))
+    puntuacion_total = db.Column(db.Integer)
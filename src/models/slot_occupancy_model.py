@@ -0,0 +1,9 @@
+from src import db
+
+
+class OcupacionSlot(db.Model):
+    __tablename__ = "ocupacion_slot"
+
+    id = db.Column(db.Integer, primary_key=True)
+    fecha = db.Column(db.DateTime, unique=True, nullable=False)
+    ocupados = db.Column(db.Integer, nullable=False, default=0)
@@ -3,6 +3,10 @@ from src import db
 
 class Usuario(db.Model):
     __tablename__ = "usuario"
+    __table_args__ = (
+        # Índice del script original (vehicles_db_creation.sql)
+        db.Index("idx_usuario_mail", "mail"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     nombre_completo = db.Column(db.String(100), nullable=False)
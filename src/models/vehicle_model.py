@@ -3,6 +3,11 @@ from src import db
 
 class Vehiculo(db.Model):
     __tablename__ = "vehiculo"
+    __table_args__ = (
+        # Índice del script original (vehicles_db_creation.sql)
+        db.Index("idx_vehiculo_matricula", "matricula"),
+        db.Index("idx_vehiculo_duenio", "duenio_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     matricula = db.Column(db.String(20), unique=True, nullable=False)
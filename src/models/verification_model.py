@@ -4,11 +4,15 @@ from src import db
 
 class Chequeo(db.Model):
     __tablename__ = "chequeo"
+    __table_args__ = (
+        db.Index("idx_chequeo_inspeccion", "inspeccion_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     inspeccion_id = db.Column(db.Integer, db.ForeignKey("inspeccion.id"))
-    descripcion = db.Column(db.String(200), nullable=False)
+    tipo_chequeo_id = db.Column(db.Integer, db.ForeignKey("tipo_chequeo.id"), nullable=False)
     fecha = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     puntuacion = db.Column(db.Integer, nullable=False)
 
     inspeccion = db.relationship("Inspeccion", back_populates="chequeos")
+    tipo = db.relationship("TipoChequeo", back_populates="chequeos")
@@ -0,0 +1,8 @@
+from src import db
+
+
+class ContadorVersion(db.Model):
+    __tablename__ = "contador_version"
+
+    nombre = db.Column(db.String(50), primary_key=True)
+    valor = db.Column(db.Integer, nullable=False, default=0)
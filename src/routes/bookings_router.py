@@ -1,11 +1,18 @@
 from flask import Blueprint
-from src.utils.jwt_utils import token_required
+from src.utils.jwt_utils import token_required, role_required
 from src.controllers.booking_controller import (
     consultar_disponibilidad,
+    consultar_disponibilidad_cacheable,
+    estadisticas_cache_disponibilidad,
+    buscar_proximos_disponibles,
+    crear_cierre,
+    recargar_cierres,
     reservar_turno,
     actualizar_turno,
     obtener_turno,
-    listar_todos_los_turnos
+    listar_todos_los_turnos,
+    exportar_turnos,
+    obtener_agenda
 )
 
 bookings = Blueprint('bookings', __name__)
@@ -22,6 +29,15 @@ def availability():
     security:
       - Bearer: []
     parameters:
+      - in: query
+        name: formato
+        type: string
+        enum: [completo, compacto]
+        required: false
+        description: |
+          Formato de la respuesta (por defecto "completo", un objeto por slot).
+          "compacto" devuelve una entrada por día con un bitset de slots libres.
+          También se puede pedir con el header "Accept: application/vnd.disponibilidad-compacta+json"
       - in: body
         name: body
         required: false
@@ -54,11 +70,39 @@ def availability():
                     example: "2025-10-25 10:00"
                   disponible:
                     type: boolean
+                  capacidad_restante:
+                    type: integer
+                    description: Lugares libres en el slot (una por línea de inspección)
             total_disponibles:
               type: integer
               description: Cantidad total de slots disponibles
+            dias:
+              type: array
+              description: Solo en formato compacto (reemplaza a slots)
+              items:
+                type: object
+                properties:
+                  fecha:
+                    type: string
+                    example: "2025-10-27"
+                  hora_inicio:
+                    type: string
+                    example: "09:00"
+                    description: Horario del primer slot del bitset
+                  duracion_minutos:
+                    type: integer
+                    example: 60
+                  cantidad_slots:
+                    type: integer
+                    example: 11
+                  disponibles:
+                    type: string
+                    example: "/Qc="
+                    description: Bitset en base64 (little-endian) sobre la grilla completa de slots futuros del día, el bit i indica si el slot i está libre (los slots cerrados quedan en 0)
+                  total_disponibles:
+                    type: integer
       400:
-        description: Fecha inválida o rango de fechas incorrecto
+        description: Fecha inválida, rango de fechas incorrecto o formato inválido
         schema:
           type: object
           properties:
@@ -75,6 +119,304 @@ def availability():
     return consultar_disponibilidad()
 
 
+@bookings.route("/availability", methods=['GET'])
+@token_required
+def availability_get():
+    """
+    Consultar disponibilidad general del sistema (variante cacheable con ETag)
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: fecha_inicio
+        type: string
+        format: date
+        required: false
+        description: Fecha desde la cual buscar (opcional, por defecto hoy)
+      - in: query
+        name: fecha_final
+        type: string
+        format: date
+        required: false
+        description: Fecha hasta la cual buscar (opcional, si no se especifica muestra los próximos 15 días)
+      - in: query
+        name: formato
+        type: string
+        enum: [completo, compacto]
+        required: false
+        description: Formato de la respuesta (igual que en POST /api/bookings/availability)
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+        description: ETag de una respuesta anterior; si sigue vigente se responde 304 sin cuerpo
+    responses:
+      200:
+        description: Misma respuesta que POST /api/bookings/availability, con header ETag
+      304:
+        description: La disponibilidad no cambió desde el ETag enviado
+      400:
+        description: Fecha inválida, rango de fechas incorrecto o formato inválido
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return consultar_disponibilidad_cacheable()
+
+
+@bookings.route("/availability/next", methods=['POST'])
+@token_required
+def availability_next():
+    """
+    Buscar los próximos slots libres
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: false
+        schema:
+          type: object
+          properties:
+            desde:
+              type: string
+              format: datetime
+              example: "2025-10-27 08:00"
+              description: Fecha y hora desde la cual buscar (opcional, por defecto ahora)
+            cantidad:
+              type: integer
+              example: 5
+              description: Cantidad de slots libres a devolver (1-50, por defecto 5)
+            dias_semana:
+              type: array
+              items:
+                type: integer
+              example: [0, 2]
+              description: Días de la semana preferidos (Lunes=0 a Domingo=6), opcional
+            horas:
+              type: array
+              items:
+                type: integer
+              example: [9, 10]
+              description: Horas de inicio preferidas, opcional
+    responses:
+      200:
+        description: Primeros slots libres encontrados, en orden cronológico
+        schema:
+          type: object
+          properties:
+            slots:
+              type: array
+              items:
+                type: object
+                properties:
+                  fecha:
+                    type: string
+                    example: "2025-10-27 09:00"
+                  disponible:
+                    type: boolean
+                  capacidad_restante:
+                    type: integer
+                    description: Lugares libres en el slot (una por línea de inspección)
+            total:
+              type: integer
+      400:
+        description: Datos de búsqueda inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return buscar_proximos_disponibles()
+
+
+@bookings.route("/availability/cache", methods=['GET'])
+@token_required
+@role_required('ADMIN')
+def availability_cache():
+    """
+    Estadísticas de la cache de disponibilidad (solo ADMIN)
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Contadores de la cache de disponibilidad del worker que atiende la petición
+        schema:
+          type: object
+          properties:
+            entradas:
+              type: integer
+            max_entradas:
+              type: integer
+            ttl_segundos:
+              type: number
+            hits:
+              type: integer
+            misses:
+              type: integer
+            evictions:
+              type: integer
+            invalidaciones:
+              type: integer
+      401:
+        description: Token no proporcionado o inválido
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      403:
+        description: Acceso denegado (se requiere rol ADMIN)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return estadisticas_cache_disponibilidad()
+
+
+@bookings.route("/closures", methods=['POST'])
+@token_required
+@role_required('ADMIN')
+def cierres():
+    """
+    Registrar un feriado o cierre de planta (solo ADMIN)
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - fecha
+            - motivo
+          properties:
+            fecha:
+              type: string
+              format: date
+              example: "2025-12-08"
+            hora_desde:
+              type: string
+              example: "14:00"
+              description: Inicio del cierre parcial (opcional, sin horas el cierre es de día completo)
+            hora_hasta:
+              type: string
+              example: "18:00"
+              description: Fin del cierre parcial (obligatorio si se indica hora_desde)
+            motivo:
+              type: string
+              example: Feriado nacional
+    responses:
+      201:
+        description: Cierre registrado; los slots afectados dejan de ofrecerse
+        schema:
+          type: object
+          properties:
+            id:
+              type: integer
+            fecha:
+              type: string
+            hora_desde:
+              type: string
+            hora_hasta:
+              type: string
+            motivo:
+              type: string
+      400:
+        description: Datos inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      403:
+        description: Acceso denegado (se requiere rol ADMIN)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return crear_cierre()
+
+
+@bookings.route("/closures/reload", methods=['POST'])
+@token_required
+@role_required('ADMIN')
+def cierres_recargar():
+    """
+    Recompilar el índice de cierres desde la base sin reiniciar (solo ADMIN)
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    responses:
+      200:
+        description: Índice recompilado en el worker que atiende la petición
+        schema:
+          type: object
+          properties:
+            intervalos:
+              type: integer
+              description: Intervalos de cierre en el índice (luego de fusionar superpuestos)
+      401:
+        description: Token no proporcionado o inválido
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      403:
+        description: Acceso denegado (se requiere rol ADMIN)
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+    """
+    return recargar_cierres()
+
+
 @bookings.route("", methods=['POST'])
 @token_required
 def crear():
@@ -102,7 +444,7 @@ def crear():
               type: string
               format: datetime
               example: "2025-10-25 10:00"
-              description: Fecha y hora del turno (Lunes-Viernes 9-20hs)
+              description: Fecha y hora del turno (Lunes-Viernes 9-20hs, alineada al inicio de un slot)
     responses:
       201:
         description: Turno creado exitosamente (estado RESERVADO)
@@ -297,6 +639,39 @@ def listar_todos():
       - Turnos
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 100
+        description: Cantidad máxima de turnos por página (1 a 500)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Valor de next_cursor de la página anterior
+      - in: query
+        name: estado
+        type: string
+        required: false
+        enum: [RESERVADO, CONFIRMADO, COMPLETADO, CANCELADO]
+        description: Filtrar por estado del turno
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: matricula
+        type: string
+        required: false
+        description: Filtrar por matrícula del vehículo
     responses:
       200:
         description: Lista de turnos según permisos del usuario
@@ -330,6 +705,17 @@ def listar_todos():
                     description: Resultado de la inspección (solo para turnos COMPLETADO)
             total:
               type: integer
+              description: Cantidad de turnos en esta página
+            next_cursor:
+              type: string
+              description: Cursor de la página siguiente (null si no hay más turnos)
+      400:
+        description: Parámetros de paginación o filtros inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
       401:
         description: Token no proporcionado o inválido
         schema:
@@ -339,3 +725,138 @@ def listar_todos():
               type: string
     """
     return listar_todos_los_turnos()
+
+
+@bookings.route("/export", methods=['GET'])
+@token_required
+@role_required('ADMIN')
+def exportar():
+    """
+    Exportar turnos en formato NDJSON (solo ADMIN)
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    produces:
+      - application/x-ndjson
+    parameters:
+      - in: query
+        name: estado
+        type: string
+        required: false
+        enum: [RESERVADO, CONFIRMADO, COMPLETADO, CANCELADO]
+        description: Filtrar por estado del turno
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: matricula
+        type: string
+        required: false
+        description: Filtrar por matrícula del vehículo
+    responses:
+      200:
+        description: Un turno por línea, ordenados por fecha descendente, con los mismos campos que el listado
+      400:
+        description: Filtros inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+      403:
+        description: Requiere rol ADMIN
+    """
+    return exportar_turnos()
+
+
+@bookings.route("/agenda", methods=['GET'])
+@token_required
+@role_required('INSPECTOR', 'ADMIN')
+def agenda():
+    """
+    Agenda diaria de inspecciones (INSPECTOR y ADMIN)
+    ---
+    tags:
+      - Turnos
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: fecha
+        type: string
+        required: false
+        description: Día de la agenda (YYYY-MM-DD). Si no se envía se usa hoy
+      - in: header
+        name: If-None-Match
+        type: string
+        required: false
+        description: ETag de una respuesta anterior; si sigue vigente se responde 304
+    responses:
+      200:
+        description: Turnos CONFIRMADOS del día ordenados por horario
+        headers:
+          ETag:
+            type: string
+            description: Identificador de la versión de la agenda
+        schema:
+          type: object
+          properties:
+            fecha:
+              type: string
+            turnos:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                  fecha:
+                    type: string
+                  vehiculo:
+                    type: object
+                    properties:
+                      matricula:
+                        type: string
+                      marca:
+                        type: string
+                      modelo:
+                        type: string
+                      anio:
+                        type: integer
+                  duenio:
+                    type: object
+                    properties:
+                      nombre_completo:
+                        type: string
+                      mail:
+                        type: string
+                      telefono:
+                        type: string
+            total:
+              type: integer
+      304:
+        description: La agenda no cambió desde el ETag enviado
+      400:
+        description: Fecha inválida
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+      403:
+        description: Requiere rol INSPECTOR o ADMIN
+    """
+    return obtener_agenda()
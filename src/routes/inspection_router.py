@@ -2,8 +2,11 @@ from flask import Blueprint
 from src.utils.jwt_utils import token_required, role_required
 from src.controllers.inspection_controller import (
     create_inspection,
+    create_inspections_batch,
     get_inspection,
-    list_all_inspections
+    list_all_inspections,
+    get_inspection_stats,
+    get_check_analytics
 )
 
 inspections = Blueprint('inspections', __name__)
@@ -52,34 +55,37 @@ def crear():
               items:
                 type: object
                 required:
-                  - descripcion
                   - puntuacion
                 properties:
+                  tipo:
+                    type: string
+                    enum: [LUCES, FRENOS, DIRECCION, NEUMATICOS, CHASIS, CONTAMINACION, SEGURIDAD, CINTURONES]
+                    description: Clave del tipo de chequeo
                   descripcion:
                     type: string
                     maxLength: 200
-                    description: Descripción del chequeo
+                    description: "Descripción del tipo de chequeo (formato anterior, alternativa a 'tipo')"
                   puntuacion:
                     type: integer
                     minimum: 1
                     maximum: 10
                     description: Puntuación del chequeo (1-10)
               example:
-                - descripcion: "Luces y señalización"
+                - tipo: LUCES
                   puntuacion: 9
-                - descripcion: "Frenos"
+                - tipo: FRENOS
                   puntuacion: 8
-                - descripcion: "Dirección y suspensión"
+                - tipo: DIRECCION
                   puntuacion: 10
-                - descripcion: "Neumáticos"
+                - tipo: NEUMATICOS
                   puntuacion: 7
-                - descripcion: "Chasis y estructura"
+                - tipo: CHASIS
                   puntuacion: 9
-                - descripcion: "Contaminación y ruidos"
+                - tipo: CONTAMINACION
                   puntuacion: 8
-                - descripcion: "Elementos de seguridad obligatorios"
+                - tipo: SEGURIDAD
                   puntuacion: 10
-                - descripcion: "Cinturones, vidrios y espejos"
+                - tipo: CINTURONES
                   puntuacion: 9
             observacion:
               type: string
@@ -122,6 +128,8 @@ def crear():
                 properties:
                   id:
                     type: integer
+                  tipo:
+                    type: string
                   descripcion:
                     type: string
                   puntuacion:
@@ -144,6 +152,86 @@ def crear():
     return create_inspection()
 
 
+@inspections.route("/batch", methods=['POST'])
+@token_required
+@role_required('ADMIN', 'INSPECTOR')
+def crear_lote():
+    """
+    Registrar un lote de inspecciones cargadas sin conexión
+    
+    Cada inspección tiene el mismo formato y las mismas reglas que en POST /api/inspections.
+    Se registran en una sola transacción (con commits parciales cada
+    INSPECCIONES_LOTE_TAMANIO_COMMIT inspecciones) y las que fallan se informan en su
+    resultado sin abortar a las demás. Si falla el commit de un bloque, sus inspecciones
+    se informan como no creadas y se continúa con el bloque siguiente. Si la base falla
+    a mitad de la carga, se devuelven los resultados de los bloques ya confirmados y las
+    inspecciones restantes se informan como no procesadas.
+    ---
+    tags:
+      - Inspecciones
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - inspecciones
+          properties:
+            inspecciones:
+              type: array
+              minItems: 1
+              description: "Inspecciones con el formato de POST /api/inspections (máximo INSPECCIONES_LOTE_MAXIMO, por defecto 200)"
+              items:
+                type: object
+    responses:
+      200:
+        description: Resultado de cada inspección del lote, en el mismo orden
+        schema:
+          type: object
+          properties:
+            resultados:
+              type: array
+              items:
+                type: object
+                properties:
+                  indice:
+                    type: integer
+                    description: Posición de la inspección en el lote
+                  turno_id:
+                    type: integer
+                  creada:
+                    type: boolean
+                  resultado:
+                    type: string
+                    enum: [SEGURO, RECHEQUEAR]
+                  inspeccion:
+                    type: object
+                    description: Detalle de la inspección creada (igual a POST /api/inspections)
+                  error:
+                    type: string
+                    description: Motivo por el que no se registró la inspección
+            creadas:
+              type: integer
+            fallidas:
+              type: integer
+      400:
+        description: Lote vacío, mal formado o demasiado grande
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+      403:
+        description: Usuario sin permisos (solo ADMIN e INSPECTOR)
+    """
+    return create_inspections_batch()
+
+
 @inspections.route("/<int:inspeccion_id>", methods=['GET'])
 @token_required
 def detalle(inspeccion_id: int):
@@ -194,6 +282,8 @@ def detalle(inspeccion_id: int):
                 properties:
                   id:
                     type: integer
+                  tipo:
+                    type: string
                   descripcion:
                     type: string
                   puntuacion:
@@ -236,6 +326,34 @@ def listar_todas():
       - Inspecciones
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 100
+        description: Cantidad máxima de inspecciones por página (1 a 500)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Valor de next_cursor de la página anterior
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima de la inspección, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima de la inspección, inclusive (YYYY-MM-DD)
+      - in: query
+        name: resultado
+        type: string
+        required: false
+        enum: [SEGURO, RECHEQUEAR]
+        description: Filtrar por resultado de la inspección
     responses:
       200:
         description: Lista de inspecciones 
@@ -264,8 +382,24 @@ def listar_todas():
                     type: string
                   observacion:
                     type: string
+                  puntuaciones:
+                    type: array
+                    items:
+                      type: integer
+                    description: "Puntuación de cada tipo de chequeo en el orden del catálogo (LUCES, FRENOS, DIRECCION, NEUMATICOS, CHASIS, CONTAMINACION, SEGURIDAD, CINTURONES)"
             total:
               type: integer
+              description: Cantidad de inspecciones en esta página
+            next_cursor:
+              type: string
+              description: Cursor de la página siguiente (null si no hay más inspecciones)
+      400:
+        description: Parámetros de paginación o filtros inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
       401:
         description: Token no proporcionado o inválido
         schema:
@@ -282,3 +416,289 @@ def listar_todas():
               type: string
     """
     return list_all_inspections()
+
+
+@inspections.route("/stats", methods=['GET'])
+@token_required
+@role_required('ADMIN')
+def estadisticas():
+    """
+    Estadísticas de inspecciones de la planta
+    
+    Tasas de aprobación (SEGURO) y rechequeo y puntuación promedio, en total y por día,
+    por inspector y por año del vehículo. Se calculan a partir de acumulados diarios que
+    se actualizan al registrar cada inspección (se recalculan con `flask reconstruir-estadisticas`).
+    ---
+    tags:
+      - Inspecciones
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Primer día, inclusive (YYYY-MM-DD). Por defecto, 29 días antes de 'hasta'
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Último día, inclusive (YYYY-MM-DD). Por defecto, hoy
+    responses:
+      200:
+        description: Estadísticas del rango
+        schema:
+          type: object
+          properties:
+            desde:
+              type: string
+            hasta:
+              type: string
+            totales:
+              type: object
+              properties:
+                inspecciones:
+                  type: integer
+                seguras:
+                  type: integer
+                rechequeos:
+                  type: integer
+                tasa_aprobacion:
+                  type: number
+                  description: seguras / inspecciones (null si no hubo inspecciones)
+                tasa_rechequeo:
+                  type: number
+                puntuacion_promedio:
+                  type: number
+            por_dia:
+              type: array
+              items:
+                type: object
+                properties:
+                  fecha:
+                    type: string
+                  inspecciones:
+                    type: integer
+                  seguras:
+                    type: integer
+                  rechequeos:
+                    type: integer
+                  tasa_aprobacion:
+                    type: number
+                    description: seguras / inspecciones (null si no hubo inspecciones)
+                  tasa_rechequeo:
+                    type: number
+                  puntuacion_promedio:
+                    type: number
+            por_inspector:
+              type: array
+              items:
+                type: object
+                properties:
+                  inspector_id:
+                    type: integer
+                  inspector_nombre:
+                    type: string
+                  inspecciones:
+                    type: integer
+                  seguras:
+                    type: integer
+                  rechequeos:
+                    type: integer
+                  tasa_aprobacion:
+                    type: number
+                    description: seguras / inspecciones (null si no hubo inspecciones)
+                  tasa_rechequeo:
+                    type: number
+                  puntuacion_promedio:
+                    type: number
+            por_anio_vehiculo:
+              type: array
+              items:
+                type: object
+                properties:
+                  anio_vehiculo:
+                    type: integer
+                  inspecciones:
+                    type: integer
+                  seguras:
+                    type: integer
+                  rechequeos:
+                    type: integer
+                  tasa_aprobacion:
+                    type: number
+                    description: seguras / inspecciones (null si no hubo inspecciones)
+                  tasa_rechequeo:
+                    type: number
+                  puntuacion_promedio:
+                    type: number
+      400:
+        description: Fechas inválidas
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+      403:
+        description: Usuario sin permisos (solo ADMIN)
+    """
+    return get_inspection_stats()
+
+
+@inspections.route("/checks/stats", methods=['GET'])
+@token_required
+@role_required('ADMIN')
+def analisis_chequeos():
+    """
+    Distribución de las puntuaciones de los chequeos
+    
+    Histograma (puntuaciones 1 a 10), promedio y percentiles de los chequeos de las
+    inspecciones del rango, en total y por tipo de chequeo (de menor a mayor promedio, para
+    detectar controles sistemáticamente bajos), por mes y por inspector.
+    ---
+    tags:
+      - Inspecciones
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Primer día, inclusive (YYYY-MM-DD). Por defecto, 364 días antes de 'hasta'
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Último día, inclusive (YYYY-MM-DD). Por defecto, hoy
+    responses:
+      200:
+        description: Distribución de puntuaciones del rango
+        schema:
+          type: object
+          properties:
+            desde:
+              type: string
+            hasta:
+              type: string
+            totales:
+              type: object
+              properties:
+                cantidad:
+                  type: integer
+                promedio:
+                  type: number
+                p10:
+                  type: integer
+                p25:
+                  type: integer
+                p50:
+                  type: integer
+                p75:
+                  type: integer
+                p90:
+                  type: integer
+                histograma:
+                  type: array
+                  items:
+                    type: integer
+                  description: Cantidad de chequeos con puntuación 1, 2, ..., 10
+            por_descripcion:
+              type: array
+              description: Un elemento por tipo de chequeo, de menor a mayor promedio
+              items:
+                type: object
+                properties:
+                  tipo:
+                    type: string
+                  descripcion:
+                    type: string
+                  cantidad:
+                    type: integer
+                  promedio:
+                    type: number
+                  p10:
+                    type: integer
+                  p25:
+                    type: integer
+                  p50:
+                    type: integer
+                  p75:
+                    type: integer
+                  p90:
+                    type: integer
+                  histograma:
+                    type: array
+                    items:
+                      type: integer
+                    description: Cantidad de chequeos con puntuación 1, 2, ..., 10
+            por_mes:
+              type: array
+              items:
+                type: object
+                properties:
+                  mes:
+                    type: string
+                    description: YYYY-MM
+                  cantidad:
+                    type: integer
+                  promedio:
+                    type: number
+                  p10:
+                    type: integer
+                  p25:
+                    type: integer
+                  p50:
+                    type: integer
+                  p75:
+                    type: integer
+                  p90:
+                    type: integer
+                  histograma:
+                    type: array
+                    items:
+                      type: integer
+                    description: Cantidad de chequeos con puntuación 1, 2, ..., 10
+            por_inspector:
+              type: array
+              items:
+                type: object
+                properties:
+                  inspector_id:
+                    type: integer
+                  inspector_nombre:
+                    type: string
+                  cantidad:
+                    type: integer
+                  promedio:
+                    type: number
+                  p10:
+                    type: integer
+                  p25:
+                    type: integer
+                  p50:
+                    type: integer
+                  p75:
+                    type: integer
+                  p90:
+                    type: integer
+                  histograma:
+                    type: array
+                    items:
+                      type: integer
+                    description: Cantidad de chequeos con puntuación 1, 2, ..., 10
+      400:
+        description: Fechas inválidas
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+      403:
+        description: Usuario sin permisos (solo ADMIN)
+    """
+    return get_check_analytics()
@@ -193,6 +193,39 @@ def user_bookings():
       - Usuarios
     security:
       - Bearer: []
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 100
+        description: Cantidad máxima de turnos por página (1 a 500)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Valor de next_cursor de la página anterior
+      - in: query
+        name: estado
+        type: string
+        required: false
+        enum: [RESERVADO, CONFIRMADO, COMPLETADO, CANCELADO]
+        description: Filtrar por estado del turno
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: matricula
+        type: string
+        required: false
+        description: Filtrar por matrícula del vehículo
     responses:
       200:
         description: Lista de turnos del usuario autenticado (obtenido del token JWT)
@@ -220,6 +253,17 @@ def user_bookings():
                     type: string
             total:
               type: integer
+              description: Cantidad de turnos en esta página
+            next_cursor:
+              type: string
+              description: Cursor de la página siguiente (null si no hay más turnos)
+      400:
+        description: Parámetros de paginación o filtros inválidos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
       401:
         description: Token no proporcionado o inválido
         schema:
@@ -251,6 +295,33 @@ def inspector_inspections(inspector_id: int):
         type: integer
         required: true
         description: ID del inspector
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 100
+        description: Cantidad máxima de inspecciones por página (1 a 500)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Valor de next_cursor de la página anterior
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima de la inspección, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima de la inspección, inclusive (YYYY-MM-DD)
+      - in: query
+        name: resultado
+        type: string
+        required: false
+        enum: [SEGURO, RECHEQUEAR]
+        description: Filtrar por resultado de la inspección
     responses:
       200:
         description: Lista de inspecciones del inspector
@@ -279,10 +350,19 @@ def inspector_inspections(inspector_id: int):
                     type: string
                   observacion:
                     type: string
+                  puntuaciones:
+                    type: array
+                    items:
+                      type: integer
+                    description: "Puntuación de cada tipo de chequeo en el orden del catálogo (LUCES, FRENOS, DIRECCION, NEUMATICOS, CHASIS, CONTAMINACION, SEGURIDAD, CINTURONES)"
                   estado:
                     type: string
             total:
               type: integer
+              description: Cantidad de inspecciones en esta página
+            next_cursor:
+              type: string
+              description: Cursor de la página siguiente (null si no hay más inspecciones)
       400:
         description: Inspector no encontrado
         schema:
@@ -8,7 +8,7 @@ from src.controllers.vehicles_controller import (
     delete_vehicle
 )
 from src.controllers.booking_controller import listar_turnos_por_vehiculo
-from src.controllers.inspection_controller import list_inspections_by_vehiculo
+from src.controllers.inspection_controller import list_inspections_by_vehiculo, get_latest_inspection
 
 vehicles = Blueprint('vehicles', __name__)
 
@@ -344,6 +344,33 @@ def vehicle_bookings(matricula: str):
         type: string
         required: true
         description: Matrícula del vehículo
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 100
+        description: Cantidad máxima de turnos por página (1 a 500)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Valor de next_cursor de la página anterior
+      - in: query
+        name: estado
+        type: string
+        required: false
+        enum: [RESERVADO, CONFIRMADO, COMPLETADO, CANCELADO]
+        description: Filtrar por estado del turno
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima del turno, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima del turno, inclusive (YYYY-MM-DD)
     responses:
       200:
         description: Lista de turnos del vehículo
@@ -371,8 +398,12 @@ def vehicle_bookings(matricula: str):
                     type: string
             total:
               type: integer
+              description: Cantidad de turnos en esta página
+            next_cursor:
+              type: string
+              description: Cursor de la página siguiente (null si no hay más turnos)
       400:
-        description: Vehículo no encontrado o sin permisos
+        description: Vehículo no encontrado, sin permisos, paginación o filtros inválidos
         schema:
           type: object
           properties:
@@ -409,6 +440,33 @@ def vehicle_inspections(matricula: str):
         type: string
         required: true
         description: Matrícula del vehículo
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 100
+        description: Cantidad máxima de inspecciones por página (1 a 500)
+      - in: query
+        name: cursor
+        type: string
+        required: false
+        description: Valor de next_cursor de la página anterior
+      - in: query
+        name: desde
+        type: string
+        required: false
+        description: Fecha mínima de la inspección, inclusive (YYYY-MM-DD)
+      - in: query
+        name: hasta
+        type: string
+        required: false
+        description: Fecha máxima de la inspección, inclusive (YYYY-MM-DD)
+      - in: query
+        name: resultado
+        type: string
+        required: false
+        enum: [SEGURO, RECHEQUEAR]
+        description: Filtrar por resultado de la inspección
     responses:
       200:
         description: Lista de inspecciones del vehículo
@@ -437,10 +495,19 @@ def vehicle_inspections(matricula: str):
                     type: string
                   observacion:
                     type: string
+                  puntuaciones:
+                    type: array
+                    items:
+                      type: integer
+                    description: "Puntuación de cada tipo de chequeo en el orden del catálogo (LUCES, FRENOS, DIRECCION, NEUMATICOS, CHASIS, CONTAMINACION, SEGURIDAD, CINTURONES)"
                   estado:
                     type: string
             total:
               type: integer
+              description: Cantidad de inspecciones en esta página
+            next_cursor:
+              type: string
+              description: Cursor de la página siguiente (null si no hay más inspecciones)
       400:
         description: Vehículo no encontrado
         schema:
@@ -457,3 +524,59 @@ def vehicle_inspections(matricula: str):
               type: string
     """
     return list_inspections_by_vehiculo(matricula)
+
+
+@vehicles.route("/<string:matricula>/inspections/latest", methods=['GET'])
+@token_required
+def vehicle_latest_inspection(matricula: str):
+    """
+    Obtener la última inspección de un vehículo
+    
+    Se lee de una tabla con una fila por vehículo, sin recorrer el historial de inspecciones.
+    
+    Autorización:
+    - ADMIN e INSPECTOR: pueden consultar cualquier vehículo
+    - DUENIO: solo puede consultar sus propios vehículos
+    ---
+    tags:
+      - Vehículos
+    security:
+      - Bearer: []
+    parameters:
+      - in: path
+        name: matricula
+        type: string
+        required: true
+        description: Matrícula del vehículo
+    responses:
+      200:
+        description: Última inspección del vehículo (null si todavía no fue inspeccionado)
+        schema:
+          type: object
+          properties:
+            matricula:
+              type: string
+            ultima_inspeccion:
+              type: object
+              properties:
+                inspeccion_id:
+                  type: integer
+                fecha:
+                  type: string
+                  format: date-time
+                resultado:
+                  type: string
+                  enum: [SEGURO, RECHEQUEAR]
+                puntuacion_total:
+                  type: integer
+      400:
+        description: Vehículo no encontrado o sin permisos
+        schema:
+          type: object
+          properties:
+            error:
+              type: string
+      401:
+        description: Token no proporcionado o inválido
+    """
+    return get_latest_inspection(matricula)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_validator, Field
 from datetime import datetime
 from typing import Optional
 
@@ -27,6 +27,37 @@ class DisponibilidadRequest(BaseModel):
         return True
 
 
+class ProximosDisponiblesRequest(BaseModel):
+    desde: Optional[str] = None  # Formato: "YYYY-MM-DD HH:MM", si no se envía usa ahora
+    cantidad: int = Field(5, ge=1, le=50, description="Cantidad de slots libres a devolver")
+    dias_semana: Optional[list[int]] = None  # Lunes=0 a Domingo=6
+    horas: Optional[list[int]] = None  # Horas de inicio preferidas (0-23)
+    
+    @field_validator('desde')
+    @classmethod
+    def validate_desde_format(cls, v: Optional[str]) -> Optional[str]:
+        if v:
+            try:
+                datetime.strptime(v, '%Y-%m-%d %H:%M')
+            except ValueError:
+                raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD HH:MM')
+        return v
+    
+    @field_validator('dias_semana')
+    @classmethod
+    def validate_dias_semana(cls, v: Optional[list[int]]) -> Optional[list[int]]:
+        if v and any(dia < 0 or dia > 6 for dia in v):
+            raise ValueError('Los días de la semana deben estar entre 0 (lunes) y 6 (domingo)')
+        return v
+    
+    @field_validator('horas')
+    @classmethod
+    def validate_horas(cls, v: Optional[list[int]]) -> Optional[list[int]]:
+        if v and any(hora < 0 or hora > 23 for hora in v):
+            raise ValueError('Las horas deben estar entre 0 y 23')
+        return v
+
+
 class BookingCreateRequest(BaseModel):
     matricula: str
     fecha: str  # Formato: "YYYY-MM-DD HH:MM"
@@ -41,6 +72,72 @@ class BookingCreateRequest(BaseModel):
         return v
 
 
+class CierreCreateRequest(BaseModel):
+    fecha: str  # Formato: "YYYY-MM-DD"
+    hora_desde: Optional[str] = None  # Formato: "HH:MM", sin horas el cierre es de día completo
+    hora_hasta: Optional[str] = None  # Formato: "HH:MM"
+    motivo: str = Field(..., min_length=3, max_length=200)
+    
+    @field_validator('fecha')
+    @classmethod
+    def validate_fecha_format(cls, v: str) -> str:
+        try:
+            datetime.strptime(v, '%Y-%m-%d')
+        except ValueError:
+            raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD')
+        return v
+    
+    @field_validator('hora_desde', 'hora_hasta')
+    @classmethod
+    def validate_hora_format(cls, v: Optional[str]) -> Optional[str]:
+        if v:
+            try:
+                datetime.strptime(v, '%H:%M')
+            except ValueError:
+                raise ValueError('Formato de hora inválido. Use HH:MM')
+        return v
+
+
+class BookingListFilters(BaseModel):
+    estado: Optional[str] = None  # RESERVADO, CONFIRMADO, COMPLETADO o CANCELADO
+    desde: Optional[str] = None  # Formato: "YYYY-MM-DD", inclusive
+    hasta: Optional[str] = None  # Formato: "YYYY-MM-DD", inclusive
+    matricula: Optional[str] = None
+    
+    @field_validator('estado')
+    @classmethod
+    def validate_estado(cls, v: Optional[str]) -> Optional[str]:
+        if v:
+            v = v.upper()
+            if v not in ['RESERVADO', 'CONFIRMADO', 'COMPLETADO', 'CANCELADO']:
+                raise ValueError('Estado inválido. Debe ser RESERVADO, CONFIRMADO, COMPLETADO o CANCELADO')
+        return v
+    
+    @field_validator('desde', 'hasta')
+    @classmethod
+    def validate_fecha_format(cls, v: Optional[str]) -> Optional[str]:
+        if v:
+            try:
+                datetime.strptime(v, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD')
+        return v
+
+
+class AgendaRequest(BaseModel):
+    fecha: Optional[str] = None  # Formato: "YYYY-MM-DD", si no se envía usa hoy
+    
+    @field_validator('fecha')
+    @classmethod
+    def validate_fecha_format(cls, v: Optional[str]) -> Optional[str]:
+        if v:
+            try:
+                datetime.strptime(v, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD')
+        return v
+
+
 class BookingUpdateRequest(BaseModel):
     estado_id: int
     
@@ -56,6 +153,7 @@ class BookingUpdateRequest(BaseModel):
 class SlotDisponible(BaseModel):
     fecha: str  # Formato: "YYYY-MM-DD HH:MM"
     disponible: bool
+    capacidad_restante: int  # Lugares libres en el slot (líneas de inspección sin turno)
 
 
 class DisponibilidadResponse(BaseModel):
@@ -63,6 +161,25 @@ class DisponibilidadResponse(BaseModel):
     total_disponibles: int
 
 
+class ProximosDisponiblesResponse(BaseModel):
+    slots: list[SlotDisponible]
+    total: int
+
+
+class DiaDisponibilidadCompacta(BaseModel):
+    fecha: str  # Formato: "YYYY-MM-DD"
+    hora_inicio: str  # Formato: "HH:MM", horario del primer slot del bitset
+    duracion_minutos: int
+    cantidad_slots: int
+    disponibles: str  # Bitset en base64 (little-endian): bit i = slot i libre
+    total_disponibles: int
+
+
+class DisponibilidadCompactaResponse(BaseModel):
+    dias: list[DiaDisponibilidadCompacta]
+    total_disponibles: int
+
+
 class BookingResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
@@ -80,4 +197,53 @@ class BookingResponse(BaseModel):
 class BookingListResponse(BaseModel):
     turnos: list[BookingResponse]
     total: int
+    next_cursor: Optional[str] = None
 
+
+
+class CierreResponse(BaseModel):
+    id: int
+    fecha: str
+    hora_desde: Optional[str] = None
+    hora_hasta: Optional[str] = None
+    motivo: str
+
+
+class CierresRecargaResponse(BaseModel):
+    intervalos: int  # Intervalos de cierre en el índice (luego de fusionar superpuestos)
+
+
+class CacheEstadisticasResponse(BaseModel):
+    entradas: int
+    max_entradas: int
+    ttl_segundos: float
+    hits: int
+    misses: int
+    evictions: int
+    invalidaciones: int
+
+
+class AgendaVehiculo(BaseModel):
+    matricula: str
+    marca: str
+    modelo: str
+    anio: int
+
+
+class AgendaDuenio(BaseModel):
+    nombre_completo: str
+    mail: str
+    telefono: Optional[str] = None
+
+
+class AgendaTurno(BaseModel):
+    id: int
+    fecha: str
+    vehiculo: AgendaVehiculo
+    duenio: AgendaDuenio
+
+
+class AgendaResponse(BaseModel):
+    fecha: str
+    turnos: list[AgendaTurno]
+    total: int
@@ -1,12 +1,19 @@
-from pydantic import BaseModel, ConfigDict, field_validator, Field
+from pydantic import BaseModel, ConfigDict, field_validator, model_validator, Field
 from datetime import datetime
 
 
 # Request schemas
 class ChequeoRequest(BaseModel):
-    descripcion: str = Field(..., max_length=200, description="Descripción del chequeo")
+    tipo: str | None = Field(None, max_length=50, description="Clave del tipo de chequeo (ej: FRENOS)")
+    descripcion: str | None = Field(None, max_length=200, description="Descripción del chequeo (formato anterior, alternativa a 'tipo')")
     puntuacion: int = Field(..., ge=1, le=10, description="Puntuación del chequeo (1-10)")
     
+    @model_validator(mode='after')
+    def validate_tipo(self) -> 'ChequeoRequest':
+        if not self.tipo and not self.descripcion:
+            raise ValueError("Debe indicar el tipo de chequeo ('tipo' o 'descripcion')")
+        return self
+    
     @field_validator('puntuacion')
     @classmethod
     def validate_puntuacion(cls, v: int) -> int:
@@ -35,6 +42,7 @@ class ChequeoResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
+    tipo: str
     descripcion: str
     puntuacion: int
     fecha: datetime
@@ -51,6 +59,13 @@ class InspectionResponse(BaseModel):
     puntuacion_total: int
     resultado: str | None
     observacion: str | None
+    puntuaciones: list[int] | None = None  # Una por tipo de chequeo, en el orden del catálogo
+    
+    @field_validator('puntuaciones', mode='before')
+    @classmethod
+    def desempaquetar_puntuaciones(cls, v):
+        # Inspeccion.puntuaciones guarda un byte por chequeo
+        return list(v) if isinstance(v, bytes) else v
 
 
 class InspectionDetailResponse(BaseModel):
@@ -70,4 +85,146 @@ class InspectionDetailResponse(BaseModel):
 class InspectionListResponse(BaseModel):
     inspecciones: list[InspectionResponse]
     total: int
+    next_cursor: str | None = None  # None cuando no hay más páginas
+
+
+class UltimaInspeccionResponse(BaseModel):
+    inspeccion_id: int
+    fecha: datetime
+    resultado: str | None
+    puntuacion_total: int | None
+
+
+class UltimaInspeccionVehiculoResponse(BaseModel):
+    matricula: str
+    ultima_inspeccion: UltimaInspeccionResponse | None  # None si el vehículo no tiene inspecciones
+
+
+class InspectionListFilters(BaseModel):
+    desde: str | None = None  # Formato: "YYYY-MM-DD", inclusive
+    hasta: str | None = None  # Formato: "YYYY-MM-DD", inclusive
+    resultado: str | None = None  # SEGURO o RECHEQUEAR
+    
+    @field_validator('resultado')
+    @classmethod
+    def validate_resultado(cls, v: str | None) -> str | None:
+        if v:
+            v = v.upper()
+            if v not in ['SEGURO', 'RECHEQUEAR']:
+                raise ValueError('Resultado inválido. Debe ser SEGURO o RECHEQUEAR')
+        return v
+    
+    @field_validator('desde', 'hasta')
+    @classmethod
+    def validate_fecha_format(cls, v: str | None) -> str | None:
+        if v:
+            try:
+                datetime.strptime(v, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD')
+        return v
+
+
+
+# Carga de inspecciones en lote
+class InspectionBatchRequest(BaseModel):
+    # Cada elemento se valida por separado contra InspectionCreateRequest,
+    # para informar los errores por inspección sin rechazar todo el lote
+    inspecciones: list[dict] = Field(..., min_length=1, description="Inspecciones a registrar")
+
+
+class InspectionBatchItemResponse(BaseModel):
+    indice: int
+    turno_id: int | None
+    creada: bool
+    resultado: str | None
+    inspeccion: InspectionDetailResponse | None
+    error: str | None
+
+
+class InspectionBatchResponse(BaseModel):
+    resultados: list[InspectionBatchItemResponse]
+    creadas: int
+    fallidas: int
+
+
+# Estadísticas
+class InspectionStatsRequest(BaseModel):
+    desde: str | None = None  # Formato: "YYYY-MM-DD", inclusive
+    hasta: str | None = None  # Formato: "YYYY-MM-DD", inclusive
+    
+    @field_validator('desde', 'hasta')
+    @classmethod
+    def validate_fecha_format(cls, v: str | None) -> str | None:
+        if v:
+            try:
+                datetime.strptime(v, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError('Formato de fecha inválido. Use YYYY-MM-DD')
+        return v
+
+
+class EstadisticaResumen(BaseModel):
+    inspecciones: int
+    seguras: int
+    rechequeos: int
+    tasa_aprobacion: float | None  # None si no hubo inspecciones
+    tasa_rechequeo: float | None
+    puntuacion_promedio: float | None
+
+
+class EstadisticaPorDia(EstadisticaResumen):
+    fecha: str
+
+
+class EstadisticaPorInspector(EstadisticaResumen):
+    inspector_id: int
+    inspector_nombre: str | None
+
+
+class EstadisticaPorAnioVehiculo(EstadisticaResumen):
+    anio_vehiculo: int
+
+
+class InspectionStatsResponse(BaseModel):
+    desde: str
+    hasta: str
+    totales: EstadisticaResumen
+    por_dia: list[EstadisticaPorDia]
+    por_inspector: list[EstadisticaPorInspector]
+    por_anio_vehiculo: list[EstadisticaPorAnioVehiculo]
+
+
+# Análisis de puntuaciones de chequeos
+class ChequeoAnalisisResumen(BaseModel):
+    cantidad: int
+    promedio: float | None  # None si el grupo no tiene chequeos
+    p10: int | None
+    p25: int | None
+    p50: int | None
+    p75: int | None
+    p90: int | None
+    histograma: list[int]  # Cantidad de chequeos con puntuación 1, 2, ..., 10
+
+
+class ChequeoAnalisisPorDescripcion(ChequeoAnalisisResumen):
+    tipo: str
+    descripcion: str
+
+
+class ChequeoAnalisisPorMes(ChequeoAnalisisResumen):
+    mes: str  # Formato: "YYYY-MM"
+
+
+class ChequeoAnalisisPorInspector(ChequeoAnalisisResumen):
+    inspector_id: int | None
+    inspector_nombre: str | None
+
 
+class ChequeoAnalisisResponse(BaseModel):
+    desde: str
+    hasta: str
+    totales: ChequeoAnalisisResumen
+    por_descripcion: list[ChequeoAnalisisPorDescripcion]
+    por_mes: list[ChequeoAnalisisPorMes]
+    por_inspector: list[ChequeoAnalisisPorInspector]
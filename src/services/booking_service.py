@@ -1,7 +1,20 @@
 from src import db
-from src.models import Turno, Vehiculo, Usuario, EstadoTurno
-from datetime import datetime, timedelta
-from typing import Optional
+from src.models import Turno, Vehiculo, Usuario, EstadoTurno, Inspeccion, ResultadoInspeccion
+from src.services.occupancy_service import OccupancyService
+from src.services.closure_service import ClosureService
+from src.services.version_service import VersionService
+from src.utils.cache_utils import obtener_cache_disponibilidad, obtener_cache_agenda, invalidar_dia_de_turnos
+from src.utils.pagination_utils import codificar_cursor, LIMITE_POR_DEFECTO
+from sqlalchemy import tuple_, update
+from sqlalchemy.orm import joinedload
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+import base64
+import hashlib
+
+
+# Filas que el export trae de la base por cada viaje del cursor
+TAMANIO_LOTE_EXPORT = 1000
 
 
 # Configuración de horarios disponibles
@@ -9,22 +22,124 @@ HORARIO_CONFIG = {
     "dias_laborables": [0, 1, 2, 3, 4],  # Lunes=0 a Viernes=4
     "hora_inicio": 9,
     "hora_fin": 20,
-    "duracion_turno_horas": 1,
-    "dias_anticipacion": 15  # Mostrar disponibilidad para los próximos 15 días
+    "duracion_turno_minutos": 60,  # Duración de cada slot (por ejemplo 20, 30 o 60 minutos)
+    "capacidad_por_slot": 1,  # Líneas de inspección en paralelo: turnos simultáneos por slot
+    "capacidad_por_dia_hora": {},  # Excepciones por franja: {(dia_semana, hora): capacidad}
+    "dias_anticipacion": 15,  # Mostrar disponibilidad para los próximos 15 días
+    "dias_ventana_busqueda": 7,  # Primera ventana al buscar los próximos slots libres (luego se duplica)
+    "dias_busqueda_maximo": 120  # Horizonte máximo de búsqueda de slots libres
 }
 
+FORMATOS_DISPONIBILIDAD = ["completo", "compacto"]
+
 
 class BookingService:
 
     @staticmethod
-    def consultar_disponibilidad(fecha_inicio: Optional[str] = None, fecha_final: Optional[str] = None) -> dict:
+    def consultar_disponibilidad(fecha_inicio: Optional[str] = None, fecha_final: Optional[str] = None,
+                                 formato: str = "completo", versiones: Optional[dict] = None) -> dict:
         """
         Consulta los slots disponibles del sistema (disponibilidad general).
         
+        El resultado se cachea por rango de fechas normalizado, formato, slot en curso y
+        versiones de turnos y cierres: son los mismos datos de los que se deriva el ETag,
+        por lo que un worker nunca sirve con un ETag nuevo un cuerpo calculado antes de
+        una escritura hecha en otro worker. Las escrituras locales además invalidan los
+        días afectados.
+        
         Args:
             fecha_inicio: Fecha desde la cual buscar (formato YYYY-MM-DD), por defecto hoy
             fecha_final: Fecha hasta la cual buscar (formato YYYY-MM-DD), opcional
+            formato: "completo" (un objeto por slot) o "compacto" (un bitset por día)
+            versiones: Contadores de turnos y cierres ya leídos (por ejemplo para el ETag), opcional
+        """
+        inicio, final = BookingService._normalizar_rango(fecha_inicio, fecha_final, formato)
+        if versiones is None:
+            versiones = BookingService.versiones_disponibilidad()
+        ahora = datetime.now()
+        
+        cache = obtener_cache_disponibilidad()
+        clave = (inicio.date(), final.date(), formato, BookingService._slot_en_curso(ahora),
+                 versiones["turno"], versiones["cierre"])
+        disponibilidad = cache.get(clave)
+        if disponibilidad is not None:
+            return disponibilidad
+        
+        # Lectura pura del calendario materializado: una única consulta por rango
+        ocupados = OccupancyService.obtener_ocupacion(inicio, final + timedelta(days=1))
+        
+        if formato == "compacto":
+            disponibilidad = BookingService._disponibilidad_compacta(inicio, final, ocupados, ahora, versiones["cierre"])
+        else:
+            slots = []
+            for _, slots_dia in BookingService._generar_slots_por_dia(inicio, final, versiones["cierre"]):
+                for slot_datetime in slots_dia:
+                    if slot_datetime > ahora:
+                        restante = BookingService._capacidad_restante(slot_datetime, ocupados)
+                        slots.append({
+                            "fecha": slot_datetime.strftime('%Y-%m-%d %H:%M'),
+                            "disponible": restante > 0,
+                            "capacidad_restante": restante
+                        })
+            
+            disponibilidad = {
+                "slots": slots,
+                "total_disponibles": sum(1 for slot in slots if slot["disponible"])
+            }
+        
+        cache.set(clave, disponibilidad, inicio.date(), final.date())
+        
+        return disponibilidad
+
+    @staticmethod
+    def etag_disponibilidad(fecha_inicio: Optional[str] = None, fecha_final: Optional[str] = None,
+                            formato: str = "completo", versiones: Optional[dict] = None) -> str:
+        """
+        Calcula el ETag de una consulta de disponibilidad sin generar los slots.
+        
+        Se deriva de los contadores de versión de turnos y cierres (una sola consulta),
+        del rango normalizado, del formato, de la configuración de horarios y del slot
+        en curso, ya que los slots pasados dejan de ofrecerse.
+        """
+        inicio, final = BookingService._normalizar_rango(fecha_inicio, fecha_final, formato)
+        if versiones is None:
+            versiones = BookingService.versiones_disponibilidad()
+        
+        firma = "|".join([
+            str(versiones["turno"]),
+            str(versiones["cierre"]),
+            inicio.strftime('%Y-%m-%d'),
+            final.strftime('%Y-%m-%d'),
+            formato,
+            BookingService._slot_en_curso(datetime.now()).strftime('%Y-%m-%d %H:%M'),
+            repr(sorted(HORARIO_CONFIG.items()))
+        ])
+        return hashlib.sha256(firma.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def versiones_disponibilidad() -> dict[str, int]:
+        """
+        Contadores de versión de los que depende la disponibilidad (turnos y cierres).
+        """
+        return VersionService.obtener("turno", "cierre")
+
+    @staticmethod
+    def _slot_en_curso(ahora: datetime) -> datetime:
         """
+        Inicio del último slot de la grilla del día que ya comenzó (la medianoche si todavía
+        no comenzó ninguno). Cambia exactamente cuando un slot deja de ofrecerse, también
+        con duraciones que no dividen la hora.
+        """
+        medianoche = ahora.replace(hour=0, minute=0, second=0, microsecond=0)
+        minuto_actual = ahora.hour * 60 + ahora.minute
+        iniciados = [minutos for minutos in BookingService._minutos_inicio_slots() if minutos <= minuto_actual]
+        return medianoche + timedelta(minutes=iniciados[-1] if iniciados else 0)
+
+    @staticmethod
+    def _normalizar_rango(fecha_inicio: Optional[str], fecha_final: Optional[str], formato: str) -> tuple[datetime, datetime]:
+        if formato not in FORMATOS_DISPONIBILIDAD:
+            raise ValueError(f"Formato inválido. Use uno de: {', '.join(FORMATOS_DISPONIBILIDAD)}")
+        
         if fecha_inicio:
             inicio = datetime.strptime(fecha_inicio, '%Y-%m-%d')
         else:
@@ -37,35 +152,172 @@ class BookingService:
         else:
             final = inicio + timedelta(days=HORARIO_CONFIG["dias_anticipacion"])
         
-        slots = []
-        fecha_actual = inicio
+        return inicio, final
+
+    @staticmethod
+    def buscar_proximos_disponibles(desde: Optional[str] = None, cantidad: int = 5,
+                                    dias_semana: Optional[list[int]] = None,
+                                    horas: Optional[list[int]] = None) -> dict:
+        """
+        Busca los primeros `cantidad` slots libres a partir de una fecha y hora.
         
-        while fecha_actual <= final:
-            # Solo días laborables (lunes a viernes)
-            if fecha_actual.weekday() in HORARIO_CONFIG["dias_laborables"]:
-                # Generar slots por hora
-                for hora in range(HORARIO_CONFIG["hora_inicio"], HORARIO_CONFIG["hora_fin"]):
-                    slot_datetime = fecha_actual.replace(hour=hora, minute=0, second=0, microsecond=0)
+        Recorre el calendario hacia adelante en ventanas de días que se duplican
+        (7, 14, 28...) y se detiene apenas encuentra los slots pedidos, de modo que
+        el caso común resuelve con una sola consulta pequeña. La búsqueda abarca como
+        máximo `dias_busqueda_maximo` días calendario contando el día de partida,
+        sin importar la hora desde la que se busca.
+        
+        Args:
+            desde: Fecha y hora desde la cual buscar (formato YYYY-MM-DD HH:MM), por defecto ahora
+            cantidad: Cantidad de slots libres a devolver
+            dias_semana: Días de la semana preferidos (Lunes=0 a Domingo=6), opcional
+            horas: Horas de inicio preferidas, opcional
+        """
+        ahora = datetime.now()
+        punto_partida = datetime.strptime(desde, '%Y-%m-%d %H:%M') if desde else ahora
+        punto_partida = max(punto_partida, ahora)
+        
+        # Primer día fuera del horizonte (exclusivo)
+        limite = (punto_partida + timedelta(days=HORARIO_CONFIG["dias_busqueda_maximo"])).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        ventana_inicio = punto_partida.replace(hour=0, minute=0, second=0, microsecond=0)
+        dias_ventana = HORARIO_CONFIG["dias_ventana_busqueda"]
+        
+        encontrados = []
+        while len(encontrados) < cantidad and ventana_inicio < limite:
+            ventana_fin = min(ventana_inicio + timedelta(days=dias_ventana), limite)
+            ocupados = OccupancyService.obtener_ocupacion(ventana_inicio, ventana_fin)
+            
+            for _, slots_dia in BookingService._generar_slots_por_dia(ventana_inicio, ventana_fin - timedelta(days=1)):
+                for slot_datetime in slots_dia:
+                    if slot_datetime <= punto_partida:
+                        continue
+                    restante = BookingService._capacidad_restante(slot_datetime, ocupados)
+                    if restante == 0:
+                        continue
+                    if dias_semana and slot_datetime.weekday() not in dias_semana:
+                        continue
+                    if horas and slot_datetime.hour not in horas:
+                        continue
                     
-                    if slot_datetime > datetime.now():
-                        # Verificar si hay algún turno confirmado o reservado en ese horario
-                        turno_existente = Turno.query.filter(
-                            Turno.fecha == slot_datetime,
-                            Turno.estado_id.in_([1, 2])  # RESERVADO=1 o CONFIRMADO=2
-                        ).first()
-                        
-                        slots.append({
-                            "fecha": slot_datetime.strftime('%Y-%m-%d %H:%M'),
-                            "disponible": turno_existente is None
-                        })
+                    encontrados.append({
+                        "fecha": slot_datetime.strftime('%Y-%m-%d %H:%M'),
+                        "disponible": True,
+                        "capacidad_restante": restante
+                    })
+                    if len(encontrados) == cantidad:
+                        break
+                if len(encontrados) == cantidad:
+                    break
             
-            fecha_actual += timedelta(days=1)
+            ventana_inicio = ventana_fin
+            dias_ventana *= 2
+        
+        return {
+            "slots": encontrados,
+            "total": len(encontrados)
+        }
+
+    @staticmethod
+    def _disponibilidad_compacta(inicio: datetime, final: datetime, ocupados: dict, ahora: datetime,
+                                 version_cierres: Optional[int] = None) -> dict:
+        """
+        Codifica la disponibilidad con una entrada por día: el primer horario, la duración
+        del slot y un bitset en base64 (little-endian, bit i = slot i libre).
+        
+        El bitset cubre la grilla completa de slots futuros del día, de modo que el slot i
+        siempre comienza en hora_inicio + i * duracion_minutos; los slots alcanzados por un
+        cierre parcial se codifican como bits en 0.
+        """
+        minutos_slots = BookingService._minutos_inicio_slots()
+        dias = []
+        total_disponibles = 0
+        
+        for dia, slots_dia in BookingService._generar_slots_por_dia(inicio, final, version_cierres):
+            medianoche = datetime.combine(dia, datetime.min.time())
+            grilla = [medianoche + timedelta(minutes=minutos) for minutos in minutos_slots]
+            futuros = [slot for slot in grilla if slot > ahora]
+            if not futuros:
+                continue
+            
+            abiertos = set(slots_dia)
+            bits = 0
+            for indice, slot_datetime in enumerate(futuros):
+                if slot_datetime in abiertos and BookingService._capacidad_restante(slot_datetime, ocupados) > 0:
+                    bits |= 1 << indice
+            
+            libres = bits.bit_count()
+            total_disponibles += libres
+            dias.append({
+                "fecha": dia.strftime('%Y-%m-%d'),
+                "hora_inicio": futuros[0].strftime('%H:%M'),
+                "duracion_minutos": HORARIO_CONFIG["duracion_turno_minutos"],
+                "cantidad_slots": len(futuros),
+                "disponibles": base64.b64encode(bits.to_bytes((len(futuros) + 7) // 8, 'little')).decode('ascii'),
+                "total_disponibles": libres
+            })
         
         return {
-            "slots": slots,
-            "total_disponibles": sum(1 for slot in slots if slot["disponible"])
+            "dias": dias,
+            "total_disponibles": total_disponibles
         }
 
+    @staticmethod
+    def capacidad_slot(slot_datetime: datetime) -> int:
+        """
+        Cantidad de turnos simultáneos que admite un slot (una por línea de inspección),
+        con excepciones opcionales por día de la semana y hora.
+        """
+        return HORARIO_CONFIG["capacidad_por_dia_hora"].get(
+            (slot_datetime.weekday(), slot_datetime.hour),
+            HORARIO_CONFIG["capacidad_por_slot"]
+        )
+
+    @staticmethod
+    def _capacidad_restante(slot_datetime: datetime, ocupados: dict) -> int:
+        return max(0, BookingService.capacidad_slot(slot_datetime) - ocupados.get(slot_datetime, 0))
+
+    @staticmethod
+    def _minutos_inicio_slots() -> range:
+        """
+        Minutos desde la medianoche en que comienza cada slot del día. Solo se incluyen
+        los slots que terminan dentro del horario de atención.
+        """
+        duracion = HORARIO_CONFIG["duracion_turno_minutos"]
+        return range(
+            HORARIO_CONFIG["hora_inicio"] * 60,
+            HORARIO_CONFIG["hora_fin"] * 60 - duracion + 1,
+            duracion
+        )
+
+    @staticmethod
+    def _generar_slots_por_dia(inicio: datetime, final: datetime, version_cierres: Optional[int] = None):
+        """
+        Genera, para cada día laborable entre inicio y final (ambos inclusive),
+        la lista de horarios de sus slots.
+        """
+        minutos_slots = BookingService._minutos_inicio_slots()
+        duracion = timedelta(minutes=HORARIO_CONFIG["duracion_turno_minutos"])
+        indice_cierres = ClosureService.obtener_indice(version_cierres)
+        fecha_actual = inicio.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        while fecha_actual <= final:
+            # Solo días laborables (lunes a viernes)
+            if fecha_actual.weekday() in HORARIO_CONFIG["dias_laborables"]:
+                slots_dia = [fecha_actual + timedelta(minutes=minutos) for minutos in minutos_slots]
+                
+                # Una consulta al índice por día; solo los días con cierres se filtran slot a slot
+                apertura = fecha_actual + timedelta(hours=HORARIO_CONFIG["hora_inicio"])
+                cierre = fecha_actual + timedelta(hours=HORARIO_CONFIG["hora_fin"])
+                if indice_cierres.se_superpone(apertura, cierre):
+                    slots_dia = [slot for slot in slots_dia if not indice_cierres.se_superpone(slot, slot + duracion)]
+                
+                if slots_dia:
+                    yield fecha_actual.date(), slots_dia
+            
+            fecha_actual += timedelta(days=1)
+
     @staticmethod
     def create_booking(data: dict, user_role: str = None) -> Turno:
         """
@@ -98,6 +350,17 @@ class BookingService:
         if not (HORARIO_CONFIG["hora_inicio"] <= fecha_turno.hour < HORARIO_CONFIG["hora_fin"]):
             raise ValueError(f"Los turnos solo pueden ser entre las {HORARIO_CONFIG['hora_inicio']}:00 y las {HORARIO_CONFIG['hora_fin']}:00")
         
+        # Validar que el horario coincida con el inicio de un slot de la grilla
+        if fecha_turno.hour * 60 + fecha_turno.minute not in BookingService._minutos_inicio_slots():
+            raise ValueError(
+                f"El horario del turno debe coincidir con el inicio de un slot. "
+                f"Los turnos duran {HORARIO_CONFIG['duracion_turno_minutos']} minutos a partir de las {HORARIO_CONFIG['hora_inicio']}:00"
+            )
+        
+        fin_turno = fecha_turno + timedelta(minutes=HORARIO_CONFIG["duracion_turno_minutos"])
+        if ClosureService.esta_cerrado(fecha_turno, fin_turno):
+            raise ValueError("La planta se encuentra cerrada en el horario seleccionado (feriado o cierre programado)")
+        
         # Verificar que no exista otro turno para ese vehículo en esa fecha
         turno_existente = Turno.query.filter(
             Turno.vehiculo_id == vehiculo.id,
@@ -112,6 +375,12 @@ class BookingService:
         if not estado_reservado:
             raise ValueError("Estado RESERVADO no encontrado en la base de datos")
         
+        # Reserva atómica del slot: garantiza no superar la capacidad del horario aun con
+        # pedidos concurrentes desde distintos workers
+        if not OccupancyService.reservar(fecha_turno, BookingService.capacidad_slot(fecha_turno)):
+            db.session.rollback()
+            raise ValueError("El horario seleccionado ya no tiene disponibilidad")
+        
         nuevo_turno = Turno(
             vehiculo_id=vehiculo.id,
             fecha=fecha_turno,
@@ -121,6 +390,8 @@ class BookingService:
         
         db.session.add(nuevo_turno)
         db.session.commit()
+        VersionService.incrementar("turno")
+        invalidar_dia_de_turnos(fecha_turno.date())
         db.session.refresh(nuevo_turno, ['vehiculo', 'estado', 'creador'])
         
         return nuevo_turno
@@ -173,12 +444,40 @@ class BookingService:
                 f"Transiciones permitidas desde {estado_actual}: {', '.join(transiciones_validas.get(estado_actual, [])) or 'ninguna'}"
             )
         
-        turno.estado_id = nuevo_estado_id
+        if not BookingService.transicionar_estado(turno_id, turno.estado_id, nuevo_estado_id):
+            db.session.rollback()
+            raise ValueError("El turno cambió de estado mientras se procesaba la solicitud. Vuelva a consultarlo")
+        # Al pasar a COMPLETADO o CANCELADO el slot deja de estar ocupado
+        if estado_nuevo in ["COMPLETADO", "CANCELADO"]:
+            OccupancyService.decrementar(turno.fecha)
         db.session.commit()
+        VersionService.incrementar("turno")
+        invalidar_dia_de_turnos(turno.fecha.date())
         db.session.refresh(turno, ['vehiculo', 'estado', 'creador'])
         
         return turno
 
+    @staticmethod
+    def transicionar_estado(turno_id: int, estado_actual_id: int, nuevo_estado_id: int) -> bool:
+        """
+        Cambia el estado del turno solo si sigue en `estado_actual_id`. No hace commit:
+        forma parte de la transacción del llamador.
+        
+        La condición se evalúa dentro del propio UPDATE, que toma el bloqueo de la fila:
+        de dos transiciones concurrentes desde el mismo estado (dos cancelaciones, o una
+        cancelación y una inspección) solo una modifica el turno, y solo esa debe liberar
+        el lugar del slot.
+        
+        Returns:
+            bool: True si el turno cambió de estado, False si otra transacción lo cambió antes
+        """
+        resultado = db.session.execute(
+            update(Turno)
+            .where(Turno.id == turno_id, Turno.estado_id == estado_actual_id)
+            .values(estado_id=nuevo_estado_id)
+        )
+        return resultado.rowcount == 1
+
     @staticmethod
     def get_booking_by_id(turno_id: int, user_id: int = None, user_role: str = None) -> Turno:
         """
@@ -188,7 +487,7 @@ class BookingService:
         - ADMIN puede ver cualquier turno
         - Usuarios normales solo pueden ver turnos de sus propios vehículos
         """
-        turno = Turno.query.filter_by(id=turno_id).first()
+        turno = BookingService._query_con_relaciones().filter(Turno.id == turno_id).first()
         if not turno:
             raise ValueError(f"Turno con ID {turno_id} no encontrado")
         
@@ -196,35 +495,141 @@ class BookingService:
             if turno.vehiculo.duenio_id != user_id:
                 raise ValueError("No tienes permiso para ver este turno. Solo puedes ver turnos de tus propios vehículos")
         
-        db.session.refresh(turno, ['vehiculo', 'estado', 'creador', 'inspeccion'])
-        # Si tiene inspección, cargar también el resultado
-        if turno.inspeccion:
-            db.session.refresh(turno.inspeccion, ['resultado'])
         return turno
 
     @staticmethod
-    def list_bookings_by_user(user_id: int) -> list[Turno]:
+    def _query_con_relaciones():
+        """
+        Consulta de turnos con vehículo, estado, creador e inspección (con su resultado)
+        cargados en el mismo SELECT, para no disparar consultas por cada fila.
+        """
+        return Turno.query.options(
+            joinedload(Turno.vehiculo),
+            joinedload(Turno.estado),
+            joinedload(Turno.creador),
+            joinedload(Turno.inspeccion).joinedload(Inspeccion.resultado)
+        )
+
+    @staticmethod
+    def _aplicar_filtros(query, filtros: Optional[dict]):
+        """
+        Aplica en SQL los filtros opcionales de los listados: estado, desde, hasta y matricula.
+        
+        Las fechas son inclusivas y se traducen a un rango semiabierto sobre Turno.fecha,
+        de forma que los índices (estado_id, fecha, id) y (vehiculo_id, fecha, id) resuelven
+        tanto el filtro como el orden de la paginación.
+        """
+        if not filtros:
+            return query
+        
+        if filtros.get("estado"):
+            estado = EstadoTurno.query.filter_by(nombre=filtros["estado"]).first()
+            if not estado:
+                raise ValueError(f"Estado de turno '{filtros['estado']}' no encontrado")
+            query = query.filter(Turno.estado_id == estado.id)
+        
+        desde = datetime.strptime(filtros["desde"], '%Y-%m-%d') if filtros.get("desde") else None
+        hasta = datetime.strptime(filtros["hasta"], '%Y-%m-%d') + timedelta(days=1) if filtros.get("hasta") else None
+        if desde and hasta and desde >= hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a la fecha 'hasta'")
+        if desde:
+            query = query.filter(Turno.fecha >= desde)
+        if hasta:
+            query = query.filter(Turno.fecha < hasta)
+        
+        if filtros.get("matricula"):
+            query = query.filter(Turno.vehiculo_id.in_(
+                db.session.query(Vehiculo.id).filter(Vehiculo.matricula == filtros["matricula"])
+            ))
+        
+        return query
+
+    @staticmethod
+    def _paginar(query, limite: int, cursor: Optional[tuple]) -> tuple[list, Optional[str]]:
         """
-        Lista todos los turnos creados por un usuario.
+        Pagina por clave (fecha, id) en orden descendente.
+        
+        El cursor es la clave del último turno de la página anterior, por lo que cada
+        página es un rango del índice y no depende de cuántas filas se saltean.
+        Devuelve las filas de la página y el cursor de la siguiente (None si no hay más).
+        """
+        if cursor:
+            query = query.filter(tuple_(Turno.fecha, Turno.id) < tuple_(*cursor))
+        
+        turnos = query.order_by(Turno.fecha.desc(), Turno.id.desc()).limit(limite + 1).all()
+        
+        if len(turnos) <= limite:
+            return turnos, None
+        
+        turnos = turnos[:limite]
+        return turnos, codificar_cursor(turnos[-1].fecha, turnos[-1].id)
+
+    @staticmethod
+    def _query_listado():
+        """
+        Proyección de solo lectura para los listados: selecciona únicamente las columnas
+        que se devuelven, resolviendo los nombres por JOIN.
+        
+        Devuelve filas (tuplas con nombre), no entidades: no hay instanciación de modelos
+        ni seguimiento en el identity map de la sesión.
+        """
+        return (db.session.query(
+                    Turno.id,
+                    Turno.vehiculo_id,
+                    Vehiculo.matricula,
+                    Turno.fecha,
+                    EstadoTurno.nombre.label("estado"),
+                    Turno.creado_por,
+                    Usuario.nombre_completo.label("nombre_creador"),
+                    Inspeccion.puntuacion_total,
+                    ResultadoInspeccion.nombre.label("resultado"))
+                .select_from(Turno)
+                .join(Vehiculo, Turno.vehiculo_id == Vehiculo.id)
+                .join(EstadoTurno, Turno.estado_id == EstadoTurno.id)
+                .join(Usuario, Turno.creado_por == Usuario.id)
+                .outerjoin(Inspeccion, Inspeccion.turno_id == Turno.id)
+                .outerjoin(ResultadoInspeccion, Inspeccion.resultado_id == ResultadoInspeccion.id))
+
+    @staticmethod
+    def fila_a_dict(fila) -> dict:
+        """
+        Convierte una fila de _query_listado en los campos de BookingResponse.
+        La inspección solo se informa en turnos completados.
+        """
+        completado = fila.estado == "COMPLETADO"
+        return {
+            "id": fila.id,
+            "vehiculo_id": fila.vehiculo_id,
+            "matricula": fila.matricula,
+            "fecha": fila.fecha.strftime('%Y-%m-%d %H:%M'),
+            "estado": fila.estado,
+            "creado_por": fila.creado_por,
+            "nombre_creador": fila.nombre_creador,
+            "puntuacion_total": fila.puntuacion_total if completado else None,
+            "resultado": fila.resultado if completado else None
+        }
+
+    @staticmethod
+    def list_bookings_by_user(user_id: int, limite: int = LIMITE_POR_DEFECTO, cursor: Optional[tuple] = None,
+                              filtros: Optional[dict] = None) -> tuple[list, Optional[str]]:
+        """
+        Lista los turnos creados por un usuario, filtrados y paginados por (fecha, id).
         """
         usuario = Usuario.query.filter_by(id=user_id).first()
         if not usuario:
             raise ValueError(f"Usuario con ID {user_id} no encontrado")
         
-        turnos = Turno.query.filter_by(creado_por=user_id).order_by(Turno.fecha.desc()).all()
-        
-        # Carga relaciones
-        for turno in turnos:
-            db.session.refresh(turno, ['vehiculo', 'estado', 'creador', 'inspeccion'])
-            if turno.inspeccion:
-                db.session.refresh(turno.inspeccion, ['resultado'])
+        query = BookingService._query_listado().filter(Turno.creado_por == user_id)
+        query = BookingService._aplicar_filtros(query, filtros)
         
-        return turnos
+        return BookingService._paginar(query, limite, cursor)
 
     @staticmethod
-    def list_bookings_by_vehicle(matricula: str, user_id: int = None, user_role: str = None) -> list[Turno]:
+    def list_bookings_by_vehicle(matricula: str, user_id: int = None, user_role: str = None,
+                                 limite: int = LIMITE_POR_DEFECTO, cursor: Optional[tuple] = None,
+                                 filtros: Optional[dict] = None) -> tuple[list, Optional[str]]:
         """
-        Lista todos los turnos de un vehículo.
+        Lista los turnos de un vehículo, filtrados y paginados por (fecha, id).
         - ADMIN e INSPECTOR: pueden ver turnos de cualquier vehículo
         - DUENIO: solo puede ver turnos de sus propios vehículos
         """
@@ -236,35 +641,120 @@ class BookingService:
             if vehiculo.duenio_id != user_id:
                 raise ValueError("No tiene permisos para ver los turnos de este vehículo")
         
-        turnos = Turno.query.filter_by(vehiculo_id=vehiculo.id).order_by(Turno.fecha.desc()).all()
-        
-        # Carga relaciones
-        for turno in turnos:
-            db.session.refresh(turno, ['vehiculo', 'estado', 'creador', 'inspeccion'])
-            if turno.inspeccion:
-                db.session.refresh(turno.inspeccion, ['resultado'])
+        query = BookingService._query_listado().filter(Turno.vehiculo_id == vehiculo.id)
+        # La matrícula ya viene dada por la ruta
+        query = BookingService._aplicar_filtros(query, {**(filtros or {}), "matricula": None})
         
-        return turnos
+        return BookingService._paginar(query, limite, cursor)
 
     @staticmethod
-    def list_all_bookings(user_id: int = None, user_role: str = None) -> list[Turno]:
+    def list_all_bookings(user_id: int = None, user_role: str = None, limite: int = LIMITE_POR_DEFECTO,
+                          cursor: Optional[tuple] = None,
+                          filtros: Optional[dict] = None) -> tuple[list, Optional[str]]:
         """
-        Lista turnos del sistema.
+        Lista turnos del sistema, filtrados y paginados por (fecha, id).
         - ADMIN: ve todos los turnos
         - DUENIO: solo ve turnos de sus propios vehículos
         """
-        if user_role == "ADMIN":
-            turnos = Turno.query.order_by(Turno.fecha.desc()).all()
-        else:
-            turnos = (Turno.query
-                     .join(Vehiculo)
-                     .filter(Vehiculo.duenio_id == user_id)
-                     .order_by(Turno.fecha.desc())
-                     .all())
-        
-        for turno in turnos:
-            db.session.refresh(turno, ['vehiculo', 'estado', 'creador', 'inspeccion'])
-            if turno.inspeccion:
-                db.session.refresh(turno.inspeccion, ['resultado'])
-        
-        return turnos
+        query = BookingService._query_listado()
+        if user_role != "ADMIN":
+            query = query.filter(Vehiculo.duenio_id == user_id)
+        query = BookingService._aplicar_filtros(query, filtros)
+        
+        return BookingService._paginar(query, limite, cursor)
+
+    @staticmethod
+    def exportar_turnos(filtros: Optional[dict] = None) -> Iterator[dict]:
+        """
+        Recorre todos los turnos (con los filtros opcionales) sin cargarlos juntos en memoria.
+        
+        Usa la misma proyección de columnas que los listados y un cursor del lado del
+        servidor (yield_per), de modo que en memoria hay a lo sumo un lote de filas a la vez.
+        """
+        query = BookingService._query_listado()
+        query = BookingService._aplicar_filtros(query, filtros)
+        query = query.order_by(Turno.fecha.desc(), Turno.id.desc()).yield_per(TAMANIO_LOTE_EXPORT)
+        
+        for fila in query:
+            yield BookingService.fila_a_dict(fila)
+
+    @staticmethod
+    def agenda_del_dia(dia: date, version: Optional[int] = None) -> list[dict]:
+        """
+        Turnos CONFIRMADOS de un día, ordenados por horario, con los datos del vehículo
+        y el contacto del dueño resueltos en una sola consulta.
+        
+        El resultado se guarda en la cache de agenda por día y versión de turnos (la
+        misma de la que se deriva el ETag), hasta que un cambio sobre un turno de ese
+        día la invalide o venza el TTL.
+        
+        Args:
+            dia: Día de la agenda
+            version: Versión de turnos ya leída (por ejemplo para el ETag), opcional
+        """
+        if version is None:
+            version = BookingService.version_agenda()
+        
+        cache = obtener_cache_agenda()
+        clave = (dia, version)
+        agenda = cache.get(clave)
+        if agenda is not None:
+            return agenda
+        
+        inicio = datetime.combine(dia, datetime.min.time())
+        filas = (db.session.query(
+                    Turno.id,
+                    Turno.fecha,
+                    Vehiculo.matricula,
+                    Vehiculo.marca,
+                    Vehiculo.modelo,
+                    Vehiculo.anio,
+                    Usuario.nombre_completo,
+                    Usuario.mail,
+                    Usuario.telefono)
+                 .select_from(Turno)
+                 .join(EstadoTurno, Turno.estado_id == EstadoTurno.id)
+                 .join(Vehiculo, Turno.vehiculo_id == Vehiculo.id)
+                 .join(Usuario, Vehiculo.duenio_id == Usuario.id)
+                 .filter(EstadoTurno.nombre == "CONFIRMADO",
+                         Turno.fecha >= inicio,
+                         Turno.fecha < inicio + timedelta(days=1))
+                 .order_by(Turno.fecha, Turno.id)
+                 .all())
+        
+        agenda = [{
+            "id": fila.id,
+            "fecha": fila.fecha.strftime('%Y-%m-%d %H:%M'),
+            "vehiculo": {
+                "matricula": fila.matricula,
+                "marca": fila.marca,
+                "modelo": fila.modelo,
+                "anio": fila.anio
+            },
+            "duenio": {
+                "nombre_completo": fila.nombre_completo,
+                "mail": fila.mail,
+                "telefono": fila.telefono
+            }
+        } for fila in filas]
+        
+        cache.set(clave, agenda, dia, dia)
+        return agenda
+
+    @staticmethod
+    def version_agenda() -> int:
+        """
+        Contador de versión del que depende la agenda (turnos).
+        """
+        return VersionService.obtener("turno")["turno"]
+
+    @staticmethod
+    def etag_agenda(dia: date, version: Optional[int] = None) -> str:
+        """
+        ETag de la agenda de un día, sin consultar los turnos: se deriva del contador
+        de versión de turnos (compartido entre workers) y del día.
+        """
+        if version is None:
+            version = BookingService.version_agenda()
+        firma = f"agenda|{dia.isoformat()}|{version}"
+        return hashlib.sha256(firma.encode('utf-8')).hexdigest()
@@ -0,0 +1,72 @@
+from src import db
+from src.models import TipoChequeo
+from src.models.check_type_model import TIPOS_CHEQUEO
+from flask import current_app
+
+
+class CatalogService:
+    """
+    Ids de las tablas de catálogo (estados, roles, resultados, tipos de chequeo) por nombre.
+
+    Los catálogos no cambian en ejecución, por lo que cada tabla se lee completa una
+    sola vez por proceso y queda en memoria. Los ids dependen de cómo se cargó cada
+    base, así que no se asumen fijos: se resuelven por nombre.
+    """
+
+    @staticmethod
+    def obtener_id(modelo, nombre: str) -> int:
+        """
+        Devuelve el id del registro de catálogo con ese nombre, cargando la tabla en el primer uso.
+        """
+        catalogos = current_app.extensions.setdefault('catalogos', {})
+        ids = catalogos.get(modelo.__tablename__)
+        if ids is None:
+            ids = dict(db.session.query(modelo.nombre, modelo.id).all())
+            catalogos[modelo.__tablename__] = ids
+
+        if nombre not in ids:
+            raise ValueError(f"'{nombre}' no encontrado en el catálogo {modelo.__tablename__}")
+        return ids[nombre]
+
+    @staticmethod
+    def tipos_chequeo() -> dict[int, tuple[str, str]]:
+        """
+        Devuelve los tipos de chequeo como {id: (clave, descripción)}, cargando la tabla en el primer uso.
+        """
+        catalogos = current_app.extensions.setdefault('catalogos', {})
+        tipos = catalogos.get('tipo_chequeo_detalle')
+        if tipos is None:
+            tipos = {id_: (nombre, descripcion) for id_, nombre, descripcion
+                     in db.session.query(TipoChequeo.id, TipoChequeo.nombre, TipoChequeo.descripcion).all()}
+            catalogos['tipo_chequeo_detalle'] = tipos
+        return tipos
+
+    @staticmethod
+    def obtener_tipo_chequeo(texto: str) -> int:
+        """
+        Resuelve el id de un tipo de chequeo a partir de su clave ('FRENOS') o de la
+        descripción en texto libre que enviaban los clientes anteriores ('Frenos'). Ambas
+        se comparan sin distinguir mayúsculas ni espacios en los extremos.
+        """
+        catalogos = current_app.extensions.setdefault('catalogos', {})
+        ids = catalogos.get('tipo_chequeo_texto')
+        if ids is None:
+            ids = {}
+            for id_, (nombre, descripcion) in CatalogService.tipos_chequeo().items():
+                ids[descripcion.strip().lower()] = id_
+                ids[nombre.lower()] = id_
+            catalogos['tipo_chequeo_texto'] = ids
+
+        clave = texto.strip().lower()
+        if clave not in ids:
+            raise ValueError(f"Tipo de chequeo '{texto}' no encontrado en el catálogo tipo_chequeo")
+        return ids[clave]
+
+    @staticmethod
+    def posiciones_tipo_chequeo() -> dict[int, int]:
+        """
+        Devuelve {id de tipo de chequeo: posición} según el orden fijo de TIPOS_CHEQUEO, que
+        es el orden de los bytes de Inspeccion.puntuaciones.
+        """
+        return {CatalogService.obtener_id(TipoChequeo, clave): posicion
+                for posicion, (clave, _) in enumerate(TIPOS_CHEQUEO)}
@@ -0,0 +1,199 @@
+from src import db
+from src.models import Inspeccion, Chequeo, Usuario
+from src.services.catalog_service import CatalogService
+from src.utils.analytics_utils import (
+    histograma_por_grupo, promedios, percentiles, desempaquetar_puntuaciones, CHEQUEOS_POR_INSPECCION
+)
+from sqlalchemy import select, func, extract
+from datetime import date, datetime, timedelta
+import numpy as np
+
+# Inspecciones por lote al leer las puntuaciones de la base
+TAMANIO_LOTE_ANALISIS = 100_000
+PERCENTILES = [10, 25, 50, 75, 90]
+
+
+class CheckAnalyticsService:
+    """
+    Análisis de la distribución de puntuaciones de los chequeos (por tipo de chequeo, por
+    mes y por inspector) para detectar controles sistemáticamente bajos.
+
+    Las puntuaciones se leen por lotes desde el vector empaquetado de cada inspección (sin
+    instanciar modelos ni leer la tabla chequeo, salvo para las inspecciones históricas sin
+    vector) y se decodifican directamente como arreglos de NumPy; histogramas, promedios y
+    percentiles se calculan de forma vectorizada con analytics_utils.
+    """
+
+    @staticmethod
+    def _cargar_columnas(desde: date, hasta: date) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lee los chequeos de las inspecciones del rango [desde, hasta] como cuatro arreglos
+        alineados: tipo_chequeo_id, mes (año * 12 + mes - 1), inspector_id (0 si la
+        inspección no tiene inspector) y puntuación.
+
+        Las puntuaciones salen del vector empaquetado de cada inspección, sin leer la tabla
+        chequeo: una fila por inspección en lugar de ocho. Las inspecciones históricas sin
+        vector (que no evaluaron los 8 tipos del catálogo) se completan con sus filas de
+        la tabla chequeo.
+        """
+        rango = (
+            Inspeccion.fecha >= datetime.combine(desde, datetime.min.time()),
+            Inspeccion.fecha < datetime.combine(hasta + timedelta(days=1), datetime.min.time())
+        )
+        mes = extract('year', Inspeccion.fecha) * 12 + extract('month', Inspeccion.fecha) - 1
+        inspector = func.coalesce(Inspeccion.inspector_id, 0)
+
+        empaquetadas = CheckAnalyticsService._cargar_empaquetadas(
+            select(Inspeccion.puntuaciones, mes, inspector)
+            .where(*rango, Inspeccion.puntuaciones.isnot(None))
+        )
+        sin_vector = CheckAnalyticsService._cargar_chequeos(
+            select(Chequeo.tipo_chequeo_id, mes, inspector, Chequeo.puntuacion)
+            .join(Inspeccion, Chequeo.inspeccion_id == Inspeccion.id)
+            .where(*rango, Inspeccion.puntuaciones.is_(None))
+        )
+
+        return tuple(np.concatenate(columna) for columna in zip(empaquetadas, sin_vector))
+
+    @staticmethod
+    def _ejecutar_por_lotes(consulta):
+        """
+        Ejecuta la consulta en streaming (Core, sin la capa de resultados del ORM) y la
+        devuelve por lotes de filas: con MySQL usa un cursor del lado del servidor y la
+        memoria queda acotada a un lote además de los arreglos. La opción se aplica a la
+        sentencia, sin modificar la conexión de la sesión.
+        """
+        resultado = db.session.execute(consulta.execution_options(stream_results=True))
+        return resultado.partitions(TAMANIO_LOTE_ANALISIS)
+
+    @staticmethod
+    def _cargar_empaquetadas(consulta) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Columnas de los chequeos a partir de filas (puntuaciones, mes, inspector): cada
+        vector empaquetado se expande en una fila por tipo de chequeo.
+        """
+        lotes = []
+        for filas in CheckAnalyticsService._ejecutar_por_lotes(consulta):
+            empaquetadas, meses, inspectores = zip(*filas)
+            lotes.append((
+                desempaquetar_puntuaciones(b"".join(empaquetadas)),
+                np.fromiter(meses, dtype=np.int64, count=len(filas)),
+                np.fromiter(inspectores, dtype=np.int64, count=len(filas))
+            ))
+
+        if not lotes:
+            vacio = np.empty(0, dtype=np.int64)
+            return vacio, vacio, vacio, vacio
+
+        puntuaciones, meses, inspectores = (np.concatenate(columna) for columna in zip(*lotes))
+
+        # Una fila por chequeo: la columna j de la matriz es el tipo en la posición j
+        tipo_por_posicion = np.empty(CHEQUEOS_POR_INSPECCION, dtype=np.int64)
+        for tipo_id, posicion in CatalogService.posiciones_tipo_chequeo().items():
+            tipo_por_posicion[posicion] = tipo_id
+        n = len(puntuaciones)
+        return (
+            np.tile(tipo_por_posicion, n),
+            np.repeat(meses, CHEQUEOS_POR_INSPECCION),
+            np.repeat(inspectores, CHEQUEOS_POR_INSPECCION),
+            puntuaciones.ravel().astype(np.int64)
+        )
+
+    @staticmethod
+    def _cargar_chequeos(consulta) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Columnas de los chequeos a partir de filas (tipo_chequeo_id, mes, inspector, puntuación)
+        de la tabla chequeo.
+        """
+        lotes = [
+            tuple(np.fromiter(columna, dtype=np.int64, count=len(filas)) for columna in zip(*filas))
+            for filas in CheckAnalyticsService._ejecutar_por_lotes(consulta)
+        ]
+
+        if not lotes:
+            vacio = np.empty(0, dtype=np.int64)
+            return vacio, vacio, vacio, vacio
+
+        return tuple(np.concatenate(columna) for columna in zip(*lotes))
+
+    @staticmethod
+    def _resumenes(codigos: np.ndarray, puntuaciones: np.ndarray, n_grupos: int) -> list[dict]:
+        """
+        Cantidad, promedio, percentiles e histograma (puntuaciones 1 a 10) de cada grupo.
+        """
+        histograma = histograma_por_grupo(codigos, puntuaciones, n_grupos)
+        medias = promedios(histograma)
+        cuantiles = percentiles(histograma, PERCENTILES)
+        cantidades = histograma.sum(axis=1)
+
+        return [{
+            "cantidad": int(cantidades[g]),
+            "promedio": round(float(medias[g]), 2) if cantidades[g] else None,
+            **{f"p{p}": int(cuantiles[g, i]) if cantidades[g] else None for i, p in enumerate(PERCENTILES)},
+            "histograma": histograma[g].tolist()
+        } for g in range(n_grupos)]
+
+    @staticmethod
+    def analizar(desde: date, hasta: date) -> dict:
+        """
+        Distribución de puntuaciones de los chequeos de las inspecciones entre `desde` y
+        `hasta` (inclusive): totales y cortes por tipo de chequeo (de menor a mayor promedio),
+        por mes y por inspector.
+        """
+        if desde > hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a la fecha 'hasta'")
+
+        columnas = CheckAnalyticsService._cargar_columnas(desde, hasta)
+
+        return {
+            "desde": desde.strftime('%Y-%m-%d'),
+            "hasta": hasta.strftime('%Y-%m-%d'),
+            **CheckAnalyticsService._resumir(*columnas)
+        }
+
+    @staticmethod
+    def _resumir(tipos: np.ndarray, meses: np.ndarray, inspectores: np.ndarray, puntuaciones: np.ndarray) -> dict:
+        """
+        Calcula los totales y los cortes a partir de las columnas de _cargar_columnas.
+        """
+
+        (totales,) = CheckAnalyticsService._resumenes(np.zeros(len(puntuaciones), dtype=np.int64), puntuaciones, 1)
+
+        valores_tipo, codigos_tipo = np.unique(tipos, return_inverse=True)
+        tipos_chequeo = CatalogService.tipos_chequeo()
+        por_descripcion = [
+            {"tipo": tipos_chequeo[tipo_id][0], "descripcion": tipos_chequeo[tipo_id][1], **resumen}
+            for tipo_id, resumen in zip(
+                valores_tipo.tolist(),
+                CheckAnalyticsService._resumenes(codigos_tipo, puntuaciones, len(valores_tipo))
+            )
+        ]
+        por_descripcion.sort(key=lambda grupo: (grupo["promedio"], grupo["tipo"]))
+
+        valores_mes, codigos_mes = np.unique(meses, return_inverse=True)
+        por_mes = [
+            {"mes": f"{mes // 12:04d}-{mes % 12 + 1:02d}", **resumen}
+            for mes, resumen in zip(
+                valores_mes.tolist(),
+                CheckAnalyticsService._resumenes(codigos_mes, puntuaciones, len(valores_mes))
+            )
+        ]
+
+        valores_inspector, codigos_inspector = np.unique(inspectores, return_inverse=True)
+        nombres = dict(db.session.query(Usuario.id, Usuario.nombre_completo)
+                       .filter(Usuario.id.in_(valores_inspector.tolist()))
+                       .all()) if len(valores_inspector) else {}
+        por_inspector = [
+            {"inspector_id": inspector_id or None, "inspector_nombre": nombres.get(inspector_id), **resumen}
+            for inspector_id, resumen in zip(
+                valores_inspector.tolist(),
+                CheckAnalyticsService._resumenes(codigos_inspector, puntuaciones, len(valores_inspector))
+            )
+        ]
+
+        return {
+            "totales": totales,
+            "por_descripcion": por_descripcion,
+            "por_mes": por_mes,
+            "por_inspector": por_inspector
+        }
@@ -0,0 +1,102 @@
+from src import db
+from src.models import Cierre
+from src.services.version_service import VersionService
+from src.utils.interval_utils import IndiceIntervalos
+from src.utils.cache_utils import obtener_cache_disponibilidad
+from flask import current_app
+from datetime import datetime, timedelta, time
+from typing import Optional
+
+
+class ClosureService:
+    """
+    Calendario de feriados y cierres de planta. Los cierres se compilan en un índice
+    de intervalos en memoria (uno por proceso) que consulta el generador de slots.
+    """
+
+    @staticmethod
+    def obtener_indice(version: Optional[int] = None) -> IndiceIntervalos:
+        """
+        Devuelve el índice de cierres del proceso, compilándolo en el primer uso y
+        recompilándolo cuando el contador de versión de cierres (compartido entre
+        workers) no coincide con el de la compilación en memoria.
+        
+        Args:
+            version: Versión de cierres ya leída por el llamador, para no volver a consultarla
+        """
+        if version is None:
+            version = VersionService.obtener("cierre")["cierre"]
+        compilado = current_app.extensions.get('indice_cierres')
+        if compilado is None or compilado[0] != version:
+            return ClosureService.recargar_indice(version)
+        return compilado[1]
+
+    @staticmethod
+    def recargar_indice(version: Optional[int] = None) -> IndiceIntervalos:
+        """
+        Recompila el índice desde la tabla cierre, sin reiniciar la aplicación.
+        Invalida la cache de disponibilidad, que depende de los cierres.
+        
+        La versión se lee antes que los cierres: si otro worker registra un cierre en
+        el medio, el índice queda asociado a la versión anterior y se recompila en el
+        próximo uso.
+        """
+        if version is None:
+            version = VersionService.obtener("cierre")["cierre"]
+        intervalos = [ClosureService._intervalo(cierre) for cierre in Cierre.query.all()]
+        indice = IndiceIntervalos(intervalos)
+        
+        current_app.extensions['indice_cierres'] = (version, indice)
+        obtener_cache_disponibilidad().clear()
+        
+        return indice
+
+    @staticmethod
+    def recargar_cierres() -> IndiceIntervalos:
+        """
+        Recarga explícita luego de cambios manuales en la tabla cierre: además de
+        recompilar el índice, avanza la versión de cierres para invalidar los ETags.
+        """
+        VersionService.incrementar("cierre")
+        return ClosureService.recargar_indice()
+
+    @staticmethod
+    def esta_cerrado(inicio: datetime, fin: datetime) -> bool:
+        return ClosureService.obtener_indice().se_superpone(inicio, fin)
+
+    @staticmethod
+    def create_closure(data: dict) -> Cierre:
+        """
+        Registra un feriado (día completo) o un cierre parcial por rango horario.
+        """
+        fecha = datetime.strptime(data["fecha"], '%Y-%m-%d').date()
+        hora_desde = datetime.strptime(data["hora_desde"], '%H:%M').time() if data.get("hora_desde") else None
+        hora_hasta = datetime.strptime(data["hora_hasta"], '%H:%M').time() if data.get("hora_hasta") else None
+        
+        if (hora_desde is None) != (hora_hasta is None):
+            raise ValueError("Para un cierre parcial se deben indicar hora_desde y hora_hasta")
+        
+        if hora_desde is not None and hora_desde >= hora_hasta:
+            raise ValueError("hora_hasta debe ser posterior a hora_desde")
+        
+        cierre = Cierre(
+            fecha=fecha,
+            hora_desde=hora_desde,
+            hora_hasta=hora_hasta,
+            motivo=data["motivo"]
+        )
+        
+        db.session.add(cierre)
+        db.session.commit()
+        VersionService.incrementar("cierre")
+        ClosureService.recargar_indice()
+        
+        return cierre
+
+    @staticmethod
+    def _intervalo(cierre: Cierre) -> tuple[datetime, datetime]:
+        if cierre.hora_desde is None:
+            inicio = datetime.combine(cierre.fecha, time.min)
+            return inicio, inicio + timedelta(days=1)
+        
+        return datetime.combine(cierre.fecha, cierre.hora_desde), datetime.combine(cierre.fecha, cierre.hora_hasta)
@@ -6,15 +6,29 @@ from src.models import (
     EstadoTurno, 
     Vehiculo,
     ResultadoInspeccion,
-    Usuario
+    Usuario,
+    UsuarioRol
 )
-from datetime import datetime
+from src.services.booking_service import BookingService
+from src.services.catalog_service import CatalogService
+from src.services.latest_inspection_service import LatestInspectionService
+from src.services.occupancy_service import OccupancyService
+from src.services.stats_service import StatsService
+from src.services.version_service import VersionService
+from src.utils.cache_utils import invalidar_dia_de_turnos
+from src.utils.db_utils import insertar_filas
+from src.utils.pagination_utils import codificar_cursor, LIMITE_POR_DEFECTO
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import joinedload
+from datetime import datetime, date, timedelta
+from typing import Optional
 
 
 class InspectionService:
     
     @staticmethod
-    def create_inspection(data: dict) -> Inspeccion:
+    def create_inspection(data: dict) -> dict:
         """
         Crea una inspección completa
         
@@ -23,29 +37,147 @@ class InspectionService:
         - El turno debe estar en estado CONFIRMADO
         - El turno no debe tener ya una inspección
         - El inspector debe existir y tener rol INSPECTOR
-        - Debe proporcionar los 8 chequeos
+        - Debe proporcionar los 8 chequeos, uno de cada tipo del catálogo
         - La inspección debe realizarse el día programado del turno
         
         Reglas de negocio:
         - SEGURO: 40 ≤ suma ≤ 80 Y todos los chequeos ≥ 5
         - RECHEQUEAR: suma < 40 O algún chequeo < 5 (observación OBLIGATORIA)
+        
+        Devuelve el detalle de la inspección armado con los datos ya conocidos, sin
+        volver a leerla de la base. Los ids de estados, roles, resultados y tipos de
+        chequeo salen de la cache de catálogos y los chequeos se insertan en una sola
+        sentencia.
+        """
+        detalle, fecha_turno = InspectionService._registrar_inspeccion(data)
+        
+        db.session.commit()
+        VersionService.incrementar("turno")
+        invalidar_dia_de_turnos(fecha_turno)
+        
+        return detalle
+    
+    @staticmethod
+    def create_inspections_batch(inspecciones: list[dict], tamanio_lote: int) -> list[dict]:
+        """
+        Registra varias inspecciones de una vez (carga diferida de las tablets sin conexión).
+        
+        Cada inspección se escribe dentro de su propio SAVEPOINT: si una no cumple las
+        validaciones de create_inspection se deshacen solo sus escrituras y el resto del
+        lote sigue adelante. Se hace commit cada `tamanio_lote` inspecciones, invalidando
+        una sola vez las caches de los días afectados por cada bloque confirmado. Si la
+        base rechaza el commit de un bloque, solo las inspecciones de ese bloque se
+        informan como no creadas y la carga continúa con el siguiente. Ante un error
+        inesperado de la base al registrar una inspección se descarta el bloque en curso
+        y se devuelven los resultados obtenidos hasta ese momento, con las inspecciones
+        pendientes informadas como no procesadas: los bloques ya confirmados nunca se
+        convierten en un error global del lote.
+        
+        Devuelve un resultado por inspección, en el mismo orden:
+        {"turno_id", "creada", "resultado", "inspeccion", "error"}
+        """
+        resultados = []
+        dias_modificados = set()
+        inicio_bloque = 0
+        
+        for posicion, data in enumerate(inspecciones):
+            resultado = {
+                "turno_id": data["turno_id"],
+                "creada": False,
+                "resultado": None,
+                "inspeccion": None,
+                "error": None
+            }
+            try:
+                with db.session.begin_nested():
+                    detalle, fecha_turno = InspectionService._registrar_inspeccion(data)
+                resultado.update(creada=True, resultado=detalle["resultado"], inspeccion=detalle)
+                dias_modificados.add(fecha_turno)
+            except ValueError as e:
+                resultado["error"] = str(e)
+            except IntegrityError:
+                # Otra petición registró la inspección del turno en paralelo
+                resultado["error"] = f"El turno {data['turno_id']} ya tiene una inspección registrada"
+            except SQLAlchemyError:
+                db.session.rollback()
+                InspectionService._descartar_bloque(
+                    resultados[inicio_bloque:],
+                    "No se pudo confirmar el bloque de inspecciones. Reintente la carga"
+                )
+                resultados.extend({
+                    "turno_id": pendiente["turno_id"],
+                    "creada": False,
+                    "resultado": None,
+                    "inspeccion": None,
+                    "error": "No se procesó: la carga se interrumpió por un error de la base de datos. Reintente la carga"
+                } for pendiente in inspecciones[posicion:])
+                return resultados
+            resultados.append(resultado)
+            
+            if len(resultados) % tamanio_lote == 0 or len(resultados) == len(inspecciones):
+                try:
+                    db.session.commit()
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    InspectionService._descartar_bloque(
+                        resultados[inicio_bloque:],
+                        "No se pudo confirmar el bloque de inspecciones. Reintente la carga"
+                    )
+                else:
+                    InspectionService._publicar_bloque(dias_modificados)
+                dias_modificados.clear()
+                inicio_bloque = len(resultados)
+        
+        return resultados
+    
+    @staticmethod
+    def _descartar_bloque(resultados_bloque: list[dict], error: str) -> None:
+        """
+        Marca como no creadas las inspecciones de un bloque cuya transacción se deshizo.
+        """
+        for resultado in resultados_bloque:
+            if resultado["creada"]:
+                resultado.update(creada=False, resultado=None, inspeccion=None, error=error)
+    
+    @staticmethod
+    def _publicar_bloque(dias_modificados: set) -> None:
+        """
+        Avanza la versión de turnos e invalida las caches luego de confirmar un bloque.
+        Las inspecciones del bloque ya están guardadas: si falla el incremento del contador
+        se descarta solo esa transacción y los ETags se actualizan con la próxima escritura.
+        """
+        if dias_modificados:
+            try:
+                VersionService.incrementar("turno")
+            except SQLAlchemyError:
+                db.session.rollback()
+        for dia in dias_modificados:
+            invalidar_dia_de_turnos(dia)
+    
+    @staticmethod
+    def _registrar_inspeccion(data: dict) -> tuple[dict, date]:
+        """
+        Valida y escribe una inspección con sus chequeos sin hacer commit.
+        
+        Devuelve el detalle de la inspección y el día del turno, para que el llamador
+        avance la versión de turnos e invalide las caches luego de confirmar la transacción.
         """
         turno_id = data["turno_id"]
         inspector_id = data["inspector_id"]
         chequeos_data = data["chequeos"]
         observacion = data.get("observacion")
         
-        # Verificar que el turno existe
-        turno = Turno.query.filter_by(id=turno_id).first()
+        # Verificar que el turno existe (con la matrícula del vehículo en la misma consulta)
+        turno = Turno.query.options(joinedload(Turno.vehiculo)).filter(Turno.id == turno_id).first()
         if not turno:
             raise ValueError(f"Turno con ID {turno_id} no encontrado")
         
-        estado_confirmado = EstadoTurno.query.filter_by(nombre='CONFIRMADO').first()
-        estado_completado = EstadoTurno.query.filter_by(nombre='COMPLETADO').first()
+        estado_confirmado_id = CatalogService.obtener_id(EstadoTurno, 'CONFIRMADO')
+        estado_completado_id = CatalogService.obtener_id(EstadoTurno, 'COMPLETADO')
         
-        if turno.estado_id == estado_completado.id:
+        if turno.estado_id == estado_completado_id:
             raise ValueError("El turno ya fue completado")
-        elif turno.estado_id != estado_confirmado.id:
+        elif turno.estado_id != estado_confirmado_id:
             raise ValueError("No se puede llevar adelante esta inspección. Validar turno.")
         
         # Validar que la inspección se realiza el día programado del turno
@@ -57,18 +189,34 @@ class InspectionService:
             )
         
         # Verificar que el inspector existe y tiene rol INSPECTOR
-        inspector = Usuario.query.filter_by(id=inspector_id).first()
+        inspector = (db.session.query(Usuario.nombre_completo, Usuario.rol_id)
+                     .filter(Usuario.id == inspector_id)
+                     .first())
         if not inspector:
             raise ValueError(f"Inspector con ID {inspector_id} no encontrado")
         
-        db.session.refresh(inspector, ['rol'])
-        if inspector.rol.nombre != 'INSPECTOR':
+        if inspector.rol_id != CatalogService.obtener_id(UsuarioRol, 'INSPECTOR'):
             raise ValueError(f"El usuario {inspector_id} no tiene rol INSPECTOR")
         
         if len(chequeos_data) != 8:
             raise ValueError("Debe proporcionar la totalidad de los chequeos")
         
-        vehiculo = turno.vehiculo
+        # Tipo de cada chequeo: por clave o, en el formato anterior, por descripción
+        tipos_chequeo = CatalogService.tipos_chequeo()
+        tipo_ids = [CatalogService.obtener_tipo_chequeo(chequeo.get("tipo") or chequeo["descripcion"])
+                    for chequeo in chequeos_data]
+        
+        # Cada tipo del catálogo exactamente una vez: sus puntuaciones se guardan además
+        # empaquetadas en la inspección, un byte por tipo en el orden fijo del catálogo
+        posiciones = CatalogService.posiciones_tipo_chequeo()
+        if sorted(posiciones.get(tipo_id, -1) for tipo_id in tipo_ids) != list(range(len(posiciones))):
+            raise ValueError(
+                "Debe proporcionar un chequeo de cada tipo: "
+                + ", ".join(tipos_chequeo[tipo_id][0] for tipo_id in posiciones)
+            )
+        puntuaciones_empaquetadas = bytearray(len(posiciones))
+        for tipo_id, chequeo in zip(tipo_ids, chequeos_data):
+            puntuaciones_empaquetadas[posiciones[tipo_id]] = chequeo["puntuacion"]
         
         # Calcular puntuación total y determinar resultado
         puntuaciones = [chequeo["puntuacion"] for chequeo in chequeos_data]
@@ -89,40 +237,63 @@ class InspectionService:
             resultado_nombre = "SEGURO"
         
         # Obtener resultado de inspección
-        resultado = ResultadoInspeccion.query.filter_by(nombre=resultado_nombre).first()
-        if not resultado:
-            raise ValueError(f"Resultado '{resultado_nombre}' no encontrado en la base de datos")
+        resultado_id = CatalogService.obtener_id(ResultadoInspeccion, resultado_nombre)
+        
+        # El turno pasa a COMPLETADO solo si sigue CONFIRMADO: una cancelación o una
+        # inspección concurrentes no pueden completar el mismo turno ni liberar dos veces el slot
+        if not BookingService.transicionar_estado(turno_id, estado_confirmado_id, estado_completado_id):
+            raise ValueError("El turno cambió de estado mientras se registraba la inspección. Validar turno.")
         
+        ahora = datetime.utcnow()
         new_inspection = Inspeccion(
-            vehiculo_id=vehiculo.id,
+            vehiculo_id=turno.vehiculo_id,
             turno_id=turno_id,
             inspector_id=inspector_id,
-            fecha=datetime.utcnow(),
+            fecha=ahora,
             puntuacion_total=puntuacion_total,
-            resultado_id=resultado.id,
-            observacion=observacion
+            resultado_id=resultado_id,
+            observacion=observacion,
+            puntuaciones=bytes(puntuaciones_empaquetadas)
         )
         
         db.session.add(new_inspection)
-        db.session.flush() 
-        
-        for chequeo_data in chequeos_data:
-            chequeo = Chequeo(
-                inspeccion_id=new_inspection.id,
-                descripcion=chequeo_data["descripcion"],
-                puntuacion=chequeo_data["puntuacion"],
-                fecha=datetime.utcnow()
-            )
-            db.session.add(chequeo)
-        
-        estado_turno_completado = EstadoTurno.query.filter_by(nombre='COMPLETADO').first()
-        if estado_turno_completado:
-            turno.estado_id = estado_turno_completado.id
-        
-        db.session.commit()
-        db.session.refresh(new_inspection, ['chequeos', 'vehiculo', 'inspector', 'turno', 'resultado'])
+        db.session.flush()
+        
+        chequeos = [{
+            "inspeccion_id": new_inspection.id,
+            "tipo_chequeo_id": tipo_id,
+            "puntuacion": chequeo_data["puntuacion"],
+            "fecha": ahora
+        } for tipo_id, chequeo_data in zip(tipo_ids, chequeos_data)]
+        chequeo_ids = insertar_filas(Chequeo, chequeos, Chequeo.inspeccion_id == new_inspection.id)
+        LatestInspectionService.registrar(
+            turno.vehiculo_id, new_inspection.id, ahora, resultado_id, puntuacion_total
+        )
+        StatsService.registrar(
+            ahora.date(), inspector_id, turno.vehiculo.anio, resultado_id, puntuacion_total
+        )
         
-        return new_inspection
+        OccupancyService.decrementar(turno.fecha)
+        
+        detalle = {
+            "id": new_inspection.id,
+            "turno_id": turno_id,
+            "vehiculo_matricula": turno.vehiculo.matricula,
+            "inspector_nombre": inspector.nombre_completo,
+            "fecha": ahora,
+            "puntuacion_total": puntuacion_total,
+            "resultado": resultado_nombre,
+            "observacion": observacion,
+            "chequeos": [{
+                "id": chequeo_id,
+                "tipo": tipos_chequeo[chequeo["tipo_chequeo_id"]][0],
+                "descripcion": tipos_chequeo[chequeo["tipo_chequeo_id"]][1],
+                "puntuacion": chequeo["puntuacion"],
+                "fecha": chequeo["fecha"]
+            } for chequeo_id, chequeo in zip(chequeo_ids, chequeos)]
+        }
+        
+        return detalle, fecha_turno
     
     @staticmethod
     def get_inspection_by_id(inspeccion_id: int, user_id: int = None, user_role: str = None) -> Inspeccion:
@@ -148,9 +319,79 @@ class InspectionService:
         return inspeccion
     
     @staticmethod
-    def list_inspections_by_vehiculo(matricula: str, user_id: int = None, user_role: str = None) -> list[Inspeccion]:
+    def _query_listado():
+        """
+        Proyección de solo lectura para los listados con los campos de InspectionResponse.
+        
+        Devuelve filas (tuplas con nombre) en lugar de entidades, sin instanciar modelos
+        ni registrarlos en el identity map de la sesión.
+        """
+        return (db.session.query(
+                    Inspeccion.id,
+                    Inspeccion.turno_id,
+                    Vehiculo.matricula.label("vehiculo_matricula"),
+                    Usuario.nombre_completo.label("inspector_nombre"),
+                    Inspeccion.fecha,
+                    Inspeccion.puntuacion_total,
+                    ResultadoInspeccion.nombre.label("resultado"),
+                    Inspeccion.observacion,
+                    Inspeccion.puntuaciones)
+                .select_from(Inspeccion)
+                .join(Vehiculo, Inspeccion.vehiculo_id == Vehiculo.id)
+                .outerjoin(Usuario, Inspeccion.inspector_id == Usuario.id)
+                .outerjoin(ResultadoInspeccion, Inspeccion.resultado_id == ResultadoInspeccion.id))
+    
+    @staticmethod
+    def _aplicar_filtros(query, filtros: Optional[dict]):
         """
-        Lista todas las inspecciones de un vehículo por matrícula.
+        Aplica en SQL los filtros opcionales de los listados: desde, hasta y resultado.
+        
+        Las fechas son inclusivas y se traducen a un rango semiabierto sobre Inspeccion.fecha,
+        de forma que los índices (vehiculo_id, fecha, id), (inspector_id, fecha, id) y
+        (fecha) resuelven tanto el filtro como el orden de la paginación.
+        """
+        if not filtros:
+            return query
+        
+        desde = datetime.strptime(filtros["desde"], '%Y-%m-%d') if filtros.get("desde") else None
+        hasta = datetime.strptime(filtros["hasta"], '%Y-%m-%d') + timedelta(days=1) if filtros.get("hasta") else None
+        if desde and hasta and desde >= hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a la fecha 'hasta'")
+        if desde:
+            query = query.filter(Inspeccion.fecha >= desde)
+        if hasta:
+            query = query.filter(Inspeccion.fecha < hasta)
+        
+        if filtros.get("resultado"):
+            resultado_id = CatalogService.obtener_id(ResultadoInspeccion, filtros["resultado"])
+            query = query.filter(Inspeccion.resultado_id == resultado_id)
+        
+        return query
+    
+    @staticmethod
+    def _paginar(query, limite: int, cursor: Optional[tuple]) -> tuple[list, Optional[str]]:
+        """
+        Pagina por clave (fecha, id) en orden descendente (las más recientes primero).
+        
+        Devuelve las filas de la página y el cursor de la siguiente (None si no hay más).
+        """
+        if cursor:
+            query = query.filter(tuple_(Inspeccion.fecha, Inspeccion.id) < tuple_(*cursor))
+        
+        filas = query.order_by(Inspeccion.fecha.desc(), Inspeccion.id.desc()).limit(limite + 1).all()
+        
+        if len(filas) <= limite:
+            return filas, None
+        
+        filas = filas[:limite]
+        return filas, codificar_cursor(filas[-1].fecha, filas[-1].id)
+    
+    @staticmethod
+    def list_inspections_by_vehiculo(matricula: str, user_id: int = None, user_role: str = None,
+                                     limite: int = LIMITE_POR_DEFECTO, cursor: Optional[tuple] = None,
+                                     filtros: Optional[dict] = None) -> tuple[list, Optional[str]]:
+        """
+        Lista las inspecciones de un vehículo por matrícula, filtradas y paginadas por (fecha, id).
         
         Validaciones de autorización:
         - ADMIN e INSPECTOR pueden ver inspecciones de cualquier vehículo
@@ -166,17 +407,17 @@ class InspectionService:
             if vehiculo.duenio_id != user_id:
                 raise ValueError("No tienes permiso para ver inspecciones de este vehículo. Solo puedes ver inspecciones de tus propios vehículos")
         
-        inspecciones = Inspeccion.query.filter_by(vehiculo_id=vehiculo.id).all()
-        
-        for inspeccion in inspecciones:
-            db.session.refresh(inspeccion, ['vehiculo', 'inspector', 'resultado'])
+        query = InspectionService._query_listado().filter(Inspeccion.vehiculo_id == vehiculo.id)
+        query = InspectionService._aplicar_filtros(query, filtros)
         
-        return inspecciones
+        return InspectionService._paginar(query, limite, cursor)
     
     @staticmethod
-    def list_inspections_by_inspector(inspector_id: int, user_id: int = None, user_role: str = None) -> list[Inspeccion]:
+    def list_inspections_by_inspector(inspector_id: int, user_id: int = None, user_role: str = None,
+                                      limite: int = LIMITE_POR_DEFECTO, cursor: Optional[tuple] = None,
+                                      filtros: Optional[dict] = None) -> tuple[list, Optional[str]]:
         """
-        Lista todas las inspecciones realizadas por un inspector.
+        Lista las inspecciones realizadas por un inspector, filtradas y paginadas por (fecha, id).
         
         Validaciones de autorización:
         - ADMIN puede ver inspecciones de cualquier inspector
@@ -188,26 +429,21 @@ class InspectionService:
             if inspector_id != user_id:
                 raise ValueError("No tienes permiso para ver inspecciones de otro inspector. Solo puedes ver tus propias inspecciones")
         
-        inspector = Usuario.query.filter_by(id=inspector_id).first()
+        inspector = db.session.query(Usuario.id).filter(Usuario.id == inspector_id).first()
         if not inspector:
             raise ValueError(f"Inspector con ID {inspector_id} no encontrado")
         
-        inspecciones = Inspeccion.query.filter_by(inspector_id=inspector_id).all()
+        query = InspectionService._query_listado().filter(Inspeccion.inspector_id == inspector_id)
+        query = InspectionService._aplicar_filtros(query, filtros)
         
-        for inspeccion in inspecciones:
-            db.session.refresh(inspeccion, ['vehiculo', 'inspector', 'resultado'])
-        
-        return inspecciones
+        return InspectionService._paginar(query, limite, cursor)
     
     @staticmethod
-    def list_all_inspections() -> list[Inspeccion]:
+    def list_all_inspections(limite: int = LIMITE_POR_DEFECTO, cursor: Optional[tuple] = None,
+                             filtros: Optional[dict] = None) -> tuple[list, Optional[str]]:
         """
-        Lista todas las inspecciones del sistema.
+        Lista las inspecciones del sistema, filtradas y paginadas por (fecha, id).
         """
-        inspecciones = Inspeccion.query.all()
-        
-        for inspeccion in inspecciones:
-            db.session.refresh(inspeccion, ['vehiculo', 'inspector', 'resultado'])
+        query = InspectionService._aplicar_filtros(InspectionService._query_listado(), filtros)
         
-        return inspecciones
-
+        return InspectionService._paginar(query, limite, cursor)
@@ -0,0 +1,98 @@
+from src import db
+from src.models import UltimaInspeccion, Inspeccion, Vehiculo, ResultadoInspeccion
+from src.utils.db_utils import upsert
+from sqlalchemy import delete, insert, select, func
+from datetime import datetime
+
+
+class LatestInspectionService:
+    """
+    Última inspección de cada vehículo (tabla ultima_inspeccion). Se mantiene con un
+    upsert en la misma transacción que registra la inspección, de modo que "¿cuál fue
+    el último resultado de este vehículo?" se responde con una lectura por clave.
+    """
+
+    @staticmethod
+    def registrar(vehiculo_id: int, inspeccion_id: int, fecha: datetime,
+                  resultado_id: int, puntuacion_total: int) -> None:
+        """
+        Guarda la inspección como la última del vehículo, salvo que ya haya una más reciente.
+        No hace commit: forma parte de la transacción del llamador.
+        """
+        upsert(UltimaInspeccion, [{
+            "vehiculo_id": vehiculo_id,
+            "inspeccion_id": inspeccion_id,
+            "fecha": fecha,
+            "resultado_id": resultado_id,
+            "puntuacion_total": puntuacion_total
+        }], claves=["vehiculo_id"], orden="fecha")
+
+    @staticmethod
+    def obtener_por_matricula(matricula: str, user_id: int = None, user_role: str = None) -> dict | None:
+        """
+        Devuelve la última inspección del vehículo, o None si todavía no tiene ninguna.
+        
+        Validaciones de autorización:
+        - ADMIN e INSPECTOR pueden consultar cualquier vehículo
+        - DUENIO solo puede consultar sus propios vehículos
+        """
+        fila = (db.session.query(
+                    Vehiculo.duenio_id,
+                    UltimaInspeccion.inspeccion_id,
+                    UltimaInspeccion.fecha,
+                    UltimaInspeccion.puntuacion_total,
+                    ResultadoInspeccion.nombre.label("resultado"))
+                .select_from(Vehiculo)
+                .outerjoin(UltimaInspeccion, UltimaInspeccion.vehiculo_id == Vehiculo.id)
+                .outerjoin(ResultadoInspeccion, UltimaInspeccion.resultado_id == ResultadoInspeccion.id)
+                .filter(Vehiculo.matricula == matricula)
+                .first())
+        if not fila:
+            raise ValueError(f"Vehículo con matrícula {matricula} no encontrado")
+        
+        if user_role not in ['ADMIN', 'INSPECTOR'] and fila.duenio_id != user_id:
+            raise ValueError("No tienes permiso para ver inspecciones de este vehículo. Solo puedes ver inspecciones de tus propios vehículos")
+        
+        if fila.inspeccion_id is None:
+            return None
+        
+        return {
+            "inspeccion_id": fila.inspeccion_id,
+            "fecha": fila.fecha,
+            "resultado": fila.resultado,
+            "puntuacion_total": fila.puntuacion_total
+        }
+
+    @staticmethod
+    def reconstruir() -> int:
+        """
+        Regenera la tabla completa a partir del historial de inspecciones (la más
+        reciente por fecha de cada vehículo; ante empate, la de mayor id). Sirve para
+        la carga inicial y luego de correcciones manuales de datos.
+        
+        Returns:
+            int: Cantidad de vehículos con última inspección
+        """
+        ranking = select(
+            Inspeccion.vehiculo_id,
+            Inspeccion.id,
+            Inspeccion.fecha,
+            Inspeccion.resultado_id,
+            Inspeccion.puntuacion_total,
+            func.row_number().over(
+                partition_by=Inspeccion.vehiculo_id,
+                order_by=(Inspeccion.fecha.desc(), Inspeccion.id.desc())
+            ).label("orden")
+        ).subquery()
+        
+        ultimas = select(
+            ranking.c.vehiculo_id, ranking.c.id, ranking.c.fecha, ranking.c.resultado_id, ranking.c.puntuacion_total
+        ).where(ranking.c.orden == 1)
+        
+        db.session.execute(delete(UltimaInspeccion))
+        db.session.execute(insert(UltimaInspeccion).from_select(
+            ["vehiculo_id", "inspeccion_id", "fecha", "resultado_id", "puntuacion_total"], ultimas
+        ))
+        db.session.commit()
+        
+        return db.session.query(func.count(UltimaInspeccion.vehiculo_id)).scalar()
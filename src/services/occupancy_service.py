@@ -0,0 +1,85 @@
+from src import db
+from src.models import OcupacionSlot, Turno
+from src.services.version_service import VersionService
+from src.utils.cache_utils import obtener_cache_disponibilidad
+from src.utils.db_utils import incrementar_hasta
+from sqlalchemy import update, delete, insert, select, func
+from datetime import datetime
+
+
+class OccupancyService:
+    """
+    Calendario materializado de ocupación: una fila por slot con la cantidad de turnos
+    activos (RESERVADO o CONFIRMADO). Se mantiene en la misma transacción que las
+    escrituras de turnos, de modo que la consulta de disponibilidad es una lectura pura.
+    """
+
+    @staticmethod
+    def reservar(fecha: datetime, capacidad: int = 1) -> bool:
+        """
+        Ocupa un lugar del slot de forma atómica. No hace commit: forma parte de la
+        transacción del llamador.
+        
+        Es una única sentencia que inserta la fila del slot o, si ya existe, suma un turno
+        solo mientras `ocupados < capacidad`: la condición se evalúa con la fila bloqueada
+        en la base, así que dos transacciones concurrentes (de cualquier worker o nodo) no
+        pueden superar la capacidad. Al no leer antes la fila ni insertarla en un paso
+        aparte, dos primeras reservas simultáneas del mismo slot no toman bloqueos de
+        rango cruzados en InnoDB (que terminarían en un deadlock).
+        
+        Returns:
+            bool: True si se pudo ocupar el slot, False si no tiene lugar
+        """
+        if capacidad < 1:
+            return False
+        
+        return incrementar_hasta(OcupacionSlot, {"fecha": fecha}, "ocupados", capacidad)
+
+    @staticmethod
+    def decrementar(fecha: datetime) -> None:
+        """
+        Libera un turno activo del slot. No hace commit: forma parte de la transacción del llamador.
+        """
+        db.session.execute(
+            update(OcupacionSlot)
+            .where(OcupacionSlot.fecha == fecha, OcupacionSlot.ocupados > 0)
+            .values(ocupados=OcupacionSlot.ocupados - 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def obtener_ocupacion(desde: datetime, hasta: datetime) -> dict[datetime, int]:
+        """
+        Devuelve la cantidad de turnos activos por slot dentro del rango [desde, hasta).
+        Solo incluye los slots con al menos un turno.
+        """
+        filas = db.session.query(OcupacionSlot.fecha, OcupacionSlot.ocupados).filter(
+            OcupacionSlot.fecha >= desde,
+            OcupacionSlot.fecha < hasta,
+            OcupacionSlot.ocupados > 0
+        ).all()
+        
+        return {fila.fecha: fila.ocupados for fila in filas}
+
+    @staticmethod
+    def reconstruir() -> int:
+        """
+        Regenera el calendario completo a partir de la tabla turno.
+        Útil luego de migraciones o correcciones manuales de datos.
+        
+        Returns:
+            int: Cantidad de slots ocupados regenerados
+        """
+        db.session.execute(delete(OcupacionSlot))
+        
+        conteo = (
+            select(Turno.fecha, func.count(Turno.id))
+            .where(Turno.estado_id.in_([1, 2]))  # RESERVADO=1 o CONFIRMADO=2
+            .group_by(Turno.fecha)
+        )
+        db.session.execute(insert(OcupacionSlot).from_select(["fecha", "ocupados"], conteo))
+        db.session.commit()
+        VersionService.incrementar("turno")
+        obtener_cache_disponibilidad().clear()
+        
+        return db.session.query(func.count(OcupacionSlot.id)).scalar()
@@ -0,0 +1,163 @@
+from src import db
+from src.models import EstadisticaDiaria, Inspeccion, Vehiculo, Usuario, ResultadoInspeccion
+from src.services.catalog_service import CatalogService
+from src.utils.db_utils import upsert
+from sqlalchemy import delete, insert, select, func, case
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+
+class StatsService:
+    """
+    Estadísticas de la planta a partir de la tabla estadistica_diaria: una fila por día,
+    inspector, año del vehículo y resultado con la cantidad de inspecciones y la suma de
+    sus puntuaciones. Cada inspección la actualiza con un upsert incremental, por lo que
+    las consultas solo agregan estas filas y nunca recorren inspeccion ni chequeo.
+    """
+
+    @staticmethod
+    def registrar(dia: date, inspector_id: int, anio_vehiculo: int, resultado_id: int,
+                  puntuacion_total: int) -> None:
+        """
+        Suma una inspección al acumulado de su día. No hace commit: forma parte de la
+        transacción del llamador.
+        """
+        upsert(EstadisticaDiaria, [{
+            "fecha": dia,
+            "inspector_id": inspector_id,
+            "anio_vehiculo": anio_vehiculo,
+            "resultado_id": resultado_id,
+            "cantidad": 1,
+            "puntuacion_suma": puntuacion_total
+        }], claves=["fecha", "inspector_id", "anio_vehiculo", "resultado_id"],
+            sumar=("cantidad", "puntuacion_suma"))
+
+    @staticmethod
+    def reconstruir(desde: Optional[date] = None, hasta: Optional[date] = None) -> int:
+        """
+        Recalcula los acumulados de los días entre `desde` y `hasta` (inclusive; sin
+        límites, todo el historial) a partir de las inspecciones. Útil para la carga
+        inicial y luego de correcciones manuales de datos. Las inspecciones sin inspector
+        o sin resultado no se contabilizan.
+        
+        Returns:
+            int: Cantidad de inspecciones contabilizadas en el rango
+        """
+        if desde and hasta and desde > hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a la fecha 'hasta'")
+        
+        borrado = delete(EstadisticaDiaria)
+        dia = func.date(Inspeccion.fecha)
+        agregado = (
+            select(
+                dia,
+                Inspeccion.inspector_id,
+                Vehiculo.anio,
+                Inspeccion.resultado_id,
+                func.count(Inspeccion.id),
+                func.coalesce(func.sum(Inspeccion.puntuacion_total), 0)
+            )
+            .join(Vehiculo, Inspeccion.vehiculo_id == Vehiculo.id)
+            .where(Inspeccion.inspector_id.isnot(None), Inspeccion.resultado_id.isnot(None))
+            .group_by(dia, Inspeccion.inspector_id, Vehiculo.anio, Inspeccion.resultado_id)
+        )
+        # Rango semiabierto sobre Inspeccion.fecha para usar su índice
+        if desde:
+            borrado = borrado.where(EstadisticaDiaria.fecha >= desde)
+            agregado = agregado.where(Inspeccion.fecha >= datetime.combine(desde, datetime.min.time()))
+        if hasta:
+            borrado = borrado.where(EstadisticaDiaria.fecha <= hasta)
+            agregado = agregado.where(Inspeccion.fecha < datetime.combine(hasta + timedelta(days=1), datetime.min.time()))
+        
+        db.session.execute(borrado)
+        db.session.execute(insert(EstadisticaDiaria).from_select(
+            ["fecha", "inspector_id", "anio_vehiculo", "resultado_id", "cantidad", "puntuacion_suma"], agregado
+        ))
+        db.session.commit()
+        
+        contabilizadas = db.session.query(func.coalesce(func.sum(EstadisticaDiaria.cantidad), 0))
+        if desde:
+            contabilizadas = contabilizadas.filter(EstadisticaDiaria.fecha >= desde)
+        if hasta:
+            contabilizadas = contabilizadas.filter(EstadisticaDiaria.fecha <= hasta)
+        return contabilizadas.scalar()
+
+    @staticmethod
+    def _metricas():
+        """
+        Columnas agregadas comunes a todos los cortes: total, seguras, rechequeos y suma de puntuaciones.
+        """
+        seguro_id = CatalogService.obtener_id(ResultadoInspeccion, 'SEGURO')
+        rechequear_id = CatalogService.obtener_id(ResultadoInspeccion, 'RECHEQUEAR')
+        return (
+            func.sum(EstadisticaDiaria.cantidad).label("inspecciones"),
+            func.sum(case((EstadisticaDiaria.resultado_id == seguro_id, EstadisticaDiaria.cantidad),
+                          else_=0)).label("seguras"),
+            func.sum(case((EstadisticaDiaria.resultado_id == rechequear_id, EstadisticaDiaria.cantidad),
+                          else_=0)).label("rechequeos"),
+            func.sum(EstadisticaDiaria.puntuacion_suma).label("puntuacion_suma")
+        )
+
+    @staticmethod
+    def _resumen(fila) -> dict:
+        """
+        Convierte los agregados de una fila en cantidades, tasas y promedio.
+        """
+        inspecciones = int(fila.inspecciones or 0)
+        seguras = int(fila.seguras or 0)
+        rechequeos = int(fila.rechequeos or 0)
+        return {
+            "inspecciones": inspecciones,
+            "seguras": seguras,
+            "rechequeos": rechequeos,
+            "tasa_aprobacion": round(seguras / inspecciones, 4) if inspecciones else None,
+            "tasa_rechequeo": round(rechequeos / inspecciones, 4) if inspecciones else None,
+            "puntuacion_promedio": round(int(fila.puntuacion_suma) / inspecciones, 2) if inspecciones else None
+        }
+
+    @staticmethod
+    def obtener(desde: date, hasta: date) -> dict:
+        """
+        Estadísticas de las inspecciones entre `desde` y `hasta` (inclusive): totales y
+        cortes por día, por inspector y por año del vehículo.
+        """
+        if desde > hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a la fecha 'hasta'")
+        
+        metricas = StatsService._metricas()
+        en_rango = (EstadisticaDiaria.fecha >= desde, EstadisticaDiaria.fecha <= hasta)
+        
+        totales = db.session.query(*metricas).filter(*en_rango).one()
+        
+        por_dia = (db.session.query(EstadisticaDiaria.fecha, *metricas)
+                   .filter(*en_rango)
+                   .group_by(EstadisticaDiaria.fecha)
+                   .order_by(EstadisticaDiaria.fecha)
+                   .all())
+        
+        por_inspector = (db.session.query(EstadisticaDiaria.inspector_id,
+                                          Usuario.nombre_completo.label("inspector_nombre"),
+                                          *metricas)
+                         .outerjoin(Usuario, EstadisticaDiaria.inspector_id == Usuario.id)
+                         .filter(*en_rango)
+                         .group_by(EstadisticaDiaria.inspector_id, Usuario.nombre_completo)
+                         .order_by(EstadisticaDiaria.inspector_id)
+                         .all())
+        
+        por_anio = (db.session.query(EstadisticaDiaria.anio_vehiculo, *metricas)
+                    .filter(*en_rango)
+                    .group_by(EstadisticaDiaria.anio_vehiculo)
+                    .order_by(EstadisticaDiaria.anio_vehiculo)
+                    .all())
+        
+        return {
+            "desde": desde.strftime('%Y-%m-%d'),
+            "hasta": hasta.strftime('%Y-%m-%d'),
+            "totales": StatsService._resumen(totales),
+            "por_dia": [{"fecha": fila.fecha.strftime('%Y-%m-%d'), **StatsService._resumen(fila)}
+                        for fila in por_dia],
+            "por_inspector": [{"inspector_id": fila.inspector_id, "inspector_nombre": fila.inspector_nombre,
+                               **StatsService._resumen(fila)} for fila in por_inspector],
+            "por_anio_vehiculo": [{"anio_vehiculo": fila.anio_vehiculo, **StatsService._resumen(fila)}
+                                  for fila in por_anio]
+        }
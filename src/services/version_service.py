@@ -0,0 +1,54 @@
+from src import db
+from src.models import ContadorVersion
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+
+class VersionService:
+    """
+    Contadores de versión por tabla, compartidos por todos los workers y nodos a
+    través de la base. Permiten derivar ETags sin recalcular las respuestas.
+    """
+
+    @staticmethod
+    def incrementar(nombre: str) -> None:
+        """
+        Incrementa el contador en una transacción propia y breve, con su commit.
+        
+        Se llama después de confirmar la escritura que cambia los datos, no dentro de
+        ella: así la fila del contador queda bloqueada solo lo que dura este UPDATE y no
+        serializa todas las transacciones de escritura. Como los lectores leen la versión
+        antes que los datos, en el intervalo entre ambos commits a lo sumo se asocian
+        datos nuevos a la versión anterior, nunca datos viejos a la versión nueva.
+        """
+        resultado = db.session.execute(
+            update(ContadorVersion)
+            .where(ContadorVersion.nombre == nombre)
+            .values(valor=ContadorVersion.valor + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 1:
+            db.session.commit()
+            return
+        
+        try:
+            with db.session.begin_nested():
+                db.session.add(ContadorVersion(nombre=nombre, valor=1))
+        except IntegrityError:
+            # Otra transacción creó el contador en paralelo
+            VersionService.incrementar(nombre)
+            return
+        db.session.commit()
+
+    @staticmethod
+    def obtener(*nombres: str) -> dict[str, int]:
+        """
+        Lee varios contadores en una sola consulta. Los que aún no existen valen 0.
+        """
+        filas = db.session.query(ContadorVersion.nombre, ContadorVersion.valor).filter(
+            ContadorVersion.nombre.in_(nombres)
+        ).all()
+        
+        versiones = {nombre: 0 for nombre in nombres}
+        versiones.update({fila.nombre: fila.valor for fila in filas})
+        return versiones
@@ -1,11 +1,49 @@
 import pytest
 import os
+import base64
+import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from sqlalchemy import event
 from src import create_app, db
-from src.models import Usuario, UsuarioRol, Vehiculo, EstadoVehiculo, Turno, EstadoTurno
+from src.models import Usuario, UsuarioRol, Vehiculo, EstadoVehiculo, Turno, EstadoTurno, Cierre, Inspeccion, ResultadoInspeccion, OcupacionSlot
+from src.services.occupancy_service import OccupancyService
+from src.services.booking_service import HORARIO_CONFIG
+from src.services.closure_service import ClosureService
+from src.services.version_service import VersionService
+from src.utils.cache_utils import TTLCache
+from src.utils.interval_utils import IndiceIntervalos
 from src.utils.hash_utils import hash_password
 
 
+def crear_datos_base():
+    """Carga los catálogos (roles y estados) que la aplicación espera en la base"""
+    # Crear roles necesarios
+    if not UsuarioRol.query.all():
+        admin_rol = UsuarioRol(nombre='ADMIN')
+        inspector_rol = UsuarioRol(nombre='INSPECTOR')
+        duenio_rol = UsuarioRol(nombre='DUENIO')
+        db.session.add_all([admin_rol, inspector_rol, duenio_rol])
+        db.session.commit()
+    
+    # Crear estados de vehículo
+    if not EstadoVehiculo.query.all():
+        activo = EstadoVehiculo(nombre='ACTIVO')
+        inactivo = EstadoVehiculo(nombre='INACTIVO')
+        db.session.add_all([activo, inactivo])
+        db.session.commit()
+    
+    # Crear estados de turno
+    if not EstadoTurno.query.all():
+        reservado = EstadoTurno(nombre='RESERVADO')
+        confirmado = EstadoTurno(nombre='CONFIRMADO')
+        completado = EstadoTurno(nombre='COMPLETADO')
+        cancelado = EstadoTurno(nombre='CANCELADO')
+        db.session.add_all([reservado, confirmado, completado, cancelado])
+        db.session.commit()
+
+
 @pytest.fixture
 def app():
     """Crea y configura la aplicación para testing"""
@@ -21,30 +59,7 @@ def app():
     
     with app.app_context():
         db.create_all()
-        
-        # Crear roles necesarios
-        if not UsuarioRol.query.all():
-            admin_rol = UsuarioRol(nombre='ADMIN')
-            inspector_rol = UsuarioRol(nombre='INSPECTOR')
-            duenio_rol = UsuarioRol(nombre='DUENIO')
-            db.session.add_all([admin_rol, inspector_rol, duenio_rol])
-            db.session.commit()
-        
-        # Crear estados de vehículo
-        if not EstadoVehiculo.query.all():
-            activo = EstadoVehiculo(nombre='ACTIVO')
-            inactivo = EstadoVehiculo(nombre='INACTIVO')
-            db.session.add_all([activo, inactivo])
-            db.session.commit()
-        
-        # Crear estados de turno
-        if not EstadoTurno.query.all():
-            reservado = EstadoTurno(nombre='RESERVADO')
-            confirmado = EstadoTurno(nombre='CONFIRMADO')
-            completado = EstadoTurno(nombre='COMPLETADO')
-            cancelado = EstadoTurno(nombre='CANCELADO')
-            db.session.add_all([reservado, confirmado, completado, cancelado])
-            db.session.commit()
+        crear_datos_base()
         
         yield app
         
@@ -62,6 +77,34 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture
+def app_concurrente(tmp_path):
+    """
+    Aplicación sobre una base SQLite en archivo: a diferencia de la base en memoria,
+    cada hilo usa su propia conexión, por lo que las transacciones compiten de verdad.
+    """
+    original_db_uri = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmp_path / 'concurrencia.db'}"
+    
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        crear_datos_base()
+    
+    yield app
+    
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    
+    if original_db_uri:
+        os.environ['DATABASE_URL'] = original_db_uri
+    else:
+        os.environ.pop('DATABASE_URL', None)
+
+
 def get_auth_token(client, app, mail="test_booking@example.com", password="password123", role="DUENIO"):
     """
     Helper function para obtener un token JWT creando y haciendo login con un usuario.
@@ -95,6 +138,26 @@ def get_auth_token(client, app, mail="test_booking@example.com", password="passw
         return response.get_json()['token']
 
 
+@contextmanager
+def contar_consultas():
+    """
+    Helper para contar las sentencias SQL ejecutadas dentro del bloque.
+    
+    Returns:
+        list: Sentencias ejecutadas (se completa al salir del bloque)
+    """
+    sentencias = []
+    
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+    
+    event.listen(db.engine, "before_cursor_execute", registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(db.engine, "before_cursor_execute", registrar)
+
+
 @pytest.fixture
 def setup_data(app):
     """Crea datos de prueba (usuarios y vehículos)"""
@@ -245,6 +308,597 @@ def test_consultar_disponibilidad_sin_body(client, app):
         assert 'total_disponibles' in response_data
 
 
+def test_consultar_disponibilidad_marca_slot_ocupado(client, app, setup_data):
+    """Test: Un slot reservado aparece como no disponible y se libera al cancelar el turno"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=10, minute=0, second=0, microsecond=0)
+        
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        turno_id = response.get_json()['id']
+        
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_monday.strftime('%Y-%m-%d')
+        }
+        
+        response = client.post('/api/bookings/availability', json=data, headers=headers)
+        
+        assert response.status_code == 200
+        slots = {slot['fecha']: slot['disponible'] for slot in response.get_json()['slots']}
+        assert slots[fecha_turno.strftime('%Y-%m-%d %H:%M')] is False
+        assert slots[fecha_turno.replace(hour=11).strftime('%Y-%m-%d %H:%M')] is True
+        
+        # Cancelar el turno libera el slot
+        client.put(f'/api/bookings/{turno_id}', json={"estado_id": 4}, headers=headers)
+        
+        response = client.post('/api/bookings/availability', json=data, headers=headers)
+        slots = {slot['fecha']: slot['disponible'] for slot in response.get_json()['slots']}
+        assert slots[fecha_turno.strftime('%Y-%m-%d %H:%M')] is True
+
+
+def test_reconstruir_ocupacion_desde_turnos(client, app, setup_data):
+    """Test: El comando de reconstrucción regenera el calendario a partir de la tabla turno"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=12, minute=0, second=0, microsecond=0)
+        
+        # Turno insertado directamente en la tabla (corrección manual de datos)
+        estado_confirmado = EstadoTurno.query.filter_by(nombre='CONFIRMADO').first()
+        db.session.add(Turno(
+            vehiculo_id=setup_data["vehiculo_id"],
+            fecha=fecha_turno,
+            estado_id=estado_confirmado.id,
+            creado_por=setup_data["usuario_id"]
+        ))
+        db.session.commit()
+        
+        result = app.test_cli_runner().invoke(args=["reconstruir-ocupacion"])
+        
+        assert result.exit_code == 0
+        assert "1 slots ocupados" in result.output
+        assert OccupancyService.obtener_ocupacion(fecha_turno, fecha_turno + timedelta(hours=1)) == {fecha_turno: 1}
+        
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_monday.strftime('%Y-%m-%d')
+        }
+        response = client.post('/api/bookings/availability', json=data, headers=headers)
+        slots = {slot['fecha']: slot['disponible'] for slot in response.get_json()['slots']}
+        assert slots[fecha_turno.strftime('%Y-%m-%d %H:%M')] is False
+
+
+def test_consultar_disponibilidad_cantidad_consultas_constante(client, app, setup_data):
+    """Test: La cantidad de consultas SQL no crece con el rango de fechas consultado"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        inicio = datetime.now() + timedelta(days=1)
+        # Primer pedido: compila el índice de cierres del proceso
+        client.post('/api/bookings/availability', json={}, headers=headers)
+        
+        cantidades = []
+        for dias in (7, 30, 90):
+            data = {
+                "fecha_inicio": inicio.strftime('%Y-%m-%d'),
+                "fecha_final": (inicio + timedelta(days=dias)).strftime('%Y-%m-%d')
+            }
+            with contar_consultas() as sentencias:
+                response = client.post('/api/bookings/availability', json=data, headers=headers)
+            
+            assert response.status_code == 200
+            cantidades.append(len(sentencias))
+        
+        assert cantidades[0] == cantidades[1] == cantidades[2]
+        assert cantidades[0] <= 2
+
+
+def test_consultar_disponibilidad_cache_hit_e_invalidacion(client, app, setup_data):
+    """Test: La disponibilidad se cachea por rango y se invalida al reservar un turno del rango"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin_cache@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=15, minute=0, second=0, microsecond=0)
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": (next_monday + timedelta(days=4)).strftime('%Y-%m-%d')
+        }
+        
+        client.post('/api/bookings/availability', json=data, headers=headers)
+        with contar_consultas() as sentencias:
+            response = client.post('/api/bookings/availability', json=data, headers=headers)
+        
+        # El segundo pedido se responde desde la cache: solo se leen los contadores de versión
+        assert response.status_code == 200
+        assert len(sentencias) == 1
+        total_inicial = response.get_json()['total_disponibles']
+        
+        stats = client.get('/api/bookings/availability/cache', headers=headers).get_json()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entradas'] == 1
+        
+        client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        response = client.post('/api/bookings/availability', json=data, headers=headers)
+        assert response.get_json()['total_disponibles'] == total_inicial - 1
+        
+        stats = client.get('/api/bookings/availability/cache', headers=headers).get_json()
+        assert stats['invalidaciones'] == 1
+        assert stats['misses'] == 2
+
+
+def test_cache_disponibilidad_no_sirve_cuerpos_de_otra_version(client, app, setup_data):
+    """Test: Una reserva hecha por otro worker (sin invalidar esta cache) cambia el ETag y también el cuerpo"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=11, minute=0, second=0, microsecond=0)
+        params = f"fecha_inicio={next_monday.strftime('%Y-%m-%d')}&fecha_final={next_monday.strftime('%Y-%m-%d')}"
+        
+        response = client.get(f'/api/bookings/availability?{params}', headers=headers)
+        etag = response.headers['ETag']
+        assert response.get_json()['total_disponibles'] == 11
+        
+        # Lo que haría otro worker: reserva el slot sin tocar la cache de este proceso
+        app.extensions['disponibilidad_cache'], cache_local = TTLCache(), app.extensions['disponibilidad_cache']
+        client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        app.extensions['disponibilidad_cache'] = cache_local
+        
+        response = client.get(f'/api/bookings/availability?{params}', headers=headers)
+        assert response.headers['ETag'] != etag
+        assert response.get_json()['total_disponibles'] == 10
+
+
+def test_cache_disponibilidad_estadisticas_solo_admin(client, app):
+    """Test: Las estadísticas de la cache requieren rol ADMIN"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.get('/api/bookings/availability/cache', headers=headers)
+        
+        assert response.status_code == 403
+
+
+def test_consultar_disponibilidad_formato_compacto(client, app, setup_data):
+    """Test: El formato compacto codifica por día la misma disponibilidad que el formato completo"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=10, minute=0, second=0, microsecond=0)
+        client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": (next_monday + timedelta(days=6)).strftime('%Y-%m-%d')
+        }
+        completo = client.post('/api/bookings/availability', json=data, headers=headers).get_json()
+        response = client.post('/api/bookings/availability?formato=compacto', json=data, headers=headers)
+        
+        assert response.status_code == 200
+        compacto = response.get_json()
+        assert 'slots' not in compacto
+        assert len(compacto['dias']) == 5  # Lunes a viernes
+        assert compacto['total_disponibles'] == completo['total_disponibles']
+        
+        lunes = compacto['dias'][0]
+        assert lunes['fecha'] == next_monday.strftime('%Y-%m-%d')
+        assert lunes['hora_inicio'] == "09:00"
+        assert lunes['duracion_minutos'] == 60
+        bits = int.from_bytes(base64.b64decode(lunes['disponibles']), 'little')
+        assert [bool(bits >> i & 1) for i in range(lunes['cantidad_slots'])] == [
+            slot['disponible'] for slot in completo['slots'][:lunes['cantidad_slots']]
+        ]
+        assert not bits >> 1 & 1  # Slot de las 10:00 ocupado
+        
+        # También se puede pedir mediante el header Accept
+        headers_accept = dict(headers, Accept='application/vnd.disponibilidad-compacta+json')
+        response = client.post('/api/bookings/availability', json=data, headers=headers_accept)
+        assert response.get_json() == compacto
+
+
+def test_consultar_disponibilidad_compacta_con_cierre_parcial(client, app):
+    """Test: Con un cierre parcial el bitset compacto conserva la grilla completa y marca en 0 los slots cerrados"""
+    with app.app_context():
+        admin_token = get_auth_token(client, app, mail="admin@example.com", role="ADMIN")
+        admin_headers = {'Authorization': f'Bearer {admin_token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        response = client.post('/api/bookings/closures', json={
+            "fecha": next_monday.strftime('%Y-%m-%d'),
+            "hora_desde": "12:00",
+            "hora_hasta": "14:00",
+            "motivo": "Mantenimiento de la línea"
+        }, headers=admin_headers)
+        assert response.status_code == 201
+        
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_monday.strftime('%Y-%m-%d')
+        }
+        response = client.post('/api/bookings/availability?formato=compacto', json=data, headers=admin_headers)
+        
+        assert response.status_code == 200
+        lunes = response.get_json()['dias'][0]
+        assert lunes['hora_inicio'] == "09:00"
+        assert lunes['cantidad_slots'] == 11
+        assert lunes['total_disponibles'] == 9
+        bits = int.from_bytes(base64.b64decode(lunes['disponibles']), 'little')
+        # Slots de 09:00 a 19:00: cerrados los de las 12:00 y 13:00 (índices 3 y 4)
+        assert [bool(bits >> i & 1) for i in range(11)] == [i not in (3, 4) for i in range(11)]
+
+
+def test_consultar_disponibilidad_formato_invalido(client, app):
+    """Test: Consultar disponibilidad falla con un formato desconocido"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.post('/api/bookings/availability?formato=xml', json={}, headers=headers)
+        
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+
+def test_buscar_proximos_disponibles_omite_ocupados(client, app, setup_data):
+    """Test: La búsqueda de próximos slots saltea los ocupados y resuelve con una sola consulta"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=9, minute=0, second=0, microsecond=0)
+        client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        data = {
+            "desde": next_monday.replace(hour=8, minute=0).strftime('%Y-%m-%d %H:%M'),
+            "cantidad": 3
+        }
+        with contar_consultas() as sentencias:
+            response = client.post('/api/bookings/availability/next', json=data, headers=headers)
+        
+        assert response.status_code == 200
+        response_data = response.get_json()
+        assert response_data['total'] == 3
+        assert [slot['fecha'] for slot in response_data['slots']] == [
+            fecha_turno.replace(hour=hora).strftime('%Y-%m-%d %H:%M') for hora in (10, 11, 12)
+        ]
+        # Versión de cierres (validez del índice en memoria) y ocupación de la ventana
+        assert len(sentencias) == 2
+
+
+def test_buscar_proximos_disponibles_respeta_el_horizonte_en_dias(client, app, monkeypatch):
+    """Test: El horizonte de búsqueda cubre días calendario completos, sin depender de la hora de partida"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        monkeypatch.setitem(HORARIO_CONFIG, "dias_busqueda_maximo", 2)
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = (today + timedelta(days=days_ahead)).replace(hour=18, minute=30, second=0, microsecond=0)
+        
+        response = client.post('/api/bookings/availability/next', json={
+            "desde": next_monday.strftime('%Y-%m-%d %H:%M'),
+            "cantidad": 50
+        }, headers=headers)
+        
+        assert response.status_code == 200
+        fechas = [datetime.strptime(slot['fecha'], '%Y-%m-%d %H:%M') for slot in response.get_json()['slots']]
+        # Lunes desde las 19:00 y el martes completo; el miércoles queda fuera del horizonte
+        assert {fecha.date() for fecha in fechas} == {next_monday.date(), next_monday.date() + timedelta(days=1)}
+        assert fechas[0] == next_monday.replace(hour=19, minute=0)
+        assert len(fechas) == 1 + 11
+
+
+def test_buscar_proximos_disponibles_con_preferencias(client, app):
+    """Test: La búsqueda respeta los días de la semana y horas preferidos"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        data = {"cantidad": 4, "dias_semana": [2], "horas": [15]}  # Miércoles a las 15:00
+        
+        response = client.post('/api/bookings/availability/next', json=data, headers=headers)
+        
+        assert response.status_code == 200
+        fechas = [datetime.strptime(slot['fecha'], '%Y-%m-%d %H:%M') for slot in response.get_json()['slots']]
+        assert len(fechas) == 4
+        assert all(fecha.weekday() == 2 and fecha.hour == 15 for fecha in fechas)
+        assert fechas == sorted(fechas)
+        assert all(fecha > datetime.now() for fecha in fechas)
+
+
+def test_buscar_proximos_disponibles_preferencias_invalidas(client, app):
+    """Test: La búsqueda falla con días de la semana fuera de rango"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.post('/api/bookings/availability/next', json={"dias_semana": [7]}, headers=headers)
+        
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+
+def test_cierres_excluyen_slots_y_rechazan_reservas(client, app, setup_data):
+    """Test: Un feriado y un cierre parcial quitan slots de la disponibilidad y bloquean reservas"""
+    with app.app_context():
+        admin_token = get_auth_token(client, app, mail="admin@example.com", role="ADMIN")
+        admin_headers = {'Authorization': f'Bearer {admin_token}'}
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        next_tuesday = next_monday + timedelta(days=1)
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_tuesday.strftime('%Y-%m-%d')
+        }
+        
+        # Cachear la disponibilidad antes de registrar los cierres
+        client.post('/api/bookings/availability', json=data, headers=headers)
+        
+        response = client.post('/api/bookings/closures', json={
+            "fecha": next_monday.strftime('%Y-%m-%d'),
+            "motivo": "Feriado nacional"
+        }, headers=admin_headers)
+        assert response.status_code == 201
+        
+        response = client.post('/api/bookings/closures', json={
+            "fecha": next_tuesday.strftime('%Y-%m-%d'),
+            "hora_desde": "14:00",
+            "hora_hasta": "16:00",
+            "motivo": "Mantenimiento de líneas"
+        }, headers=admin_headers)
+        assert response.status_code == 201
+        assert response.get_json()['hora_desde'] == "14:00"
+        
+        slots = client.post('/api/bookings/availability', json=data, headers=headers).get_json()['slots']
+        fechas = [slot['fecha'] for slot in slots]
+        
+        assert not any(fecha.startswith(next_monday.strftime('%Y-%m-%d')) for fecha in fechas)
+        assert len(fechas) == 9  # 11 slots del martes menos 14:00 y 15:00
+        assert next_tuesday.replace(hour=14, minute=0).strftime('%Y-%m-%d %H:%M') not in fechas
+        assert next_tuesday.replace(hour=16, minute=0).strftime('%Y-%m-%d %H:%M') in fechas
+        
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": next_tuesday.replace(hour=15, minute=0).strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        assert response.status_code == 400
+        assert "cerrada" in response.get_json()['error']
+
+
+def test_recargar_cierres_sin_reiniciar(client, app):
+    """Test: Los cierres cargados directamente en la base se aplican al recargar el índice"""
+    with app.app_context():
+        admin_token = get_auth_token(client, app, mail="admin@example.com", role="ADMIN")
+        admin_headers = {'Authorization': f'Bearer {admin_token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_monday.strftime('%Y-%m-%d')
+        }
+        
+        total_inicial = client.post('/api/bookings/availability', json=data, headers=admin_headers).get_json()['total_disponibles']
+        
+        db.session.add(Cierre(fecha=next_monday.date(), motivo="Corte de luz programado"))
+        db.session.commit()
+        
+        response = client.post('/api/bookings/closures/reload', headers=admin_headers)
+        assert response.status_code == 200
+        assert response.get_json()['intervalos'] == 1
+        
+        response = client.post('/api/bookings/availability', json=data, headers=admin_headers)
+        assert total_inicial == 11
+        assert response.get_json()['total_disponibles'] == 0
+
+
+def test_indice_de_cierres_se_recompila_al_cambiar_la_version(client, app, setup_data):
+    """Test: Un cierre registrado por otro worker se aplica al avanzar la versión, sin recargar a mano"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        ClosureService.obtener_indice()  # Índice compilado en este proceso, sin cierres
+        
+        # Lo que haría otro worker: guarda el cierre y avanza la versión, sin tocar el índice de este proceso
+        db.session.add(Cierre(fecha=next_monday.date(), motivo="Corte de luz programado"))
+        db.session.commit()
+        VersionService.incrementar("cierre")
+        
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": next_monday.replace(hour=10, minute=0).strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        assert response.status_code == 400
+        assert "cerrada" in response.get_json()['error']
+
+
+def test_cierres_solo_admin(client, app):
+    """Test: Registrar cierres requiere rol ADMIN"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.post('/api/bookings/closures', json={"fecha": "2030-01-01", "motivo": "Año nuevo"}, headers=headers)
+        
+        assert response.status_code == 403
+
+
+def test_indice_intervalos_superposicion():
+    """Test: El índice fusiona intervalos y detecta superposiciones respetando los bordes"""
+    dia = datetime(2030, 1, 7)
+    indice = IndiceIntervalos([
+        (dia.replace(hour=14), dia.replace(hour=16)),
+        (dia.replace(hour=15), dia.replace(hour=17)),  # Se fusiona con el anterior
+        (dia + timedelta(days=2), dia + timedelta(days=3))
+    ])
+    
+    assert len(indice) == 2
+    assert indice.se_superpone(dia.replace(hour=16), dia.replace(hour=17))
+    assert not indice.se_superpone(dia.replace(hour=13), dia.replace(hour=14))  # Termina justo al abrir el cierre
+    assert not indice.se_superpone(dia.replace(hour=17), dia.replace(hour=18))  # Empieza justo al terminar
+    assert indice.se_superpone(dia.replace(hour=9), dia.replace(hour=20))
+    assert indice.se_superpone(dia + timedelta(days=2, hours=10), dia + timedelta(days=2, hours=11))
+    assert not indice.se_superpone(dia + timedelta(days=1), dia + timedelta(days=2))
+    assert not IndiceIntervalos([]).se_superpone(dia, dia + timedelta(days=1))
+
+
+def test_consultar_disponibilidad_get_etag_304(client, app, setup_data):
+    """Test: La variante GET emite ETag y responde 304 sin generar slots mientras no haya cambios"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        params = f"fecha_inicio={next_monday.strftime('%Y-%m-%d')}&fecha_final={(next_monday + timedelta(days=4)).strftime('%Y-%m-%d')}"
+        
+        response = client.get(f'/api/bookings/availability?{params}', headers=headers)
+        
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert etag
+        assert len(response.get_json()['slots']) == 55
+        
+        with contar_consultas() as sentencias:
+            response = client.get(f'/api/bookings/availability?{params}', headers=dict(headers, **{'If-None-Match': etag}))
+        
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert len(sentencias) == 1  # Solo la lectura de los contadores de versión
+        
+        # Una reserva cambia la versión de turnos y con ella el ETag
+        client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": next_monday.replace(hour=10, minute=0, second=0, microsecond=0).strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        response = client.get(f'/api/bookings/availability?{params}', headers=dict(headers, **{'If-None-Match': etag}))
+        
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert response.get_json()['total_disponibles'] == 54
+
+
+def test_consultar_disponibilidad_get_etag_depende_del_formato(client, app):
+    """Test: El ETag distingue el formato completo del compacto"""
+    with app.app_context():
+        token = get_auth_token(client, app)
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        completo = client.get('/api/bookings/availability', headers=headers)
+        compacto = client.get('/api/bookings/availability?formato=compacto', headers=headers)
+        
+        assert completo.status_code == 200
+        assert compacto.status_code == 200
+        assert 'dias' in compacto.get_json()
+        assert completo.headers['ETag'] != compacto.headers['ETag']
+
+
+def test_ttl_cache_desalojo_lru_y_expiracion():
+    """Test: La cache desaloja la entrada menos usada y expira entradas vencidas"""
+    dia = datetime(2030, 1, 7).date()
+    cache = TTLCache(max_entradas=2, ttl_segundos=60)
+    
+    cache.set("a", 1, dia, dia)
+    cache.set("b", 2, dia, dia)
+    assert cache.get("a") == 1  # "b" pasa a ser la menos usada
+    cache.set("c", 3, dia, dia)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.estadisticas()['evictions'] == 1
+    
+    cache.invalidar_dia(dia + timedelta(days=1))
+    assert cache.get("c") == 3
+    cache.invalidar_dia(dia)
+    assert cache.get("c") is None
+    
+    vencida = TTLCache(max_entradas=2, ttl_segundos=0)
+    vencida.set("a", 1, dia, dia)
+    assert vencida.get("a") is None
+
+
 # ========================================
 # TESTS PARA /api/bookings
 # ========================================
@@ -279,6 +933,47 @@ def test_reservar_turno_success(client, app, setup_data):
         assert 'creado_por' in response_data
 
 
+def test_reservar_turno_version_en_transaccion_propia(client, app, setup_data):
+    """Test: El contador de versión se incrementa después del commit de la reserva, en su propia transacción"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=10, minute=0, second=0, microsecond=0)
+        VersionService.incrementar("turno")  # Crea la fila del contador
+        
+        eventos = []
+        
+        def registrar_sentencia(conn, cursor, statement, parameters, context, executemany):
+            eventos.append(statement.split()[0] + (" contador_version" if "contador_version" in statement else ""))
+        
+        def registrar_commit(conn):
+            eventos.append("COMMIT")
+        
+        event.listen(db.engine, "before_cursor_execute", registrar_sentencia)
+        event.listen(db.engine, "commit", registrar_commit)
+        try:
+            response = client.post('/api/bookings', json={
+                "matricula": setup_data["matricula"],
+                "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+            }, headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", registrar_sentencia)
+            event.remove(db.engine, "commit", registrar_commit)
+        
+        assert response.status_code == 201
+        indice = eventos.index("UPDATE contador_version")
+        # La reserva ya se confirmó y la transacción del contador solo contiene su UPDATE
+        assert "INSERT" in eventos[:indice]
+        assert eventos[indice - 1] == "COMMIT"
+        assert eventos[indice + 1] == "COMMIT"
+
+
 def test_reservar_turno_fecha_pasada(client, app, setup_data):
     """Test: Reservar turno falla con fecha pasada con JWT"""
     with app.app_context():
@@ -398,6 +1093,350 @@ def test_reservar_turno_duplicado(client, app, setup_data):
         assert "Ya existe" in response_data['error']
 
 
+def test_reservar_turno_slot_ocupado_por_otro_vehiculo(client, app, setup_data):
+    """Test: Reservar turno falla si otro vehículo ya ocupa ese horario"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        estado_activo = EstadoVehiculo.query.filter_by(nombre='ACTIVO').first()
+        db.session.add(Vehiculo(
+            matricula="OTRO001",
+            marca="Ford",
+            modelo="Ka",
+            anio=2019,
+            duenio_id=setup_data["usuario_id"],
+            estado_id=estado_activo.id
+        ))
+        db.session.commit()
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=10, minute=0, second=0, microsecond=0)
+        
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        assert response.status_code == 201
+        
+        response = client.post('/api/bookings', json={
+            "matricula": "OTRO001",
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        assert response.status_code == 400
+        assert "disponibilidad" in response.get_json()['error']
+        assert Turno.query.filter_by(fecha=fecha_turno).count() == 1
+
+
+def test_reservar_turno_capacidad_multiples_lineas(client, app, setup_data, monkeypatch):
+    """Test: Con varias líneas de inspección un slot admite tantos turnos como su capacidad"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=10, minute=0, second=0, microsecond=0)
+        
+        # 2 líneas en general, 3 los lunes a las 10:00
+        monkeypatch.setitem(HORARIO_CONFIG, "capacidad_por_slot", 2)
+        monkeypatch.setitem(HORARIO_CONFIG, "capacidad_por_dia_hora", {(0, 10): 3})
+        
+        estado_activo = EstadoVehiculo.query.filter_by(nombre='ACTIVO').first()
+        for i in range(3):
+            db.session.add(Vehiculo(
+                matricula=f"LINEA{i}",
+                marca="Renault",
+                modelo="Clio",
+                anio=2018,
+                duenio_id=setup_data["usuario_id"],
+                estado_id=estado_activo.id
+            ))
+        db.session.commit()
+        
+        matriculas = [setup_data["matricula"], "LINEA0", "LINEA1", "LINEA2"]
+        estados = [
+            client.post('/api/bookings', json={
+                "matricula": matricula,
+                "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+            }, headers=headers).status_code
+            for matricula in matriculas
+        ]
+        assert estados == [201, 201, 201, 400]
+        
+        client.post('/api/bookings', json={
+            "matricula": "LINEA2",
+            "fecha": fecha_turno.replace(hour=11).strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_monday.strftime('%Y-%m-%d')
+        }
+        response = client.post('/api/bookings/availability', json=data, headers=headers)
+        slots = {slot['fecha']: slot for slot in response.get_json()['slots']}
+        
+        assert slots[fecha_turno.strftime('%Y-%m-%d %H:%M')]['disponible'] is False
+        assert slots[fecha_turno.strftime('%Y-%m-%d %H:%M')]['capacidad_restante'] == 0
+        assert slots[fecha_turno.replace(hour=11).strftime('%Y-%m-%d %H:%M')]['capacidad_restante'] == 1
+        assert slots[fecha_turno.replace(hour=12).strftime('%Y-%m-%d %H:%M')]['capacidad_restante'] == 2
+
+
+def test_etag_disponibilidad_cambia_al_comenzar_cada_slot_de_45_minutos(app, monkeypatch):
+    """Test: Con slots de 45 minutos el ETag cambia justo cuando comienza un slot (10:30), no en la hora en punto"""
+    import src.services.booking_service as booking_service
+    monkeypatch.setitem(HORARIO_CONFIG, "duracion_turno_minutos", 45)  # 09:00, 09:45, 10:30, 11:15...
+    
+    class RelojFijo(datetime):
+        ahora = None
+        
+        @classmethod
+        def now(cls, tz=None):
+            return cls.ahora
+    
+    monkeypatch.setattr(booking_service, "datetime", RelojFijo)
+    
+    def etag_a_las(hora, minuto):
+        RelojFijo.ahora = RelojFijo(2030, 1, 7, hora, minuto, 30)
+        return booking_service.BookingService.etag_disponibilidad("2030-01-07", "2030-01-11")
+    
+    with app.app_context():
+        assert booking_service.BookingService._slot_en_curso(RelojFijo(2030, 1, 7, 10, 44)) == datetime(2030, 1, 7, 10, 30)
+        assert booking_service.BookingService._slot_en_curso(RelojFijo(2030, 1, 7, 8, 59)) == datetime(2030, 1, 7)
+        assert etag_a_las(10, 0) == etag_a_las(10, 29)
+        assert etag_a_las(10, 29) != etag_a_las(10, 30)
+        assert etag_a_las(10, 30) == etag_a_las(10, 44) == etag_a_las(11, 14)
+        assert etag_a_las(11, 14) != etag_a_las(11, 15)
+
+
+def test_slots_de_duracion_configurable(client, app, setup_data, monkeypatch):
+    """Test: Con slots de 30 minutos la disponibilidad y la validación usan la nueva grilla"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        monkeypatch.setitem(HORARIO_CONFIG, "duracion_turno_minutos", 30)
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=9, minute=30, second=0, microsecond=0)
+        
+        # Fuera de la grilla de 30 minutos
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.replace(minute=15).strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        assert response.status_code == 400
+        assert "slot" in response.get_json()['error']
+        
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        assert response.status_code == 201
+        
+        data = {
+            "fecha_inicio": next_monday.strftime('%Y-%m-%d'),
+            "fecha_final": next_monday.strftime('%Y-%m-%d')
+        }
+        slots = client.post('/api/bookings/availability', json=data, headers=headers).get_json()['slots']
+        
+        assert len(slots) == 22  # De 9:00 a 20:00 en slots de 30 minutos
+        assert slots[-1]['fecha'].endswith("19:30")
+        ocupados = [slot['fecha'] for slot in slots if not slot['disponible']]
+        assert ocupados == [fecha_turno.strftime('%Y-%m-%d %H:%M')]
+        
+        compacto = client.post('/api/bookings/availability?formato=compacto', json=data, headers=headers).get_json()
+        assert compacto['dias'][0]['duracion_minutos'] == 30
+        assert compacto['dias'][0]['cantidad_slots'] == 22
+
+
+def test_reservar_turno_fuera_de_grilla_horaria(client, app, setup_data):
+    """Test: Con slots de una hora no se puede reservar a mitad de hora"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        today = datetime.now()
+        days_ahead = 0 - today.weekday()
+        if days_ahead <= 0:
+            days_ahead += 7
+        next_monday = today + timedelta(days=days_ahead)
+        fecha_turno = next_monday.replace(hour=10, minute=30, second=0, microsecond=0)
+        
+        response = client.post('/api/bookings', json={
+            "matricula": setup_data["matricula"],
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        
+        assert response.status_code == 400
+        assert "slot" in response.get_json()['error']
+
+
+def test_ocupacion_reservar_en_una_sola_sentencia(app):
+    """Test: Reservar un lugar del slot es una única sentencia que crea la fila o la incrementa sin superar la capacidad"""
+    with app.app_context():
+        fecha = datetime(2030, 1, 7, 10, 0)
+        
+        resultados = []
+        for _ in range(3):
+            with contar_consultas() as sentencias:
+                resultados.append(OccupancyService.reservar(fecha, 2))
+            assert len(sentencias) == 1
+        db.session.commit()
+        
+        assert resultados == [True, True, False]
+        assert OcupacionSlot.query.filter_by(fecha=fecha).one().ocupados == 2
+
+
+def test_reservar_turno_concurrente_un_solo_ganador(app_concurrente):
+    """Test: Cientos de reservas simultáneas sobre el mismo slot producen exactamente un turno"""
+    cantidad = 200
+    
+    with app_concurrente.app_context():
+        rol_admin = UsuarioRol.query.filter_by(nombre='ADMIN').first()
+        admin = Usuario(
+            nombre_completo="Admin Concurrencia",
+            mail="admin_concurrencia@example.com",
+            telefono="123456789",
+            hash_password=hash_password("password123"),
+            rol_id=rol_admin.id,
+            activo=True
+        )
+        db.session.add(admin)
+        db.session.commit()
+        
+        estado_activo = EstadoVehiculo.query.filter_by(nombre='ACTIVO').first()
+        db.session.add_all([
+            Vehiculo(
+                matricula=f"CONC{i:03d}",
+                marca="Fiat",
+                modelo="Uno",
+                anio=2015,
+                duenio_id=admin.id,
+                estado_id=estado_activo.id
+            )
+            for i in range(cantidad)
+        ])
+        db.session.commit()
+    
+    token = app_concurrente.test_client().post('/api/users/sessions', json={
+        "mail": "admin_concurrencia@example.com",
+        "contrasenia": "password123"
+    }).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+    
+    today = datetime.now()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    fecha_turno = (today + timedelta(days=days_ahead)).replace(hour=10, minute=0, second=0, microsecond=0)
+    
+    barrera = threading.Barrier(cantidad)
+    estados = [None] * cantidad
+    errores = [None] * cantidad
+    
+    def reservar(indice):
+        cliente = app_concurrente.test_client()
+        barrera.wait()
+        response = cliente.post('/api/bookings', json={
+            "matricula": f"CONC{indice:03d}",
+            "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        estados[indice] = response.status_code
+        errores[indice] = response.get_json().get('error')
+    
+    hilos = [threading.Thread(target=reservar, args=(i,)) for i in range(cantidad)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    assert estados.count(201) == 1
+    assert estados.count(400) == cantidad - 1
+    # Todos los perdedores fueron rechazados por la condición de capacidad, no por otro error
+    assert all(error == "El horario seleccionado ya no tiene disponibilidad"
+               for estado, error in zip(estados, errores) if estado == 400)
+    
+    with app_concurrente.app_context():
+        assert Turno.query.filter_by(fecha=fecha_turno).count() == 1
+        assert OcupacionSlot.query.filter_by(fecha=fecha_turno).one().ocupados == 1
+
+
+def test_cancelar_turno_concurrente_libera_el_slot_una_vez(app_concurrente, monkeypatch):
+    """Test: Cancelaciones simultáneas del mismo turno liberan un solo lugar del slot"""
+    cantidad = 20
+    monkeypatch.setitem(HORARIO_CONFIG, "capacidad_por_slot", 2)
+
+    with app_concurrente.app_context():
+        rol_admin = UsuarioRol.query.filter_by(nombre='ADMIN').first()
+        admin = Usuario(nombre_completo="Admin Cancelaciones", mail="admin_cancelaciones@example.com",
+                        telefono="123456789", hash_password=hash_password("password123"),
+                        rol_id=rol_admin.id, activo=True)
+        db.session.add(admin)
+        db.session.commit()
+
+        estado_activo = EstadoVehiculo.query.filter_by(nombre='ACTIVO').first()
+        db.session.add_all([Vehiculo(matricula=f"CANC{i}", marca="Fiat", modelo="Uno", anio=2015,
+                                     duenio_id=admin.id, estado_id=estado_activo.id) for i in range(2)])
+        db.session.commit()
+
+    cliente = app_concurrente.test_client()
+    token = cliente.post('/api/users/sessions', json={
+        "mail": "admin_cancelaciones@example.com",
+        "contrasenia": "password123"
+    }).get_json()['token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    today = datetime.now()
+    days_ahead = 0 - today.weekday()
+    if days_ahead <= 0:
+        days_ahead += 7
+    fecha_turno = (today + timedelta(days=days_ahead)).replace(hour=10, minute=0, second=0, microsecond=0)
+
+    # Dos turnos en el mismo slot: el slot queda con 2 lugares ocupados
+    turno_ids = []
+    for i in range(2):
+        response = cliente.post('/api/bookings', json={
+            "matricula": f"CANC{i}", "fecha": fecha_turno.strftime('%Y-%m-%d %H:%M')
+        }, headers=headers)
+        assert response.status_code == 201
+        turno_ids.append(response.get_json()['id'])
+
+    barrera = threading.Barrier(cantidad)
+    respuestas = [None] * cantidad
+
+    def cancelar(indice):
+        cliente_hilo = app_concurrente.test_client()
+        barrera.wait()
+        response = cliente_hilo.put(f'/api/bookings/{turno_ids[0]}', json={"estado_id": 4}, headers=headers)
+        respuestas[indice] = (response.status_code, response.get_json().get('error', ''))
+
+    hilos = [threading.Thread(target=cancelar, args=(i,)) for i in range(cantidad)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert [estado for estado, _ in respuestas].count(200) == 1
+    # Los perdedores ven el turno ya cancelado (o lo pierden en el UPDATE condicional)
+    for estado, error in respuestas:
+        assert estado == 200 or "CANCELADO" in error or "cambió de estado" in error
+
+    with app_concurrente.app_context():
+        assert OccupancyService.obtener_ocupacion(fecha_turno, fecha_turno + timedelta(hours=1)) == {fecha_turno: 1}
+
+
 def test_reservar_turno_vehiculo_no_existe(client, app, setup_data):
     """Test: Reservar turno falla si el vehículo no existe con JWT"""
     with app.app_context():
@@ -1156,6 +2195,370 @@ def test_listar_turnos_por_vehiculo_success(client, app, setup_data):
         assert response_data['total'] >= 1
 
 
+def crear_turnos_con_inspeccion(setup_data, cantidad):
+    """
+    Helper para crear turnos del vehículo de prueba: la mitad completados y con inspección.
+    """
+    completado = EstadoTurno.query.filter_by(nombre='COMPLETADO').first()
+    reservado = EstadoTurno.query.filter_by(nombre='RESERVADO').first()
+    resultado = ResultadoInspeccion.query.filter_by(nombre='SEGURO').first()
+    if not resultado:
+        resultado = ResultadoInspeccion(nombre='SEGURO')
+        db.session.add(resultado)
+        db.session.flush()
+    
+    inicio = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=cantidad)
+    for i in range(cantidad):
+        turno = Turno(
+            vehiculo_id=setup_data["vehiculo_id"],
+            fecha=inicio + timedelta(days=i),
+            estado_id=completado.id if i % 2 == 0 else reservado.id,
+            creado_por=setup_data["usuario_id"]
+        )
+        db.session.add(turno)
+        db.session.flush()
+        if i % 2 == 0:
+            db.session.add(Inspeccion(
+                vehiculo_id=setup_data["vehiculo_id"],
+                turno_id=turno.id,
+                puntuacion_total=60,
+                resultado_id=resultado.id
+            ))
+    db.session.commit()
+    # Se vacía la sesión para que el listado no reutilice objetos ya cargados
+    db.session.expunge_all()
+
+
+def consultas_de_listado(client, url, headers, cantidad_esperada):
+    """Helper: ejecuta el listado y devuelve la cantidad de sentencias SQL emitidas"""
+    with contar_consultas() as sentencias:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert response.get_json()['total'] == cantidad_esperada
+    return len(sentencias)
+
+
+@pytest.mark.parametrize("url, rol", [
+    ('/api/users/bookings', 'DUENIO'),
+    ('/api/vehicles/ABC123/bookings', 'DUENIO'),
+    ('/api/bookings', 'DUENIO'),
+    ('/api/bookings', 'ADMIN'),
+])
+def test_listados_de_turnos_cantidad_consultas_constante(client, app, setup_data, url, rol):
+    """Test: Los listados de turnos cuestan las mismas consultas con 2 o con 20 turnos, sin cargar entidades"""
+    with app.app_context():
+        if rol == 'ADMIN':
+            token = get_auth_token(client, app, mail="admin_listados@example.com", role="ADMIN")
+        else:
+            token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        crear_turnos_con_inspeccion(setup_data, 2)
+        consultas_pocos = consultas_de_listado(client, url, headers, 2)
+        
+        crear_turnos_con_inspeccion(setup_data, 18)
+        consultas_muchos = consultas_de_listado(client, url, headers, 20)
+        
+        assert consultas_muchos == consultas_pocos
+        assert consultas_muchos <= 4
+        
+        # La proyección no instancia entidades Turno ni Inspeccion
+        assert not any(isinstance(obj, (Turno, Inspeccion)) for obj in db.session.identity_map.values())
+        
+        # Los turnos completados siguen exponiendo el resultado de su inspección
+        turnos = client.get(url, headers=headers).get_json()['turnos']
+        completados = [t for t in turnos if t['estado'] == 'COMPLETADO']
+        assert len(completados) == 10
+        assert all(t['resultado'] == 'SEGURO' for t in completados)
+
+
+@pytest.mark.parametrize("url", ['/api/users/bookings', '/api/vehicles/ABC123/bookings', '/api/bookings'])
+def test_listados_de_turnos_paginacion_por_cursor(client, app, setup_data, url):
+    """Test: Recorrer un listado con cursor devuelve cada turno una sola vez y en orden"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        # Turnos con fechas repetidas para ejercitar el desempate por id
+        estado_reservado = EstadoTurno.query.filter_by(nombre='RESERVADO').first()
+        base = datetime.now().replace(minute=0, second=0, microsecond=0)
+        for i in range(25):
+            db.session.add(Turno(
+                vehiculo_id=setup_data["vehiculo_id"],
+                fecha=base - timedelta(days=i // 3),
+                estado_id=estado_reservado.id,
+                creado_por=setup_data["usuario_id"]
+            ))
+        db.session.commit()
+        esperados = [t.id for t in Turno.query.order_by(Turno.fecha.desc(), Turno.id.desc()).all()]
+        
+        vistos = []
+        tamanios = []
+        consultas_por_pagina = []
+        cursor = None
+        while True:
+            query = f"?limit=10&cursor={cursor}" if cursor else "?limit=10"
+            with contar_consultas() as sentencias:
+                response = client.get(url + query, headers=headers)
+            assert response.status_code == 200
+            data = response.get_json()
+            consultas_por_pagina.append(len(sentencias))
+            vistos.extend(t['id'] for t in data['turnos'])
+            tamanios.append(data['total'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        
+        assert vistos == esperados
+        assert tamanios == [10, 10, 5]
+        # Una página profunda cuesta lo mismo que la primera
+        assert len(set(consultas_por_pagina)) == 1
+
+
+@pytest.mark.parametrize("query", ["?limit=0", "?limit=501", "?limit=abc", "?cursor=no-es-un-cursor"])
+def test_listados_de_turnos_paginacion_invalida(client, app, setup_data, query):
+    """Test: Parámetros de paginación inválidos devuelven 400"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.get('/api/bookings' + query, headers=headers)
+        
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+
+def test_listar_turnos_filtros_estado_fechas_y_matricula(client, app, setup_data):
+    """Test: Los filtros estado, desde, hasta y matricula se aplican en el listado"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin_filtros@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        # Segundo vehículo del mismo dueño
+        otro = Vehiculo(
+            matricula="XYZ789",
+            marca="Ford",
+            modelo="Focus",
+            anio=2019,
+            duenio_id=setup_data["usuario_id"],
+            estado_id=EstadoVehiculo.query.filter_by(nombre='ACTIVO').first().id
+        )
+        db.session.add(otro)
+        db.session.flush()
+        
+        confirmado = EstadoTurno.query.filter_by(nombre='CONFIRMADO').first()
+        reservado = EstadoTurno.query.filter_by(nombre='RESERVADO').first()
+        hoy = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        ayer = hoy - timedelta(days=1)
+        for vehiculo_id, fecha, estado in [
+            (setup_data["vehiculo_id"], hoy, confirmado),
+            (setup_data["vehiculo_id"], hoy.replace(hour=11), reservado),
+            (setup_data["vehiculo_id"], ayer, confirmado),
+            (otro.id, hoy.replace(hour=12), confirmado),
+        ]:
+            db.session.add(Turno(vehiculo_id=vehiculo_id, fecha=fecha, estado_id=estado.id,
+                                 creado_por=setup_data["usuario_id"]))
+        db.session.commit()
+        
+        dia = hoy.strftime('%Y-%m-%d')
+        response = client.get(f'/api/bookings?estado=confirmado&desde={dia}&hasta={dia}', headers=headers)
+        assert response.status_code == 200
+        turnos = response.get_json()['turnos']
+        assert [t['matricula'] for t in turnos] == ["XYZ789", "ABC123"]
+        assert all(t['estado'] == 'CONFIRMADO' for t in turnos)
+        
+        response = client.get(f'/api/bookings?estado=CONFIRMADO&hasta={dia}&matricula=ABC123', headers=headers)
+        assert response.get_json()['total'] == 2
+        
+        # En el listado por vehículo aplican estado y fechas
+        response = client.get(f'/api/vehicles/ABC123/bookings?desde={dia}', headers=headers)
+        assert response.get_json()['total'] == 2
+
+
+@pytest.mark.parametrize("query", ["?estado=PENDIENTE", "?desde=2025-13-01", "?desde=2025-06-10&hasta=2025-06-01"])
+def test_listar_turnos_filtros_invalidos(client, app, setup_data, query):
+    """Test: Filtros inválidos devuelven 400"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.get('/api/users/bookings' + query, headers=headers)
+        
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+
+def test_exportar_turnos_ndjson_en_streaming(client, app, setup_data):
+    """Test: El export devuelve un turno por línea, en streaming y con los filtros aplicados"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin_export@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        crear_turnos_con_inspeccion(setup_data, 7)
+        
+        response = client.get('/api/bookings/export', headers=headers)
+        
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/x-ndjson'
+        lineas = [json.loads(linea) for linea in response.get_data(as_text=True).splitlines()]
+        assert len(lineas) == 7
+        assert [t['fecha'] for t in lineas] == sorted((t['fecha'] for t in lineas), reverse=True)
+        
+        # Mismos campos que el listado paginado
+        listado = client.get('/api/bookings', headers=headers).get_json()['turnos']
+        assert lineas == listado
+        
+        response = client.get('/api/bookings/export?estado=COMPLETADO', headers=headers)
+        completados = response.get_data(as_text=True).splitlines()
+        assert len(completados) == 4
+        assert all(json.loads(linea)['resultado'] == 'SEGURO' for linea in completados)
+
+
+def test_exportar_turnos_solo_admin_y_filtros_invalidos(client, app, setup_data):
+    """Test: El export requiere ADMIN y valida los filtros antes de empezar a escribir"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        response = client.get('/api/bookings/export', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 403
+        
+        token = get_auth_token(client, app, mail="admin_export@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        response = client.get('/api/bookings/export?desde=2025-06-10&hasta=2025-06-01', headers=headers)
+        assert response.status_code == 400
+        
+        response = client.get('/api/bookings/export', headers=headers)
+        assert response.status_code == 200
+        assert response.get_data(as_text=True) == ""
+
+
+# ========================================
+# TESTS PARA /api/bookings/agenda
+# ========================================
+
+def test_agenda_del_dia_turnos_confirmados_ordenados(client, app, setup_data):
+    """Test: La agenda devuelve solo los turnos CONFIRMADOS del día, por horario, con vehículo y dueño"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="inspector_agenda@example.com", role="INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        dia = datetime.now() + timedelta(days=7 - datetime.now().weekday())
+        confirmado = EstadoTurno.query.filter_by(nombre='CONFIRMADO').first()
+        reservado = EstadoTurno.query.filter_by(nombre='RESERVADO').first()
+        for hora, estado, dias in [(15, confirmado, 0), (9, confirmado, 0), (11, reservado, 0), (10, confirmado, 1)]:
+            db.session.add(Turno(
+                vehiculo_id=setup_data["vehiculo_id"],
+                fecha=(dia + timedelta(days=dias)).replace(hour=hora, minute=0, second=0, microsecond=0),
+                estado_id=estado.id,
+                creado_por=setup_data["usuario_id"]
+            ))
+        db.session.commit()
+        
+        response = client.get(f"/api/bookings/agenda?fecha={dia.strftime('%Y-%m-%d')}", headers=headers)
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['total'] == 2
+        assert [t['fecha'][-5:] for t in data['turnos']] == ['09:00', '15:00']
+        assert data['turnos'][0]['vehiculo'] == {
+            "matricula": "ABC123", "marca": "Toyota", "modelo": "Corolla", "anio": 2020
+        }
+        assert data['turnos'][0]['duenio'] == {
+            "nombre_completo": "Juan Perez", "mail": "juan@example.com", "telefono": "123456789"
+        }
+
+
+def test_agenda_cache_etag_e_invalidacion(client, app, setup_data):
+    """Test: La agenda se cachea por día, responde 304 con el ETag vigente y se invalida al cambiar un turno"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin_agenda@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        dia = datetime.now() + timedelta(days=7 - datetime.now().weekday())
+        reservado = EstadoTurno.query.filter_by(nombre='RESERVADO').first()
+        turno = Turno(
+            vehiculo_id=setup_data["vehiculo_id"],
+            fecha=dia.replace(hour=10, minute=0, second=0, microsecond=0),
+            estado_id=reservado.id,
+            creado_por=setup_data["usuario_id"]
+        )
+        db.session.add(turno)
+        db.session.commit()
+        turno_id = turno.id
+        url = f"/api/bookings/agenda?fecha={dia.strftime('%Y-%m-%d')}"
+        
+        response = client.get(url, headers=headers)
+        assert response.get_json()['total'] == 0
+        etag = response.headers['ETag']
+        
+        # Con el ETag vigente: 304 sin consultar turnos
+        with contar_consultas() as sentencias:
+            response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert not any('FROM turno' in sentencia for sentencia in sentencias)
+        
+        # Sin ETag: se sirve desde la cache
+        with contar_consultas() as sentencias:
+            response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert not any('FROM turno' in sentencia for sentencia in sentencias)
+        
+        # Confirmar el turno invalida la agenda de ese día y cambia el ETag
+        response = client.put(f'/api/bookings/{turno_id}', json={"estado_id": 2}, headers=headers)
+        assert response.status_code == 200
+        
+        response = client.get(url, headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+        assert [t['id'] for t in response.get_json()['turnos']] == [turno_id]
+
+
+def test_agenda_cache_no_sirve_cuerpos_de_otra_version(client, app, setup_data):
+    """Test: Un cambio de turno hecho por otro worker (sin invalidar esta cache) se refleja con el nuevo ETag"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="admin_agenda@example.com", role="ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        dia = datetime.now() + timedelta(days=7 - datetime.now().weekday())
+        reservado = EstadoTurno.query.filter_by(nombre='RESERVADO').first()
+        turno = Turno(
+            vehiculo_id=setup_data["vehiculo_id"],
+            fecha=dia.replace(hour=10, minute=0, second=0, microsecond=0),
+            estado_id=reservado.id,
+            creado_por=setup_data["usuario_id"]
+        )
+        db.session.add(turno)
+        db.session.commit()
+        turno_id = turno.id
+        url = f"/api/bookings/agenda?fecha={dia.strftime('%Y-%m-%d')}"
+        
+        response = client.get(url, headers=headers)
+        etag = response.headers['ETag']
+        assert response.get_json()['total'] == 0
+        
+        # Lo que haría otro worker: confirma el turno sin tocar la cache de este proceso
+        app.extensions['agenda_cache'], cache_local = TTLCache(), app.extensions['agenda_cache']
+        response = client.put(f'/api/bookings/{turno_id}', json={"estado_id": 2}, headers=headers)
+        assert response.status_code == 200
+        app.extensions['agenda_cache'] = cache_local
+        
+        response = client.get(url, headers=headers)
+        assert response.headers['ETag'] != etag
+        assert [t['id'] for t in response.get_json()['turnos']] == [turno_id]
+
+
+def test_agenda_solo_inspector_o_admin(client, app, setup_data):
+    """Test: Un DUENIO no puede consultar la agenda y una fecha inválida devuelve 400"""
+    with app.app_context():
+        token = get_auth_token(client, app, mail="juan@example.com", password="password123")
+        response = client.get('/api/bookings/agenda', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 403
+        
+        token = get_auth_token(client, app, mail="inspector_agenda@example.com", role="INSPECTOR")
+        response = client.get('/api/bookings/agenda?fecha=mañana', headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == 400
+
+
 # ========================================
 # TESTS PARA VERIFICAR AUTENTICACIÓN JWT (401 sin token)
 # ========================================
@@ -1,11 +1,15 @@
 import pytest
 import os
 from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
 from src import create_app, db
 from src.models import (
     Usuario, UsuarioRol, Vehiculo, EstadoVehiculo, 
-    Turno, EstadoTurno, ResultadoInspeccion
+    Turno, EstadoTurno, ResultadoInspeccion, Inspeccion, Chequeo, TipoChequeo
 )
+from src.models.check_type_model import TIPOS_CHEQUEO
+from src.services.inspection_service import InspectionService
 from src.utils.hash_utils import hash_password
 
 
@@ -53,6 +57,12 @@ def app():
             db.session.add_all([seguro, rechequear_res])
             db.session.commit()
         
+        # Crear tipos de chequeo
+        if not TipoChequeo.query.all():
+            db.session.add_all([TipoChequeo(nombre=nombre, descripcion=descripcion)
+                                for nombre, descripcion in TIPOS_CHEQUEO])
+            db.session.commit()
+        
         yield app
         
         db.session.remove()
@@ -463,8 +473,8 @@ def test_create_inspection_fecha_incorrecta(client, app, setup_data):
             "turno_id": setup_data["turno_id"],
             "inspector_id": setup_data["inspector_id"],
             "chequeos": [
-                {"descripcion": f"Chequeo {i}", "puntuacion": 10}
-                for i in range(1, 9)
+                {"tipo": clave, "puntuacion": 10}
+                for clave, _ in TIPOS_CHEQUEO
             ]
         }
         
@@ -476,6 +486,84 @@ def test_create_inspection_fecha_incorrecta(client, app, setup_data):
         assert 'día programado' in response_data['error'].lower()
 
 
+def test_create_inspection_tipos_de_chequeo_por_clave_o_descripcion(client, app, setup_data):
+    """Test: Cada chequeo indica su tipo por clave o por la descripción del formato anterior"""
+    with app.app_context():
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+
+        def datos(primer_chequeo):
+            return {
+                "turno_id": setup_data["turno_id"],
+                "inspector_id": setup_data["inspector_id"],
+                "chequeos": [primer_chequeo] + [{"tipo": clave, "puntuacion": 9} for clave, _ in TIPOS_CHEQUEO[1:]]
+            }
+
+        # Tipo inexistente o sin indicar
+        response = client.post('/api/inspections', json=datos({"descripcion": "Tapizado", "puntuacion": 9}),
+                               headers=headers)
+        assert response.status_code == 400
+        assert "Tapizado" in response.get_json()['error']
+        response = client.post('/api/inspections', json=datos({"puntuacion": 9}), headers=headers)
+        assert response.status_code == 400
+
+        # Descripción del formato anterior, sin distinguir mayúsculas ni espacios
+        response = client.post('/api/inspections', json=datos({"descripcion": " luces Y señalización ", "puntuacion": 9}),
+                               headers=headers)
+        assert response.status_code == 201
+        chequeos = response.get_json()['chequeos']
+        assert [(c['tipo'], c['descripcion']) for c in chequeos] == TIPOS_CHEQUEO
+
+        # Se guarda la referencia al catálogo, no el texto
+        from src.models import Chequeo
+        tipos = {c.tipo_chequeo_id for c in Chequeo.query.filter_by(inspeccion_id=response.get_json()['id'])}
+        assert tipos == {id_ for (id_,) in db.session.query(TipoChequeo.id)}
+
+
+def test_create_inspection_guarda_puntuaciones_empaquetadas(client, app, setup_data):
+    """Test: La inspección guarda sus 8 puntuaciones en el orden del catálogo, legibles con frombuffer"""
+    with app.app_context():
+        from src.utils.analytics_utils import desempaquetar_puntuaciones
+
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+
+        # Chequeos enviados en orden inverso al del catálogo
+        esperadas = [10, 9, 8, 7, 6, 5, 10, 9]
+        chequeos = [{"tipo": clave, "puntuacion": puntuacion}
+                    for (clave, _), puntuacion in reversed(list(zip(TIPOS_CHEQUEO, esperadas)))]
+        data = {"turno_id": setup_data["turno_id"], "inspector_id": setup_data["inspector_id"]}
+
+        # Un tipo repetido (y otro ausente) se rechaza
+        repetidos = chequeos[:-1] + [chequeos[0]]
+        response = client.post('/api/inspections', json={**data, "chequeos": repetidos}, headers=headers)
+        assert response.status_code == 400
+        assert "un chequeo de cada tipo" in response.get_json()['error']
+
+        response = client.post('/api/inspections', json={**data, "chequeos": chequeos}, headers=headers)
+        assert response.status_code == 201
+
+        db.session.expunge_all()
+        inspeccion = db.session.get(Inspeccion, response.get_json()['id'])
+        assert len(inspeccion.puntuaciones) == 8
+        assert desempaquetar_puntuaciones(inspeccion.puntuaciones).tolist() == [esperadas]
+
+        # El historial del vehículo las devuelve sin leer la tabla chequeo
+        sentencias = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", registrar)
+        try:
+            listado = client.get(f'/api/vehicles/{setup_data["matricula"]}/inspections', headers=headers).get_json()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", registrar)
+
+        assert listado['inspecciones'][0]['puntuaciones'] == esperadas
+        assert not any("chequeo" in s for s in sentencias)
+
+
 # ========================================
 # TESTS PARA /api/inspections/{id} (GET - Obtener inspección)
 # ========================================
@@ -513,6 +601,300 @@ def test_get_inspection_success(client, app, setup_data):
         assert response_data['vehiculo_matricula'] == setup_data["matricula"]
 
 
+def test_create_inspection_cantidad_de_sentencias_minima(client, app, setup_data):
+    """Test: El alta de una inspección usa los catálogos en memoria y un solo INSERT para los 8 chequeos"""
+    with app.app_context():
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        # Segundo turno de hoy para otro vehículo: el primero calienta la cache de catálogos
+        otro = Vehiculo(
+            matricula="TEST456",
+            marca="TestMarca",
+            modelo="TestModelo",
+            anio=2021,
+            duenio_id=setup_data["duenio_id"],
+            estado_id=EstadoVehiculo.query.filter_by(nombre='ACTIVO').first().id
+        )
+        db.session.add(otro)
+        db.session.flush()
+        turno = Turno(
+            vehiculo_id=otro.id,
+            fecha=datetime.utcnow().replace(hour=11, minute=0, second=0, microsecond=0),
+            estado_id=EstadoTurno.query.filter_by(nombre='CONFIRMADO').first().id,
+            creado_por=setup_data["duenio_id"]
+        )
+        db.session.add(turno)
+        db.session.commit()
+        segundo_turno_id = turno.id
+        
+        def datos(turno_id):
+            return {
+                "turno_id": turno_id,
+                "inspector_id": setup_data["inspector_id"],
+                "chequeos": [{"tipo": clave, "puntuacion": 8} for clave, _ in TIPOS_CHEQUEO]
+            }
+        
+        assert client.post('/api/inspections', json=datos(setup_data["turno_id"]), headers=headers).status_code == 201
+        
+        sentencias = []
+        
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            sentencias.append(statement)
+        
+        event.listen(db.engine, "before_cursor_execute", registrar)
+        try:
+            response = client.post('/api/inspections', json=datos(segundo_turno_id), headers=headers)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", registrar)
+        
+        assert response.status_code == 201
+        response_data = response.get_json()
+        assert response_data['vehiculo_matricula'] == "TEST456"
+        assert response_data['inspector_nombre'] == "Inspector Prueba"
+        assert response_data['resultado'] == "SEGURO"
+        assert [(c['tipo'], c['descripcion']) for c in response_data['chequeos']] == TIPOS_CHEQUEO
+        assert len({c['id'] for c in response_data['chequeos']}) == 8
+        
+        # Los ids devueltos son los de la base, en el orden enviado
+        detalle = client.get(f"/api/inspections/{response_data['id']}", headers=headers).get_json()
+        assert sorted(detalle['chequeos'], key=lambda c: c['id']) == response_data['chequeos']
+        
+        inserts_chequeo = [s for s in sentencias if s.startswith("INSERT INTO chequeo")]
+        assert len(inserts_chequeo) == 1
+        catalogos = ["FROM estado_turno", "FROM resultado_inspeccion", "FROM usuario_rol", "FROM tipo_chequeo"]
+        assert not any(catalogo in s for s in sentencias for catalogo in catalogos)
+        # turno + inspector + 2 INSERT + 2 upserts (última inspección, estadísticas)
+        # + 2 UPDATE (turno, ocupación) y, ya confirmada la transacción, el de la versión
+        assert len(sentencias) == 9
+        assert db.session.get(Turno, segundo_turno_id).estado.nombre == 'COMPLETADO'
+
+
+# ========================================
+# TESTS PARA /api/inspections/batch (POST - Carga en lote)
+# ========================================
+
+def crear_turnos_de_hoy(setup_data, cantidad):
+    """Helper: crea `cantidad` vehículos con un turno CONFIRMADO para hoy y devuelve los ids de turno"""
+    estado_activo = EstadoVehiculo.query.filter_by(nombre='ACTIVO').first()
+    estado_confirmado = EstadoTurno.query.filter_by(nombre='CONFIRMADO').first()
+    turno_ids = []
+    for i in range(cantidad):
+        vehiculo = Vehiculo(
+            matricula=f"LOTE{i:03d}",
+            marca="TestMarca",
+            modelo="TestModelo",
+            anio=2020,
+            duenio_id=setup_data["duenio_id"],
+            estado_id=estado_activo.id
+        )
+        db.session.add(vehiculo)
+        db.session.flush()
+        turno = Turno(
+            vehiculo_id=vehiculo.id,
+            fecha=datetime.utcnow().replace(hour=11 + i, minute=0, second=0, microsecond=0),
+            estado_id=estado_confirmado.id,
+            creado_por=setup_data["duenio_id"]
+        )
+        db.session.add(turno)
+        db.session.flush()
+        turno_ids.append(turno.id)
+    db.session.commit()
+    return turno_ids
+
+
+def test_create_inspections_batch_errores_parciales(client, app, setup_data):
+    """Test: Un lote registra las inspecciones válidas e informa las fallidas sin abortar el resto"""
+    with app.app_context():
+        app.config['INSPECCIONES_LOTE_TAMANIO_COMMIT'] = 2
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        turno_rechequear, turno_sin_observacion = crear_turnos_de_hoy(setup_data, 2)
+        
+        def datos(turno_id, puntuacion, observacion=None, cantidad=8):
+            return {
+                "turno_id": turno_id,
+                "inspector_id": setup_data["inspector_id"],
+                "chequeos": [{"tipo": clave, "puntuacion": puntuacion}
+                             for clave, _ in TIPOS_CHEQUEO[:cantidad]],
+                "observacion": observacion
+            }
+        
+        response = client.post('/api/inspections/batch', json={"inspecciones": [
+            datos(setup_data["turno_id"], 8),
+            datos(turno_rechequear, 3, "Frenos gastados y luces quemadas"),
+            datos(turno_rechequear, 8, cantidad=7),
+            datos(setup_data["turno_id"], 8),
+            datos(turno_sin_observacion, 3)
+        ]}, headers=headers)
+        
+        assert response.status_code == 200
+        response_data = response.get_json()
+        assert response_data['creadas'] == 2
+        assert response_data['fallidas'] == 3
+        
+        resultados = response_data['resultados']
+        assert [r['indice'] for r in resultados] == [0, 1, 2, 3, 4]
+        assert [r['creada'] for r in resultados] == [True, True, False, False, False]
+        assert [r['resultado'] for r in resultados] == ['SEGURO', 'RECHEQUEAR', None, None, None]
+        assert resultados[0]['inspeccion']['vehiculo_matricula'] == setup_data["matricula"]
+        assert len(resultados[1]['inspeccion']['chequeos']) == 8
+        assert resultados[2]['turno_id'] == turno_rechequear
+        assert "chequeos" in resultados[2]['error']
+        assert resultados[3]['error'] == "El turno ya fue completado"
+        assert "observación" in resultados[4]['error']
+        
+        # La inspección fallida no dejó escrituras: su turno sigue CONFIRMADO y sin inspección
+        db.session.expunge_all()
+        assert Inspeccion.query.count() == 2
+        assert Inspeccion.query.filter_by(turno_id=turno_sin_observacion).first() is None
+        assert db.session.get(Turno, turno_sin_observacion).estado.nombre == 'CONFIRMADO'
+        assert db.session.get(Turno, turno_rechequear).estado.nombre == 'COMPLETADO'
+
+
+def test_create_inspections_batch_conflicto_en_la_base(client, app, setup_data):
+    """Test: Si la base rechaza una inspección del lote se deshace solo su SAVEPOINT"""
+    with app.app_context():
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        (turno_libre,) = crear_turnos_de_hoy(setup_data, 1)
+        
+        # Inspección registrada por otra petición mientras el turno seguía CONFIRMADO
+        db.session.add(Inspeccion(
+            vehiculo_id=setup_data["vehiculo_id"],
+            turno_id=setup_data["turno_id"],
+            inspector_id=setup_data["inspector_id"],
+            fecha=datetime.utcnow(),
+            puntuacion_total=64,
+            resultado_id=ResultadoInspeccion.query.filter_by(nombre='SEGURO').first().id
+        ))
+        db.session.commit()
+        
+        chequeos = [{"tipo": clave, "puntuacion": 8} for clave, _ in TIPOS_CHEQUEO]
+        response = client.post('/api/inspections/batch', json={"inspecciones": [
+            {"turno_id": setup_data["turno_id"], "inspector_id": setup_data["inspector_id"], "chequeos": chequeos},
+            {"turno_id": turno_libre, "inspector_id": setup_data["inspector_id"], "chequeos": chequeos}
+        ]}, headers=headers)
+        
+        assert response.status_code == 200
+        resultados = response.get_json()['resultados']
+        assert resultados[0]['creada'] is False
+        assert "ya tiene una inspección" in resultados[0]['error']
+        assert resultados[1]['creada'] is True
+        
+        db.session.expunge_all()
+        assert db.session.get(Turno, setup_data["turno_id"]).estado.nombre == 'CONFIRMADO'
+        assert db.session.get(Turno, turno_libre).estado.nombre == 'COMPLETADO'
+        assert Inspeccion.query.count() == 2
+
+
+def test_create_inspections_batch_falla_commit_de_un_bloque(client, app, setup_data, monkeypatch):
+    """Test: Si falla el commit de un bloque solo sus inspecciones quedan sin crear y el resto del lote continúa"""
+    with app.app_context():
+        app.config['INSPECCIONES_LOTE_TAMANIO_COMMIT'] = 2
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        turno_ids = crear_turnos_de_hoy(setup_data, 3)
+        
+        # El primer commit del lote (bloque de las dos primeras inspecciones) falla en la base
+        commit_original = db.session.commit
+        fallas = []
+        
+        def commit_que_falla_una_vez():
+            if not fallas:
+                fallas.append(True)
+                raise OperationalError("COMMIT", {}, Exception("database is locked"))
+            commit_original()
+        
+        chequeos = [{"tipo": clave, "puntuacion": 8} for clave, _ in TIPOS_CHEQUEO]
+        monkeypatch.setattr(db.session, "commit", commit_que_falla_una_vez)
+        response = client.post('/api/inspections/batch', json={"inspecciones": [
+            {"turno_id": turno_id, "inspector_id": setup_data["inspector_id"], "chequeos": chequeos}
+            for turno_id in turno_ids
+        ]}, headers=headers)
+        monkeypatch.undo()
+        
+        assert response.status_code == 200
+        response_data = response.get_json()
+        assert response_data['creadas'] == 1
+        assert response_data['fallidas'] == 2
+        resultados = response_data['resultados']
+        assert [r['creada'] for r in resultados] == [False, False, True]
+        assert all("bloque" in r['error'] and r['inspeccion'] is None for r in resultados[:2])
+        
+        assert resultados[2]['inspeccion']['turno_id'] == turno_ids[2]
+        
+        # El bloque siguiente se confirmó normalmente
+        db.session.expunge_all()
+        assert db.session.get(Turno, turno_ids[2]).estado.nombre == 'COMPLETADO'
+        assert Inspeccion.query.filter_by(turno_id=turno_ids[2]).count() == 1
+
+
+def test_create_inspections_batch_error_de_base_a_mitad_del_lote(client, app, setup_data, monkeypatch):
+    """Test: Un error de la base a mitad del lote conserva los bloques confirmados e informa el resto como no procesado"""
+    with app.app_context():
+        app.config['INSPECCIONES_LOTE_TAMANIO_COMMIT'] = 2
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        turno_ids = crear_turnos_de_hoy(setup_data, 4)
+        
+        # La tercera inspección (primera del segundo bloque) pierde la conexión con la base
+        registrar_original = InspectionService._registrar_inspeccion
+        llamadas = []
+        
+        def registrar_que_falla_en_la_tercera(data):
+            llamadas.append(data["turno_id"])
+            if len(llamadas) == 3:
+                raise OperationalError("INSERT", {}, Exception("Lost connection to server"))
+            return registrar_original(data)
+        
+        chequeos = [{"tipo": clave, "puntuacion": 8} for clave, _ in TIPOS_CHEQUEO]
+        monkeypatch.setattr(InspectionService, "_registrar_inspeccion", staticmethod(registrar_que_falla_en_la_tercera))
+        response = client.post('/api/inspections/batch', json={"inspecciones": [
+            {"turno_id": turno_id, "inspector_id": setup_data["inspector_id"], "chequeos": chequeos}
+            for turno_id in turno_ids
+        ]}, headers=headers)
+        monkeypatch.undo()
+        
+        assert response.status_code == 200
+        response_data = response.get_json()
+        assert response_data['creadas'] == 2
+        assert response_data['fallidas'] == 2
+        resultados = response_data['resultados']
+        assert [r['turno_id'] for r in resultados] == turno_ids
+        assert [r['creada'] for r in resultados] == [True, True, False, False]
+        assert all("No se procesó" in r['error'] and r['inspeccion'] is None for r in resultados[2:])
+        # La carga se corta en el error: la cuarta inspección no se intentó
+        assert llamadas == turno_ids[:3]
+        
+        # El primer bloque quedó confirmado
+        db.session.expunge_all()
+        for turno_id in turno_ids[:2]:
+            assert db.session.get(Turno, turno_id).estado.nombre == 'COMPLETADO'
+            assert Inspeccion.query.filter_by(turno_id=turno_id).count() == 1
+        for turno_id in turno_ids[2:]:
+            assert Inspeccion.query.filter_by(turno_id=turno_id).count() == 0
+
+
+def test_create_inspections_batch_lote_invalido(client, app, setup_data):
+    """Test: Un lote vacío o mayor al máximo configurado se rechaza completo"""
+    with app.app_context():
+        app.config['INSPECCIONES_LOTE_MAXIMO'] = 1
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        assert client.post('/api/inspections/batch', json={"inspecciones": []}, headers=headers).status_code == 400
+        
+        response = client.post('/api/inspections/batch', json={"inspecciones": [{}, {}]}, headers=headers)
+        assert response.status_code == 400
+        assert "1 inspecciones" in response.get_json()['error']
+        
+        duenio_token = get_auth_token(client, app, "duenio_test@example.com", "password123", "DUENIO")
+        response = client.post('/api/inspections/batch', json={"inspecciones": [{}]},
+                               headers={'Authorization': f'Bearer {duenio_token}'})
+        assert response.status_code == 403
+
+
 # ========================================
 # TESTS PARA /api/inspections/vehiculo/{matricula} (GET)
 # ========================================
@@ -549,6 +931,424 @@ def test_list_inspections_by_vehiculo(client, app, setup_data):
         assert response_data['total'] >= 1
 
 
+def test_listados_de_inspecciones_sin_instanciar_entidades(client, app, setup_data):
+    """Test: Los listados devuelven los campos completos sin cargar entidades Inspeccion en la sesión"""
+    with app.app_context():
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        data = {
+            "turno_id": setup_data["turno_id"],
+            "inspector_id": setup_data["inspector_id"],
+            "chequeos": [
+                {"tipo": clave, "puntuacion": 8}
+                for clave, _ in TIPOS_CHEQUEO
+            ],
+            "observacion": "Sin novedades"
+        }
+        client.post('/api/inspections', json=data, headers=headers)
+        db.session.expunge_all()
+        
+        for url in ['/api/inspections', f'/api/vehicles/{setup_data["matricula"]}/inspections']:
+            response = client.get(url, headers=headers)
+            
+            assert response.status_code == 200
+            inspecciones = response.get_json()['inspecciones']
+            assert len(inspecciones) == 1
+            assert inspecciones[0]['turno_id'] == setup_data["turno_id"]
+            assert inspecciones[0]['vehiculo_matricula'] == setup_data["matricula"]
+            assert inspecciones[0]['inspector_nombre'] == "Inspector Prueba"
+            assert inspecciones[0]['puntuacion_total'] == 64
+            assert inspecciones[0]['resultado'] == "SEGURO"
+            assert inspecciones[0]['observacion'] == "Sin novedades"
+            assert not any(isinstance(obj, Inspeccion) for obj in db.session.identity_map.values())
+
+
+def crear_inspecciones_historicas(setup_data, cantidad):
+    """
+    Helper: crea `cantidad` inspecciones pasadas (un día entre cada una) para el vehículo
+    de setup_data, alternando SEGURO y RECHEQUEAR. Devuelve sus ids de la más reciente
+    a la más antigua.
+    """
+    completado = EstadoTurno.query.filter_by(nombre='COMPLETADO').first().id
+    resultados = {r.nombre: r.id for r in ResultadoInspeccion.query.all()}
+    inicio = datetime(2024, 1, 1, 10, 0)
+    ids = []
+    for i in range(cantidad):
+        fecha = inicio + timedelta(days=i)
+        turno = Turno(vehiculo_id=setup_data["vehiculo_id"], fecha=fecha,
+                      estado_id=completado, creado_por=setup_data["duenio_id"])
+        db.session.add(turno)
+        db.session.flush()
+        inspeccion = Inspeccion(
+            vehiculo_id=setup_data["vehiculo_id"],
+            turno_id=turno.id,
+            inspector_id=setup_data["inspector_id"],
+            fecha=fecha,
+            puntuacion_total=64 if i % 2 == 0 else 30,
+            resultado_id=resultados['SEGURO'] if i % 2 == 0 else resultados['RECHEQUEAR'],
+            observacion=None if i % 2 == 0 else "Frenos con desgaste excesivo"
+        )
+        db.session.add(inspeccion)
+        db.session.flush()
+        ids.append(inspeccion.id)
+    db.session.commit()
+    return list(reversed(ids))
+
+
+def test_listados_de_inspecciones_paginados_por_cursor(client, app, setup_data):
+    """Test: Los listados se recorren por cursor, de la más reciente a la más antigua, con consultas constantes"""
+    with app.app_context():
+        esperados = crear_inspecciones_historicas(setup_data, 25)
+        token = get_auth_token(client, app, "admin_inspect@example.com", "password123", "ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        urls = [
+            '/api/inspections',
+            f'/api/vehicles/{setup_data["matricula"]}/inspections',
+            f'/api/users/{setup_data["inspector_id"]}/inspections'
+        ]
+        for url in urls:
+            ids = []
+            consultas_por_pagina = set()
+            cursor = None
+            while True:
+                sentencias = []
+                
+                def registrar(conn, cursor_db, statement, *resto):
+                    if statement.lstrip().upper().startswith("SELECT"):
+                        sentencias.append(statement)
+                
+                event.listen(db.engine, "before_cursor_execute", registrar)
+                try:
+                    response = client.get(url, query_string={"limit": 10, "cursor": cursor} if cursor
+                                          else {"limit": 10}, headers=headers)
+                finally:
+                    event.remove(db.engine, "before_cursor_execute", registrar)
+                
+                assert response.status_code == 200
+                pagina = response.get_json()
+                assert pagina['total'] == len(pagina['inspecciones'])
+                ids.extend(i['id'] for i in pagina['inspecciones'])
+                consultas_por_pagina.add(len(sentencias))
+                cursor = pagina['next_cursor']
+                if not cursor:
+                    break
+            
+            assert ids == esperados, url
+            # La cantidad de consultas no depende de las filas de la página
+            assert len(consultas_por_pagina) == 1, url
+
+
+def test_listados_de_inspecciones_con_filtros(client, app, setup_data):
+    """Test: Los listados de inspecciones se filtran por rango de fechas y resultado"""
+    with app.app_context():
+        esperados = crear_inspecciones_historicas(setup_data, 10)
+        token = get_auth_token(client, app, "admin_inspect@example.com", "password123", "ADMIN")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        # 2024-01-03 .. 2024-01-06 son las inspecciones 2 a 5; las RECHEQUEAR son las impares (3 y 5)
+        filtros = {"desde": "2024-01-03", "hasta": "2024-01-06", "resultado": "rechequear"}
+        for url in ['/api/inspections', f'/api/vehicles/{setup_data["matricula"]}/inspections']:
+            response = client.get(url, query_string=filtros, headers=headers)
+            
+            assert response.status_code == 200
+            inspecciones = response.get_json()['inspecciones']
+            assert [i['id'] for i in inspecciones] == [esperados[-6], esperados[-4]]
+            assert all(i['resultado'] == "RECHEQUEAR" for i in inspecciones)
+            assert response.get_json()['next_cursor'] is None
+        
+        invalidos = [
+            {"resultado": "APROBADO"},
+            {"desde": "03/01/2024"},
+            {"desde": "2024-01-06", "hasta": "2024-01-03"},
+            {"limit": 0},
+            {"cursor": "no-es-un-cursor"}
+        ]
+        for query_string in invalidos:
+            response = client.get('/api/inspections', query_string=query_string, headers=headers)
+            assert response.status_code == 400, query_string
+
+
+# ========================================
+# TESTS PARA /api/vehicles/{matricula}/inspections/latest (GET)
+# ========================================
+
+def test_ultima_inspeccion_se_actualiza_al_inspeccionar(client, app, setup_data):
+    """Test: Registrar una inspección la deja como la última del vehículo, consultable por matrícula"""
+    with app.app_context():
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        headers = {'Authorization': f'Bearer {token}'}
+        url = f'/api/vehicles/{setup_data["matricula"]}/inspections/latest'
+        
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.get_json() == {"matricula": setup_data["matricula"], "ultima_inspeccion": None}
+        
+        creada = client.post('/api/inspections', json={
+            "turno_id": setup_data["turno_id"],
+            "inspector_id": setup_data["inspector_id"],
+            "chequeos": [{"tipo": clave, "puntuacion": 4} for clave, _ in TIPOS_CHEQUEO],
+            "observacion": "Frenos y luces fuera de norma"
+        }, headers=headers).get_json()
+        
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        ultima = response.get_json()['ultima_inspeccion']
+        assert ultima['inspeccion_id'] == creada['id']
+        assert ultima['resultado'] == "RECHEQUEAR"
+        assert ultima['puntuacion_total'] == 32
+        
+        # Una escritura atrasada no pisa a la inspección más reciente
+        from src.services.latest_inspection_service import LatestInspectionService
+        LatestInspectionService.registrar(setup_data["vehiculo_id"], creada['id'], datetime(2020, 1, 1),
+                                          ResultadoInspeccion.query.filter_by(nombre='SEGURO').first().id, 80)
+        db.session.commit()
+        assert client.get(url, headers=headers).get_json()['ultima_inspeccion'] == ultima
+
+
+def test_ultima_inspeccion_autorizacion(client, app, setup_data):
+    """Test: Un DUENIO solo consulta la última inspección de sus vehículos"""
+    with app.app_context():
+        token = get_auth_token(client, app, "otro_duenio@example.com", "password123", "DUENIO")
+        headers = {'Authorization': f'Bearer {token}'}
+        
+        response = client.get(f'/api/vehicles/{setup_data["matricula"]}/inspections/latest', headers=headers)
+        assert response.status_code == 400
+        assert "permiso" in response.get_json()['error']
+        
+        response = client.get('/api/vehicles/NOEXISTE/inspections/latest', headers=headers)
+        assert response.status_code == 400
+        assert "no encontrado" in response.get_json()['error']
+
+
+def test_reconstruir_ultimas_inspecciones(client, app, setup_data):
+    """Test: El comando de carga toma la inspección más reciente de cada vehículo del historial"""
+    with app.app_context():
+        esperados = crear_inspecciones_historicas(setup_data, 5)
+        
+        result = app.test_cli_runner().invoke(args=["reconstruir-ultimas-inspecciones"])
+        assert result.exit_code == 0
+        assert "1 vehículos" in result.output
+        
+        token = get_auth_token(client, app, "duenio_test@example.com", "password123", "DUENIO")
+        response = client.get(f'/api/vehicles/{setup_data["matricula"]}/inspections/latest',
+                              headers={'Authorization': f'Bearer {token}'})
+        ultima = response.get_json()['ultima_inspeccion']
+        assert ultima['inspeccion_id'] == esperados[0]
+        assert ultima['fecha'] == "Fri, 05 Jan 2024 10:00:00 GMT"
+
+
+# ========================================
+# TESTS PARA /api/inspections/stats (GET)
+# ========================================
+
+def test_estadisticas_se_acumulan_al_inspeccionar(client, app, setup_data):
+    """Test: Las inspecciones actualizan los acumulados y las estadísticas no leen inspeccion ni chequeo"""
+    with app.app_context():
+        token = get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")
+        turnos = [setup_data["turno_id"]] + crear_turnos_de_hoy(setup_data, 3)
+        puntuaciones = [8, 10, 4, 6]  # 64 y 80 SEGURO, 32 RECHEQUEAR, 48 SEGURO
+        response = client.post('/api/inspections/batch', json={"inspecciones": [{
+            "turno_id": turno_id,
+            "inspector_id": setup_data["inspector_id"],
+            "chequeos": [{"tipo": clave, "puntuacion": puntuacion} for clave, _ in TIPOS_CHEQUEO],
+            "observacion": "Frenos y luces fuera de norma"
+        } for turno_id, puntuacion in zip(turnos, puntuaciones)]}, headers={'Authorization': f'Bearer {token}'})
+        assert response.get_json()['creadas'] == 4
+        
+        admin = {'Authorization': f'Bearer {get_auth_token(client, app, "admin_inspect@example.com", "password123", "ADMIN")}'}
+        hoy = datetime.utcnow().strftime('%Y-%m-%d')
+        
+        sentencias = []
+        
+        def registrar(conn, cursor, statement, *resto):
+            sentencias.append(statement)
+        
+        event.listen(db.engine, "before_cursor_execute", registrar)
+        try:
+            response = client.get('/api/inspections/stats', headers=admin)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", registrar)
+        
+        assert response.status_code == 200
+        estadisticas = response.get_json()
+        assert estadisticas['hasta'] == hoy
+        assert estadisticas['totales'] == {
+            "inspecciones": 4,
+            "seguras": 3,
+            "rechequeos": 1,
+            "tasa_aprobacion": 0.75,
+            "tasa_rechequeo": 0.25,
+            "puntuacion_promedio": 56.0
+        }
+        assert [d['fecha'] for d in estadisticas['por_dia']] == [hoy]
+        assert estadisticas['por_inspector'][0]['inspector_nombre'] == "Inspector Prueba"
+        assert estadisticas['por_inspector'][0]['inspecciones'] == 4
+        assert [a['anio_vehiculo'] for a in estadisticas['por_anio_vehiculo']] == [2020]
+        assert not any("FROM inspeccion" in s or "FROM chequeo" in s for s in sentencias)
+        
+        # Recalcular desde el historial da el mismo resultado que los acumulados incrementales
+        result = app.test_cli_runner().invoke(args=["reconstruir-estadisticas", "--desde", hoy, "--hasta", hoy])
+        assert result.exit_code == 0
+        assert "4 inspecciones" in result.output
+        assert client.get('/api/inspections/stats', headers=admin).get_json() == estadisticas
+
+
+def test_reconstruir_estadisticas_por_rango(client, app, setup_data):
+    """Test: El recálculo por rango solo regenera los días indicados"""
+    with app.app_context():
+        crear_inspecciones_historicas(setup_data, 10)  # 2024-01-01 .. 2024-01-10
+        admin = {'Authorization': f'Bearer {get_auth_token(client, app, "admin_inspect@example.com", "password123", "ADMIN")}'}
+        rango = {"desde": "2024-01-01", "hasta": "2024-01-31"}
+        runner = app.test_cli_runner()
+        
+        # Cargadas por fuera del servicio: todavía no están en los acumulados
+        assert client.get('/api/inspections/stats', query_string=rango, headers=admin).get_json()['totales']['inspecciones'] == 0
+        
+        result = runner.invoke(args=["reconstruir-estadisticas", "--desde", "2024-01-03", "--hasta", "2024-01-04"])
+        assert result.exit_code == 0
+        estadisticas = client.get('/api/inspections/stats', query_string=rango, headers=admin).get_json()
+        assert [d['fecha'] for d in estadisticas['por_dia']] == ["2024-01-03", "2024-01-04"]
+        assert estadisticas['totales']['seguras'] == 1
+        assert estadisticas['totales']['rechequeos'] == 1
+        
+        result = runner.invoke(args=["reconstruir-estadisticas"])
+        assert result.exit_code == 0
+        assert "10 inspecciones" in result.output
+        estadisticas = client.get('/api/inspections/stats', query_string=rango, headers=admin).get_json()
+        assert estadisticas['totales']['inspecciones'] == 10
+        assert estadisticas['totales']['puntuacion_promedio'] == 47.0
+        
+        result = runner.invoke(args=["reconstruir-estadisticas", "--desde", "2024-01-05", "--hasta", "2024-01-01"])
+        assert result.exit_code != 0
+
+
+def test_estadisticas_validaciones(client, app, setup_data):
+    """Test: Las estadísticas son solo para ADMIN y validan el rango de fechas"""
+    with app.app_context():
+        admin = {'Authorization': f'Bearer {get_auth_token(client, app, "admin_inspect@example.com", "password123", "ADMIN")}'}
+        inspector = {'Authorization': f'Bearer {get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")}'}
+        
+        assert client.get('/api/inspections/stats', headers=inspector).status_code == 403
+        assert client.get('/api/inspections/stats?desde=2024-02-01&hasta=2024-01-01', headers=admin).status_code == 400
+        assert client.get('/api/inspections/stats?desde=01/02/2024', headers=admin).status_code == 400
+        
+        response = client.get('/api/inspections/stats?desde=2024-01-01&hasta=2024-01-31', headers=admin)
+        assert response.status_code == 200
+        assert response.get_json()['totales']['tasa_aprobacion'] is None
+        assert response.get_json()['por_dia'] == []
+
+
+# ========================================
+# TESTS PARA /api/inspections/checks/stats (GET) Y analytics_utils
+# ========================================
+
+def test_analytics_utils_equivale_a_recorrido_en_python():
+    """Test: Histogramas, promedios y percentiles vectorizados coinciden con el cálculo fila a fila"""
+    import math
+    import numpy as np
+    from src.utils.analytics_utils import histograma_por_grupo, promedios, percentiles
+    
+    aleatorio = np.random.default_rng(7)
+    n_grupos = 7
+    grupos = aleatorio.integers(0, n_grupos, 20000)
+    grupos = grupos[grupos != 4]  # un grupo sin chequeos
+    puntuaciones = aleatorio.integers(1, 11, len(grupos))
+    ps = [1, 10, 25, 50, 75, 90, 100]
+    
+    histograma = histograma_por_grupo(grupos, puntuaciones, n_grupos)
+    medias = promedios(histograma)
+    cuantiles = percentiles(histograma, ps)
+    
+    por_grupo = {g: [] for g in range(n_grupos)}
+    for grupo, puntuacion in zip(grupos.tolist(), puntuaciones.tolist()):
+        por_grupo[grupo].append(puntuacion)
+    
+    for grupo, valores in por_grupo.items():
+        esperado = [0] * 10
+        for valor in valores:
+            esperado[valor - 1] += 1
+        assert histograma[grupo].tolist() == esperado
+        
+        if not valores:
+            assert math.isnan(medias[grupo])
+            assert cuantiles[grupo].tolist() == [0] * len(ps)
+            continue
+        
+        assert medias[grupo] == pytest.approx(sum(valores) / len(valores))
+        ordenados = sorted(valores)
+        assert cuantiles[grupo].tolist() == [ordenados[max(math.ceil(p * len(valores) / 100), 1) - 1] for p in ps]
+        assert cuantiles[grupo].tolist() == np.percentile(valores, ps, method='inverted_cdf').astype(int).tolist()
+
+
+def test_analisis_de_chequeos_por_tipo_mes_e_inspector(client, app, setup_data):
+    """Test: El análisis de chequeos agrupa por tipo de chequeo, mes e inspector"""
+    with app.app_context():
+        rol_inspector = UsuarioRol.query.filter_by(nombre='INSPECTOR').first()
+        otro_inspector = Usuario(nombre_completo="Inspector Dos", mail="inspector2@example.com", telefono="1",
+                                 hash_password=hash_password("password123"), rol_id=rol_inspector.id, activo=True)
+        db.session.add(otro_inspector)
+        db.session.flush()
+        seguro = ResultadoInspeccion.query.filter_by(nombre='SEGURO').first().id
+        
+        # (fecha, inspector, puntuación de luces, puntuación de frenos); el resto de los chequeos con 7
+        inspecciones = [
+            (datetime(2024, 1, 10, 10), setup_data["inspector_id"], 9, 2),
+            (datetime(2024, 1, 20, 10), otro_inspector.id, 10, 4),
+            (datetime(2024, 2, 5, 10), setup_data["inspector_id"], 8, 3),
+            (datetime(2024, 3, 1, 10), setup_data["inspector_id"], 1, 1),  # fuera del rango
+        ]
+        for fecha, inspector_id, luces, frenos in inspecciones:
+            db.session.add(Inspeccion(vehiculo_id=setup_data["vehiculo_id"], inspector_id=inspector_id, fecha=fecha,
+                                      puntuacion_total=luces + frenos + 42, resultado_id=seguro,
+                                      puntuaciones=bytes([luces, frenos, 7, 7, 7, 7, 7, 7])))
+        # Inspección histórica sin puntuaciones empaquetadas (solo dos chequeos): se lee de la tabla chequeo
+        historica = Inspeccion(vehiculo_id=setup_data["vehiculo_id"], inspector_id=setup_data["inspector_id"],
+                               fecha=datetime(2024, 1, 15, 10), puntuacion_total=60, resultado_id=seguro)
+        db.session.add(historica)
+        db.session.flush()
+        tipos = dict(db.session.query(TipoChequeo.nombre, TipoChequeo.id).all())
+        db.session.add_all([
+            Chequeo(inspeccion_id=historica.id, tipo_chequeo_id=tipos["FRENOS"], puntuacion=6, fecha=historica.fecha),
+            Chequeo(inspeccion_id=historica.id, tipo_chequeo_id=tipos["LUCES"], puntuacion=9, fecha=historica.fecha)
+        ])
+        db.session.commit()
+        
+        admin = {'Authorization': f'Bearer {get_auth_token(client, app, "admin_inspect@example.com", "password123", "ADMIN")}'}
+        response = client.get('/api/inspections/checks/stats?desde=2024-01-01&hasta=2024-02-29', headers=admin)
+        
+        assert response.status_code == 200
+        analisis = response.get_json()
+        assert analisis['totales']['cantidad'] == 26
+        
+        frenos, luces = analisis['por_descripcion'][0], analisis['por_descripcion'][-1]
+        assert len(analisis['por_descripcion']) == 8
+        assert (frenos['tipo'], frenos['descripcion']) == ("FRENOS", "Frenos")
+        assert frenos['cantidad'] == 4
+        assert frenos['promedio'] == 3.75
+        assert frenos['histograma'] == [0, 1, 1, 1, 0, 1, 0, 0, 0, 0]
+        assert (frenos['p10'], frenos['p50'], frenos['p90']) == (2, 3, 6)
+        assert (luces['tipo'], luces['descripcion']) == ("LUCES", "Luces y señalización")
+        assert luces['cantidad'] == 4
+        assert luces['promedio'] == 9.0
+        
+        assert [(m['mes'], m['cantidad']) for m in analisis['por_mes']] == [("2024-01", 18), ("2024-02", 8)]
+        assert [(i['inspector_nombre'], i['cantidad']) for i in analisis['por_inspector']] == [
+            ("Inspector Prueba", 18), ("Inspector Dos", 8)
+        ]
+        
+        vacio = client.get('/api/inspections/checks/stats?desde=2023-01-01&hasta=2023-01-31', headers=admin).get_json()
+        assert vacio['totales']['cantidad'] == 0
+        assert vacio['totales']['promedio'] is None
+        assert vacio['por_descripcion'] == []
+        
+        inspector = {'Authorization': f'Bearer {get_auth_token(client, app, "inspector_test@example.com", "password123", "INSPECTOR")}'}
+        assert client.get('/api/inspections/checks/stats', headers=inspector).status_code == 403
+        assert client.get('/api/inspections/checks/stats?desde=2024-02-01&hasta=2024-01-01',
+                          headers=admin).status_code == 400
+
+
 # ========================================
 # TESTS PARA VERIFICAR JWT Y ROLES
 # ========================================
@@ -560,8 +1360,8 @@ def test_crear_inspeccion_sin_token(client, app, setup_data):
             "turno_id": setup_data["turno_id"],
             "inspector_id": setup_data["inspector_id"],
             "chequeos": [
-                {"descripcion": f"Chequeo {i}", "puntuacion": 8}
-                for i in range(1, 9)
+                {"tipo": clave, "puntuacion": 8}
+                for clave, _ in TIPOS_CHEQUEO
             ]
         }
         
@@ -0,0 +1,226 @@
+import pytest
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import upgrade
+from src import create_app, db
+from src.models import (
+    Usuario, UsuarioRol, Vehiculo, EstadoVehiculo,
+    Turno, EstadoTurno, ResultadoInspeccion, TipoChequeo
+)
+from src.models.check_type_model import TIPOS_CHEQUEO
+from src.utils.hash_utils import hash_password
+
+MIGRACIONES = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'migrations'))
+
+# Catálogos de pocas filas: recorrerlos completos es más barato que usar un índice.
+# 'cierre' se carga entera a propósito para compilar el índice de intervalos en memoria.
+TABLAS_EXENTAS = {'usuario_rol', 'estado_vehiculo', 'estado_turno', 'resultado_inspeccion', 'tipo_chequeo', 'cierre'}
+
+
+@pytest.fixture
+def app():
+    """Crea y configura la aplicación para testing"""
+    original_db_uri = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+    app = create_app()
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+
+    with app.app_context():
+        db.create_all()
+
+        db.session.add_all([UsuarioRol(nombre=nombre) for nombre in ['ADMIN', 'INSPECTOR', 'DUENIO']])
+        db.session.add_all([EstadoVehiculo(nombre=nombre) for nombre in ['ACTIVO', 'INACTIVO']])
+        db.session.add_all([EstadoTurno(nombre=nombre)
+                            for nombre in ['RESERVADO', 'CONFIRMADO', 'COMPLETADO', 'CANCELADO']])
+        db.session.add_all([ResultadoInspeccion(nombre=nombre) for nombre in ['SEGURO', 'RECHEQUEAR']])
+        db.session.add_all([TipoChequeo(nombre=nombre, descripcion=descripcion) for nombre, descripcion in TIPOS_CHEQUEO])
+        db.session.commit()
+
+        yield app
+
+        db.session.remove()
+        db.drop_all()
+
+    if original_db_uri:
+        os.environ['DATABASE_URL'] = original_db_uri
+
+
+@pytest.fixture
+def client(app):
+    """Cliente de prueba para realizar peticiones HTTP"""
+    return app.test_client()
+
+
+def crear_usuario(client, mail, rol_nombre):
+    """Helper: crea un usuario con el rol indicado y devuelve (id, headers con su token)"""
+    rol = UsuarioRol.query.filter_by(nombre=rol_nombre).first()
+    usuario = Usuario(
+        nombre_completo=f"Usuario {rol_nombre}",
+        mail=mail,
+        telefono="123456789",
+        hash_password=hash_password("password123"),
+        rol_id=rol.id,
+        activo=True
+    )
+    db.session.add(usuario)
+    db.session.commit()
+
+    response = client.post('/api/users/sessions', json={"mail": mail, "contrasenia": "password123"})
+    return usuario.id, {'Authorization': f"Bearer {response.get_json()['token']}"}
+
+
+@contextmanager
+def capturar_sentencias():
+    """
+    Helper para capturar las sentencias de lectura y modificación (con sus parámetros)
+    ejecutadas dentro del bloque.
+    """
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            sentencias.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(db.engine, "before_cursor_execute", registrar)
+
+
+def recorridos_completos(statement, parameters) -> list[str]:
+    """
+    Devuelve las tablas que SQLite recorrería completas (SCAN sin índice) para la sentencia.
+    """
+    plan = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    tablas = []
+    for fila in plan:
+        detalle = fila[-1]
+        coincidencia = re.fullmatch(r"SCAN (\w+)(?: AS \w+)?", detalle)
+        if coincidencia:
+            # Los alias generados por SQLAlchemy terminan en _<n>
+            tabla = re.sub(r"_\d+$", "", coincidencia.group(1))
+            if tabla not in TABLAS_EXENTAS:
+                tablas.append(tabla)
+    return tablas
+
+
+def test_consultas_de_servicios_no_recorren_tablas_completas(client, app):
+    """Test: Ninguna consulta filtrada de los servicios hace un recorrido completo de tabla"""
+    with app.app_context():
+        admin_id, admin = crear_usuario(client, "admin_plan@example.com", "ADMIN")
+        inspector_id, inspector = crear_usuario(client, "inspector_plan@example.com", "INSPECTOR")
+        duenio_id, duenio = crear_usuario(client, "duenio_plan@example.com", "DUENIO")
+
+        response = client.post('/api/vehicles', json={
+            "duenio_id": duenio_id, "matricula": "PLAN123", "marca": "Toyota", "modelo": "Corolla", "anio": 2020
+        }, headers=duenio)
+        assert response.status_code == 201
+        vehiculo_id = Vehiculo.query.filter_by(matricula="PLAN123").first().id
+
+        # Turno de hoy confirmado, para poder inspeccionarlo
+        turno_hoy = Turno(
+            vehiculo_id=vehiculo_id,
+            fecha=datetime.utcnow().replace(hour=10, minute=0, second=0, microsecond=0),
+            estado_id=EstadoTurno.query.filter_by(nombre='CONFIRMADO').first().id,
+            creado_por=duenio_id
+        )
+        db.session.add(turno_hoy)
+        db.session.commit()
+        turno_hoy_id = turno_hoy.id
+
+        dias_hasta_lunes = 7 - datetime.now().weekday()
+        proximo_lunes = (datetime.now() + timedelta(days=dias_hasta_lunes)).strftime('%Y-%m-%d')
+        hoy = datetime.now().strftime('%Y-%m-%d')
+
+        with capturar_sentencias() as sentencias:
+            # Turnos
+            response = client.post('/api/bookings', json={
+                "matricula": "PLAN123", "fecha": f"{proximo_lunes} 10:00"
+            }, headers=duenio)
+            assert response.status_code == 201
+            turno_id = response.get_json()['id']
+
+            assert client.put(f'/api/bookings/{turno_id}', json={"estado_id": 2}, headers=admin).status_code == 200
+            assert client.get(f'/api/bookings/{turno_id}', headers=duenio).status_code == 200
+            assert client.get('/api/users/bookings?limit=1', headers=duenio).status_code == 200
+            assert client.get('/api/vehicles/PLAN123/bookings', headers=duenio).status_code == 200
+            assert client.get('/api/bookings', headers=duenio).status_code == 200
+            assert client.get(f'/api/bookings?estado=CONFIRMADO&desde={hoy}&hasta={hoy}',
+                              headers=admin).status_code == 200
+            assert client.get('/api/bookings/export?matricula=PLAN123', headers=admin).status_code == 200
+            assert client.get(f'/api/bookings/agenda?fecha={proximo_lunes}', headers=inspector).status_code == 200
+            assert client.post('/api/bookings/availability', json={
+                "fecha_inicio": proximo_lunes, "fecha_final": proximo_lunes
+            }, headers=duenio).status_code == 200
+
+            # Inspecciones
+            response = client.post('/api/inspections', json={
+                "turno_id": turno_hoy_id,
+                "inspector_id": inspector_id,
+                "chequeos": [{"tipo": clave, "puntuacion": 8} for clave, _ in TIPOS_CHEQUEO]
+            }, headers=inspector)
+            assert response.status_code == 201
+            inspeccion_id = response.get_json()['id']
+
+            assert client.get(f'/api/inspections/{inspeccion_id}', headers=duenio).status_code == 200
+            assert client.get('/api/vehicles/PLAN123/inspections', headers=duenio).status_code == 200
+            assert client.get('/api/vehicles/PLAN123/inspections/latest', headers=duenio).status_code == 200
+            assert client.get('/api/inspections', headers=inspector).status_code == 200
+            assert client.get(f'/api/inspections/stats?desde={hoy}&hasta={hoy}', headers=admin).status_code == 200
+            assert client.get(f'/api/inspections/checks/stats?desde={hoy}&hasta={hoy}',
+                              headers=admin).status_code == 200
+            assert client.get(f'/api/inspections?desde={hoy}&hasta={hoy}&resultado=SEGURO&limit=1',
+                              headers=admin).status_code == 200
+            assert client.get(f'/api/vehicles/PLAN123/inspections?desde={hoy}&limit=1',
+                              headers=duenio).status_code == 200
+            assert client.get(f'/api/users/{inspector_id}/inspections?hasta={hoy}',
+                              headers=inspector).status_code == 200
+
+            # Vehículos y usuarios
+            assert client.get('/api/vehicles', headers=duenio).status_code == 200
+            assert client.get('/api/vehicles/PLAN123', headers=duenio).status_code == 200
+            assert client.get(f'/api/users/{duenio_id}', headers=duenio).status_code == 200
+
+        assert sentencias
+        recorridos = {}
+        for statement, parameters in sentencias:
+            tablas = recorridos_completos(statement, parameters)
+            if tablas:
+                recorridos[statement] = tablas
+
+        assert recorridos == {}
+
+
+def test_migraciones_generan_el_esquema_de_los_modelos(tmp_path):
+    """Test: Aplicar todas las migraciones deja la base igual a los modelos (tablas e índices)"""
+    original_db_uri = os.environ.get('DATABASE_URL')
+    os.environ['DATABASE_URL'] = f"sqlite:///{tmp_path / 'migraciones.db'}"
+
+    app = create_app()
+
+    try:
+        with app.app_context():
+            upgrade(directory=MIGRACIONES)
+
+            with db.engine.connect() as conn:
+                diferencias = compare_metadata(MigrationContext.configure(conn), db.metadata)
+                roles = [fila[0] for fila in conn.exec_driver_sql("SELECT nombre FROM usuario_rol ORDER BY id")]
+
+            assert diferencias == []
+            assert roles == ['DUENIO', 'INSPECTOR', 'ADMIN']
+
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        if original_db_uri:
+            os.environ['DATABASE_URL'] = original_db_uri
+        else:
+            os.environ.pop('DATABASE_URL', None)
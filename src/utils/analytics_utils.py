@@ -0,0 +1,60 @@
+import numpy as np
+
+"""
+Cálculos vectorizados sobre puntuaciones de chequeos (enteros de 1 a 10).
+
+Las puntuaciones llegan como un arreglo y cada una trae el código de su grupo
+(0..n_grupos-1). Todos los resultados se derivan de un único histograma por grupo
+calculado con bincount, sin recorrer los chequeos en Python.
+"""
+
+PUNTUACION_MINIMA = 1
+PUNTUACION_MAXIMA = 10
+# Bytes de Inspeccion.puntuaciones: uno por tipo de chequeo
+CHEQUEOS_POR_INSPECCION = 8
+
+
+def desempaquetar_puntuaciones(empaquetadas: bytes) -> np.ndarray:
+    """
+    Decodifica puntuaciones empaquetadas (Inspeccion.puntuaciones, o varias concatenadas)
+    como una matriz de uint8 (inspecciones x 8) que comparte memoria con los bytes.
+    """
+    return np.frombuffer(empaquetadas, dtype=np.uint8).reshape(-1, CHEQUEOS_POR_INSPECCION)
+
+
+def histograma_por_grupo(grupos: np.ndarray, puntuaciones: np.ndarray, n_grupos: int) -> np.ndarray:
+    """
+    Devuelve una matriz (n_grupos x 10): fila g, columna p-1 = cantidad de chequeos del
+    grupo g con puntuación p.
+    """
+    ancho = PUNTUACION_MAXIMA + 1
+    conteos = np.bincount(grupos.astype(np.int64) * ancho + puntuaciones, minlength=n_grupos * ancho)
+    return conteos.reshape(n_grupos, ancho)[:, PUNTUACION_MINIMA:]
+
+
+def promedios(histograma: np.ndarray) -> np.ndarray:
+    """
+    Promedio de puntuación de cada grupo (NaN para grupos sin chequeos).
+    """
+    cantidades = histograma.sum(axis=1)
+    sumas = histograma @ np.arange(PUNTUACION_MINIMA, PUNTUACION_MAXIMA + 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sumas / cantidades
+
+
+def percentiles(histograma: np.ndarray, ps: list[int]) -> np.ndarray:
+    """
+    Percentiles de cada grupo a partir de su histograma: matriz (n_grupos x len(ps)).
+
+    Para cada p se toma la menor puntuación cuya frecuencia acumulada alcanza el p% de
+    los chequeos del grupo (equivale a np.percentile con method='inverted_cdf'). Los
+    grupos sin chequeos quedan en 0.
+    """
+    cantidades = histograma.sum(axis=1)
+    acumulado = histograma.cumsum(axis=1)
+    # Posición (1-based) del elemento que corresponde a cada percentil, al menos la primera
+    umbrales = np.maximum(np.ceil(np.outer(cantidades, ps) / 100.0), 1)
+    posiciones = (acumulado[:, None, :] < umbrales[:, :, None]).sum(axis=2)
+    resultado = posiciones + PUNTUACION_MINIMA
+    resultado[cantidades == 0] = 0
+    return resultado
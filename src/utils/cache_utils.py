@@ -0,0 +1,110 @@
+import time
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Hashable, Optional
+from flask import current_app
+
+
+class TTLCache:
+    """
+    Cache en memoria con tamaño acotado (desalojo LRU) y expiración por tiempo (TTL).
+
+    Cada entrada se asocia a un rango de días [desde, hasta] para poder invalidar
+    solamente las entradas afectadas por una escritura sobre un día concreto.
+
+    Es local a cada proceso: entre workers la consistencia queda acotada por el TTL.
+    """
+
+    def __init__(self, max_entradas: int = 256, ttl_segundos: float = 30):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._entradas = OrderedDict()  # clave -> (expira, desde, hasta, valor)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidaciones = 0
+
+    def get(self, clave: Hashable) -> Optional[Any]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+
+            if entrada[0] <= time.monotonic():
+                del self._entradas[clave]
+                self.misses += 1
+                return None
+
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return entrada[3]
+
+    def set(self, clave: Hashable, valor: Any, desde: date, hasta: date) -> None:
+        with self._lock:
+            self._entradas[clave] = (time.monotonic() + self.ttl_segundos, desde, hasta, valor)
+            self._entradas.move_to_end(clave)
+
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.evictions += 1
+
+    def invalidar_dia(self, dia: date) -> None:
+        """
+        Elimina todas las entradas cuyo rango incluye el día indicado.
+        """
+        with self._lock:
+            afectadas = [clave for clave, entrada in self._entradas.items() if entrada[1] <= dia <= entrada[2]]
+            for clave in afectadas:
+                del self._entradas[clave]
+            self.invalidaciones += len(afectadas)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidaciones += len(self._entradas)
+            self._entradas.clear()
+
+    def estadisticas(self) -> dict:
+        with self._lock:
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidaciones": self.invalidaciones
+            }
+
+
+def init_caches(app) -> None:
+    """
+    Crea las caches de la aplicación. Cada instancia de la app tiene las suyas.
+    """
+    app.extensions['disponibilidad_cache'] = TTLCache(
+        max_entradas=app.config.get('DISPONIBILIDAD_CACHE_MAX_ENTRADAS', 512),
+        ttl_segundos=app.config.get('DISPONIBILIDAD_CACHE_TTL_SEGUNDOS', 30)
+    )
+    app.extensions['agenda_cache'] = TTLCache(
+        max_entradas=app.config.get('AGENDA_CACHE_MAX_ENTRADAS', 32),
+        ttl_segundos=app.config.get('AGENDA_CACHE_TTL_SEGUNDOS', 60)
+    )
+
+
+def obtener_cache_disponibilidad() -> TTLCache:
+    return current_app.extensions['disponibilidad_cache']
+
+
+def obtener_cache_agenda() -> TTLCache:
+    return current_app.extensions['agenda_cache']
+
+
+def invalidar_dia_de_turnos(dia: date) -> None:
+    """
+    Invalida las caches derivadas de los turnos de un día (disponibilidad y agenda).
+    Se llama después de confirmar cualquier cambio sobre un turno de ese día.
+    """
+    obtener_cache_disponibilidad().invalidar_dia(dia)
+    obtener_cache_agenda().invalidar_dia(dia)
@@ -0,0 +1,129 @@
+from src import db
+from sqlalchemy import insert, case, func
+
+
+def insertar_filas(modelo, filas: list[dict], filtro_insertadas) -> list[int]:
+    """
+    Inserta varias filas en una sola sentencia y devuelve sus ids en el orden de `filas`.
+
+    Dentro de un mismo INSERT multi-fila el autoincremental crece en el orden de las filas,
+    así que alcanza con ordenar los ids generados. Donde el motor soporta RETURNING en
+    inserciones múltiples (SQLite, PostgreSQL) los ids vuelven con el mismo INSERT. En MySQL
+    el driver arma el INSERT multi-fila y los ids se leen después con `filtro_insertadas`,
+    que debe seleccionar exactamente las filas recién insertadas.
+
+    No se usa sort_by_parameter_order de SQLAlchemy: sin columna centinela vuelve a
+    insertar fila por fila.
+    """
+    if not filas:
+        return []
+
+    dialecto = db.session.get_bind().dialect
+    if dialecto.insert_executemany_returning:
+        resultado = db.session.execute(insert(modelo).returning(modelo.id), filas)
+        return sorted(resultado.scalars())
+
+    db.session.execute(insert(modelo), filas)
+    return list(db.session.execute(
+        db.select(modelo.id).where(filtro_insertadas).order_by(modelo.id)
+    ).scalars())
+
+
+def upsert(modelo, filas: list[dict], claves: list[str], orden: str = None, sumar: tuple = ()) -> None:
+    """
+    Inserta las filas o, si ya existe una con la misma clave única, la actualiza, en una
+    sola sentencia: ON CONFLICT DO UPDATE en SQLite y PostgreSQL, ON DUPLICATE KEY UPDATE
+    en MySQL.
+    
+    Si se indica `orden` (una columna), una fila existente solo se reemplaza cuando la
+    nueva tiene un valor mayor o igual en esa columna; así una escritura atrasada no
+    pisa a una más reciente.
+    
+    Las columnas de `sumar` no se reemplazan sino que se acumulan (valor actual + nuevo),
+    lo que permite mantener contadores sin leerlos antes.
+    """
+    if not filas:
+        return
+    
+    tabla = modelo.__table__
+    dialecto = db.session.get_bind().dialect.name
+    columnas = [columna for columna in filas[0] if columna not in claves]
+    
+    if dialecto == "mysql":
+        from sqlalchemy.dialects.mysql import insert as insert_dialecto
+        sentencia = insert_dialecto(tabla).values(filas)
+        nuevos = sentencia.inserted
+    elif dialecto in ("sqlite", "postgresql"):
+        if dialecto == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+        else:
+            from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+        sentencia = insert_dialecto(tabla).values(filas)
+        nuevos = sentencia.excluded
+    else:
+        raise ValueError(f"Motor de base de datos no soportado para upserts: {dialecto}")
+    
+    def valor(columna):
+        return tabla.c[columna] + nuevos[columna] if columna in sumar else nuevos[columna]
+    
+    if dialecto == "mysql":
+        if orden:
+            # MySQL asigna de izquierda a derecha: la columna de orden se actualiza al final
+            # para que las comparaciones anteriores vean su valor original
+            es_mas_reciente = nuevos[orden] >= tabla.c[orden]
+            valores = [(columna, case((es_mas_reciente, valor(columna)), else_=tabla.c[columna]))
+                       for columna in columnas if columna != orden]
+            valores.append((orden, case((es_mas_reciente, valor(orden)), else_=tabla.c[orden])))
+        else:
+            valores = [(columna, valor(columna)) for columna in columnas]
+        sentencia = sentencia.on_duplicate_key_update(valores)
+    else:
+        sentencia = sentencia.on_conflict_do_update(
+            index_elements=claves,
+            set_={columna: valor(columna) for columna in columnas},
+            where=(tabla.c[orden] <= nuevos[orden]) if orden else None
+        )
+    
+    db.session.execute(sentencia)
+
+
+def incrementar_hasta(modelo, clave: dict, columna: str, maximo: int) -> bool:
+    """
+    Suma 1 a `columna` en la fila identificada por `clave` (una restricción única) sin
+    superar `maximo`, creándola con valor 1 si todavía no existe. Es una única sentencia
+    (INSERT con ON CONFLICT DO UPDATE ... WHERE en SQLite y PostgreSQL, ON DUPLICATE KEY
+    UPDATE en MySQL), sin lecturas previas ni SAVEPOINT.
+    
+    Devuelve True si se insertó o incrementó la fila y False si ya estaba en el máximo.
+    """
+    tabla = modelo.__table__
+    dialecto = db.session.get_bind().dialect.name
+    actual = tabla.c[columna]
+    
+    if dialecto == "mysql":
+        from sqlalchemy.dialects.mysql import insert as insert_dialecto
+        hay_lugar = actual < maximo
+        # Con CLIENT_FOUND_ROWS (el modo de SQLAlchemy) el rowcount de una fila que queda
+        # igual vale 1, como el de una inserción; el resultado se informa entonces con el
+        # id generado: LAST_INSERT_ID(id) al incrementar y LAST_INSERT_ID(0) (id + 0 deja
+        # el id igual) cuando no hay lugar. Se asigna antes que la columna, que MySQL
+        # actualiza de izquierda a derecha, para que la condición vea el valor original.
+        sentencia = insert_dialecto(tabla).values(**clave, **{columna: 1}).on_duplicate_key_update([
+            ("id", func.if_(hay_lugar, func.last_insert_id(tabla.c.id), tabla.c.id + func.last_insert_id(0))),
+            (columna, func.if_(hay_lugar, actual + 1, actual)),
+        ])
+        return bool(db.session.execute(sentencia).lastrowid)
+    
+    if dialecto in ("sqlite", "postgresql"):
+        if dialecto == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as insert_dialecto
+        else:
+            from sqlalchemy.dialects.postgresql import insert as insert_dialecto
+        sentencia = insert_dialecto(tabla).values(**clave, **{columna: 1}).on_conflict_do_update(
+            index_elements=list(clave),
+            set_={columna: actual + 1},
+            where=actual < maximo
+        )
+        return db.session.execute(sentencia).rowcount == 1
+    
+    raise ValueError(f"Motor de base de datos no soportado para incrementos condicionales: {dialecto}")
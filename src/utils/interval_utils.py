@@ -0,0 +1,34 @@
+from bisect import bisect_left
+from datetime import datetime
+
+
+class IndiceIntervalos:
+    """
+    Índice en memoria de intervalos [inicio, fin) de tiempo.
+
+    Los intervalos se ordenan y se fusionan al construir el índice, de modo que cada
+    consulta de superposición es una búsqueda binaria: O(log n).
+    """
+
+    def __init__(self, intervalos: list[tuple[datetime, datetime]]):
+        fusionados = []
+        for inicio, fin in sorted(intervalos):
+            if fusionados and inicio <= fusionados[-1][1]:
+                fusionados[-1][1] = max(fusionados[-1][1], fin)
+            else:
+                fusionados.append([inicio, fin])
+
+        self._inicios = [intervalo[0] for intervalo in fusionados]
+        self._fines = [intervalo[1] for intervalo in fusionados]
+
+    def __len__(self) -> int:
+        return len(self._inicios)
+
+    def se_superpone(self, inicio: datetime, fin: datetime) -> bool:
+        """
+        Indica si el rango [inicio, fin) se superpone con algún intervalo del índice.
+        """
+        # Último intervalo que comienza antes del fin del rango consultado: al estar
+        # fusionados y ordenados, es el de mayor fin entre los candidatos
+        posicion = bisect_left(self._inicios, fin) - 1
+        return posicion >= 0 and self._fines[posicion] > inicio
@@ -0,0 +1,44 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 500
+
+
+def codificar_cursor(fecha: datetime, id: int) -> str:
+    """
+    Codifica la clave (fecha, id) del último elemento de una página en un cursor opaco.
+    """
+    crudo = json.dumps([fecha.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodifica un cursor generado por codificar_cursor.
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        fecha, id = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return datetime.fromisoformat(fecha), int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor de paginación inválido")
+
+
+def leer_paginacion(args) -> Tuple[int, Optional[Tuple[datetime, int]]]:
+    """
+    Lee y valida los parámetros 'limit' y 'cursor' de la query string.
+    """
+    limite = args.get("limit", LIMITE_POR_DEFECTO)
+    try:
+        limite = int(limite)
+    except (ValueError, TypeError):
+        raise ValueError("El parámetro 'limit' debe ser un número entero")
+
+    if limite < 1 or limite > LIMITE_MAXIMO:
+        raise ValueError(f"El parámetro 'limit' debe estar entre 1 y {LIMITE_MAXIMO}")
+
+    cursor = args.get("cursor")
+    return limite, decodificar_cursor(cursor) if cursor else None
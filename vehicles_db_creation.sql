@@ -36,6 +36,23 @@ CREATE TABLE resultado_inspeccion (
 INSERT INTO resultado_inspeccion (nombre)
 VALUES ('SEGURO'), ('RECHEQUEAR');
 
+-- Tipos de chequeo (cada inspección evalúa los 8)
+CREATE TABLE tipo_chequeo (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    nombre VARCHAR(50) NOT NULL UNIQUE,
+    descripcion VARCHAR(200) NOT NULL UNIQUE
+);
+
+INSERT INTO tipo_chequeo (nombre, descripcion)
+VALUES ('LUCES', 'Luces y señalización'),
+       ('FRENOS', 'Frenos'),
+       ('DIRECCION', 'Dirección y suspensión'),
+       ('NEUMATICOS', 'Neumáticos'),
+       ('CHASIS', 'Chasis y estructura'),
+       ('CONTAMINACION', 'Contaminación y ruidos'),
+       ('SEGURIDAD', 'Elementos de seguridad obligatorios'),
+       ('CINTURONES', 'Cinturones, vidrios y espejos');
+
 -- Estado del vehículo
 CREATE TABLE estado_vehiculo (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -100,6 +117,7 @@ CREATE TABLE inspeccion (
     puntuacion_total INT DEFAULT 0,
     resultado_id INT,
     observacion TEXT,
+    puntuaciones BINARY(8),  -- Un byte por tipo de chequeo, en el orden del catálogo
     FOREIGN KEY (vehiculo_id) REFERENCES vehiculo(id)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -115,11 +133,67 @@ CREATE TABLE chequeo (
     id INT AUTO_INCREMENT PRIMARY KEY,
     inspeccion_id INT,
     fecha DATETIME NOT NULL,
-    descripcion VARCHAR(200) NOT NULL,
+    tipo_chequeo_id INT NOT NULL,
     puntuacion INT CHECK (puntuacion BETWEEN 1 AND 10),
     FOREIGN KEY (inspeccion_id) REFERENCES inspeccion(id)
         ON DELETE CASCADE
-        ON UPDATE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (tipo_chequeo_id) REFERENCES tipo_chequeo(id)
+);
+
+-- Calendario materializado de ocupación (una fila por slot con turnos activos)
+-- Se mantiene desde la aplicación; se regenera con `flask reconstruir-ocupacion`
+CREATE TABLE ocupacion_slot (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    fecha DATETIME NOT NULL UNIQUE,
+    ocupados INT NOT NULL DEFAULT 0
+);
+
+-- Feriados y cierres de planta (sin horas = día completo)
+CREATE TABLE cierre (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    fecha DATE NOT NULL,
+    hora_desde TIME,
+    hora_hasta TIME,
+    motivo VARCHAR(200) NOT NULL
+);
+
+-- Contadores de versión por tabla (base de los ETags de disponibilidad)
+CREATE TABLE contador_version (
+    nombre VARCHAR(50) PRIMARY KEY,
+    valor INT NOT NULL DEFAULT 0
+);
+
+-- Última inspección de cada vehículo (una fila por vehículo)
+-- Se mantiene desde la aplicación; se regenera con `flask reconstruir-ultimas-inspecciones`
+CREATE TABLE ultima_inspeccion (
+    vehiculo_id INT PRIMARY KEY,
+    inspeccion_id INT NOT NULL,
+    fecha DATETIME NOT NULL,
+    resultado_id INT,
+    puntuacion_total INT,
+    FOREIGN KEY (vehiculo_id) REFERENCES vehiculo(id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (inspeccion_id) REFERENCES inspeccion(id)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY (resultado_id) REFERENCES resultado_inspeccion(id)
+);
+
+-- Acumulados diarios de inspecciones por inspector, año del vehículo y resultado
+-- Se mantienen desde la aplicación; se recalculan con `flask reconstruir-estadisticas`
+CREATE TABLE estadistica_diaria (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    fecha DATE NOT NULL,
+    inspector_id INT NOT NULL,
+    anio_vehiculo INT NOT NULL,
+    resultado_id INT NOT NULL,
+    cantidad INT NOT NULL DEFAULT 0,
+    puntuacion_suma INT NOT NULL DEFAULT 0,
+    CONSTRAINT uq_estadistica_diaria UNIQUE (fecha, inspector_id, anio_vehiculo, resultado_id),
+    FOREIGN KEY (inspector_id) REFERENCES usuario(id),
+    FOREIGN KEY (resultado_id) REFERENCES resultado_inspeccion(id)
 );
 
 -- ===========================================================
@@ -127,8 +201,16 @@ CREATE TABLE chequeo (
 -- ===========================================================
 CREATE INDEX idx_usuario_mail ON usuario(mail);
 CREATE INDEX idx_vehiculo_matricula ON vehiculo(matricula);
-CREATE INDEX idx_turno_fecha ON turno(fecha);
+CREATE INDEX idx_turno_fecha_id ON turno(fecha, id);
+CREATE INDEX idx_turno_vehiculo_fecha_id ON turno(vehiculo_id, fecha, id);
+CREATE INDEX idx_turno_creador_fecha_id ON turno(creado_por, fecha, id);
+CREATE INDEX idx_turno_estado_fecha_id ON turno(estado_id, fecha, id);
 CREATE INDEX idx_inspeccion_fecha ON inspeccion(fecha);
+CREATE INDEX idx_inspeccion_vehiculo_fecha_id ON inspeccion(vehiculo_id, fecha, id);
+CREATE INDEX idx_inspeccion_inspector_fecha_id ON inspeccion(inspector_id, fecha, id);
+CREATE INDEX idx_vehiculo_duenio ON vehiculo(duenio_id);
+CREATE INDEX idx_chequeo_inspeccion ON chequeo(inspeccion_id);
+CREATE INDEX ix_cierre_fecha ON cierre(fecha);
 
 
 